@@ -1,587 +1,3438 @@
-import streamlit as st
-import numpy as np
-import pandas as pd
-from datetime import datetime, date
-import json
-import os
-import uuid
-
-
-DATA_FILE = "keuangan_peternakan_streamlit.json"
-
-def load_data():
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "r") as f:
-            return json.load(f)
-    else:
-        return {"jurnal_umum": []}
-
-def save_data(data):
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
-
-def tambah_jurnal_umum(data):
-    st.subheader("Tambah Jurnal Umum")
-
-    with st.form("form_jurnal"):
-        tanggal = st.date_input("Tanggal", value=date.today())
-        deskripsi = st.text_input("Deskripsi Transaksi")
-
-        daftar_akun = [
-            "Kas", "Bank", "Piutang", "Hutang",
-            "Hutang Karyawan", "Hutang Pajak",
-            "Penjualan Susu",  
-            "Pendapatan dari Penjualan Perlengkapan",
-            "Pendapatan dari Penjualan Tanah",
-            "Pendapatan Saham",
-            "Biaya Pakan", "Biaya Obat", "Biaya Listrik",
-            "Biaya Air",
-            "Beban Pokok Pendapatan", "Biaya Operasional",
-            "Biaya Amortisasi Pajak", "Biaya Depresiasi Kendaraan", "Biaya Depresiasi Bangunan",
-            "Biaya Pembelian Perlengkapan", "Biaya Pembelian Tanah",
-            "Biaya Pembelian Kendaraan", "Biaya Pembelian Bangunan",
-            "Biaya Dividen",
-            "Persediaan"
-        ]
-
-        entri = []
-        baris_entri = st.number_input("Jumlah Entri Akun", min_value=2, max_value=20, value=2, step=1)
-
-        for i in range(baris_entri):
-            st.markdown(f"*Entri {i+1}*")
-            akun = st.selectbox(f"Akun {i+1}", daftar_akun, key=f"akun_{i}")
-            debit = st.number_input(f"Debit {i+1} (Rp)", min_value=0.0, format="%.2f", key=f"debit_{i}")
-            kredit = st.number_input(f"Kredit {i+1} (Rp)", min_value=0.0, format="%.2f", key=f"kredit_{i}")
-            entri.append({"akun": akun, "debit": debit, "kredit": kredit})
-
-        submit = st.form_submit_button("Simpan Jurnal")
-
-        if submit:
-            for idx, e in enumerate(entri):
-                if e["debit"] > 0 and e["kredit"] > 0:
-                    st.warning(f"Pada entri {idx+1}, kolom Debit dan Kredit tidak boleh diisi bersamaan.")
-                    return
-
-            total_debit = sum(e["debit"] for e in entri)
-            total_kredit = sum(e["kredit"] for e in entri)
-            if total_debit == 0 and total_kredit == 0:
-                st.warning("Masukkan minimal satu nominal debit atau kredit.")
-            elif abs(total_debit - total_kredit) > 0.01:
-                st.warning(f"Total debit (Rp {total_debit:,.2f}) dan kredit (Rp {total_kredit:,.2f}) harus sama.")
-            else:
-                jurnal_baru = {
-                    "id": str(uuid.uuid4()),
-                    "tanggal": tanggal.strftime("%Y-%m-%d"),
-                    "deskripsi": deskripsi.strip(),
-                    "entri": [e for e in entri if e["debit"] > 0 or e["kredit"] > 0]
-                }
-                data["jurnal_umum"].append(jurnal_baru)
-                save_data(data)
-                st.success("Jurnal berhasil disimpan.")
-
-def edit_jurnal_form(data, jurnal_id):
-    jurnal = next((j for j in data["jurnal_umum"] if j["id"] == jurnal_id), None)
-    if not jurnal:
-        st.error("Jurnal tidak ditemukan.")
-        return
-
-    st.subheader("Edit Jurnal Umum")
-
-    with st.form(f"form_edit_{jurnal_id}"):
-        tanggal = st.date_input("Tanggal", datetime.strptime(jurnal["tanggal"], "%Y-%m-%d").date())
-        deskripsi = st.text_input("Deskripsi Transaksi", value=jurnal["deskripsi"])
-
-        daftar_akun = [
-            "Kas", "Bank", "Piutang", "Hutang",
-            "Hutang Karyawan", "Hutang Pajak",
-            "Penjualan Susu",  
-            "Pendapatan dari Penjualan Perlengkapan",
-            "Pendapatan dari Penjualan Tanah",
-            "Pendapatan Saham",
-            "Biaya Pakan", "Biaya Obat", "Biaya Listrik",
-            "Biaya Air",
-            "Beban Pokok Pendapatan", "Biaya Operasional",
-            "Biaya Amortisasi Pajak", "Biaya Depresiasi Kendaraan", "Biaya Depresiasi Bangunan",
-            "Biaya Pembelian Perlengkapan", "Biaya Pembelian Tanah",
-            "Biaya Pembelian Kendaraan", "Biaya Pembelian Bangunan",
-            "Biaya Dividen",
-            "Persediaan"
-        ]
-
-        baris_entri = len(jurnal["entri"])
-        baris_entri = st.number_input("Jumlah Entri Akun", min_value=2, max_value=20, value=baris_entri, step=1)
-
-        entri_baru = []
-        for i in range(baris_entri):
-            st.markdown(f"*Entri {i+1}*")
-            akun_default = jurnal["entri"][i]["akun"] if i < len(jurnal["entri"]) else daftar_akun[0]
-            debit_default = jurnal["entri"][i]["debit"] if i < len(jurnal["entri"]) else 0.0
-            kredit_default = jurnal["entri"][i]["kredit"] if i < len(jurnal["entri"]) else 0.0
-
-            akun = st.selectbox(f"Akun {i+1}", daftar_akun, index=daftar_akun.index(akun_default), key=f"edit_akun_{jurnal_id}_{i}")
-            debit = st.number_input(f"Debit {i+1} (Rp)", min_value=0.0, format="%.2f", value=debit_default, key=f"edit_debit_{jurnal_id}_{i}")
-            kredit = st.number_input(f"Kredit {i+1} (Rp)", min_value=0.0, format="%.2f", value=kredit_default, key=f"edit_kredit_{jurnal_id}_{i}")
-            entri_baru.append({"akun": akun, "debit": debit, "kredit": kredit})
-
-        submit = st.form_submit_button("Update Jurnal")
-
-        if submit:
-            for idx, e in enumerate(entri_baru):
-                if e["debit"] > 0 and e["kredit"] > 0:
-                    st.warning(f"Pada entri {idx+1}, kolom Debit dan Kredit tidak boleh diisi bersamaan.")
-                    return
-
-            total_debit = sum(e["debit"] for e in entri_baru)
-            total_kredit = sum(e["kredit"] for e in entri_baru)
-            if total_debit == 0 and total_kredit == 0:
-                st.warning("Masukkan minimal satu nominal debit atau kredit.")
-            elif abs(total_debit - total_kredit) > 0.01:
-                st.warning(f"Total debit (Rp {total_debit:,.2f}) dan kredit (Rp {total_kredit:,.2f}) harus sama.")
-            else:
-                jurnal["tanggal"] = tanggal.strftime("%Y-%m-%d")
-                jurnal["deskripsi"] = deskripsi.strip()
-                jurnal["entri"] = [e for e in entri_baru if e["debit"] > 0 or e["kredit"] > 0]
-                save_data(data)
-                st.session_state.pop("edit_jurnal_id", None)
-                st.success("Jurnal berhasil diperbarui.")
-                st.experimental_rerun()
-
-def lihat_jurnal_umum(data):
-    st.subheader("Daftar Jurnal Umum")
-
-    if "edit_jurnal_id" in st.session_state:
-        edit_jurnal_form(data, st.session_state["edit_jurnal_id"])
-        st.write("---")
-
-    if not data["jurnal_umum"]:
-        st.info("Belum ada jurnal umum.")
-        return
-
-    jurnal_urut = sorted(data["jurnal_umum"], key=lambda x: x["tanggal"], reverse=True)
-
-    for jurnal in jurnal_urut:
-        st.markdown(f"*Tanggal:* {jurnal['tanggal']}  |  *Deskripsi:* {jurnal['deskripsi']}")
-
-        cols = st.columns([6, 1, 1])
-
-        with cols[0]:
-            st.write("| Akun | Debit (Rp) | Kredit (Rp) |")
-            st.write("|-------|------------|-------------|")
-            for e in jurnal["entri"]:
-                st.write(f"| {e['akun']} | {e['debit']:,.2f} | {e['kredit']:,.2f} |")
-
-        with cols[1]:
-            if st.button("Edit", key=f"edit_{jurnal['id']}"):
-                st.session_state["edit_jurnal_id"] = jurnal["id"]
-                st.rerun()()
-
-        with cols[2]:
-            if st.button("Hapus", key=f"hapus_{jurnal['id']}"):
-                data["jurnal_umum"] = [j for j in data["jurnal_umum"] if j["id"] != jurnal["id"]]
-                save_data(data)
-                st.success("Jurnal berhasil dihapus.")
-                st.experimental_rerun()
-
-def buku_besar(data):
-    st.subheader("Buku Besar")
-
-    if not data["jurnal_umum"]:
-        st.info("Belum ada data jurnal umum.")
-        return
-
-    akun_set = set()
-    for jurnal in data["jurnal_umum"]:
-        for e in jurnal["entri"]:
-            akun_set.add(e["akun"])
-    daftar_akun = sorted(list(akun_set))
-
-    akun_terpilih = st.selectbox("Pilih Akun", daftar_akun)
-
-    jurnal_sorted = sorted(data["jurnal_umum"], key=lambda x: x["tanggal"])
-    tgl_awal_default = datetime.strptime(jurnal_sorted[0]["tanggal"], "%Y-%m-%d").date() if jurnal_sorted else date.today()
-    col1, col2 = st.columns(2)
-    with col1:
-        tgl_mulai = st.date_input("Dari Tanggal", value=tgl_awal_default)
-    with col2:
-        tgl_akhir = st.date_input("Sampai Tanggal", value=date.today())
-
-    if tgl_akhir < tgl_mulai:
-        st.warning("Tanggal akhir harus sama atau setelah tanggal mulai.")
-        return
-
-    entri_akun = []
-    for jurnal in data["jurnal_umum"]:
-        tgl = datetime.strptime(jurnal["tanggal"], "%Y-%m-%d").date()
-        if not (tgl_mulai <= tgl <= tgl_akhir):
-            continue
-        for e in jurnal["entri"]:
-            if e["akun"] == akun_terpilih:
-                entri_akun.append({
-                    "tanggal": jurnal["tanggal"],
-                    "deskripsi": jurnal["deskripsi"],
-                    "debit": e["debit"],
-                    "kredit": e["kredit"]
-                })
-
-    if not entri_akun:
-        st.warning(f"Tidak ada mutasi pada akun '{akun_terpilih}' untuk periode ini.")
-        return
-
-    saldo = 0.0
-    rows = []
-    for e in sorted(entri_akun, key=lambda x: x["tanggal"]):
-        saldo += e["debit"] - e["kredit"]
-        rows.append({
-            "Tanggal": e["tanggal"],
-            "Deskripsi": e["deskripsi"],
-            "Debit": f"Rp {e['debit']:,.2f}" if e["debit"] else "",
-            "Kredit": f"Rp {e['kredit']:,.2f}" if e["kredit"] else "",
-            "Saldo": f"Rp {saldo:,.2f}"
-        })
-
-    st.markdown(f"### Mutasi Akun: {akun_terpilih}")
-    st.table(rows)
-
-def neraca_saldo(data):
-    st.subheader("Neraca Saldo")
-
-    if not data["jurnal_umum"]:
-        st.info("Belum ada data jurnal umum.")
-        return
-
-    jurnal_sorted = sorted(data["jurnal_umum"], key=lambda x: x["tanggal"])
-    tgl_awal_default = datetime.strptime(jurnal_sorted[0]["tanggal"], "%Y-%m-%d").date() if jurnal_sorted else date.today()
-    col1, col2 = st.columns(2)
-    with col1:
-        tgl_mulai = st.date_input("Dari Tanggal", value=tgl_awal_default)
-    with col2:
-        tgl_akhir = st.date_input("Sampai Tanggal", value=date.today())
-
-    if tgl_akhir < tgl_mulai:
-        st.warning("Tanggal akhir harus sama atau setelah tanggal mulai.")
-        return
-
-    akun_set = set()
-    for jurnal in data["jurnal_umum"]:
-        for e in jurnal["entri"]:
-            akun_set.add(e["akun"])
-
-    saldo_per_akun = {}
-    for akun in akun_set:
-        saldo_per_akun[akun] = {"debit": 0.0, "kredit": 0.0}
-
-    for jurnal in data["jurnal_umum"]:
-        tgl = datetime.strptime(jurnal["tanggal"], "%Y-%m-%d").date()
-        if not (tgl_mulai <= tgl <= tgl_akhir):
-            continue
-        for e in jurnal["entri"]:
-            saldo_per_akun[e["akun"]]["debit"] += e["debit"]
-            saldo_per_akun[e["akun"]]["kredit"] += e["kredit"]
-
-    rows = []
-    total_debit = 0.0
-    total_kredit = 0.0
-
-    for akun in sorted(saldo_per_akun.keys()):
-        debit = saldo_per_akun[akun]["debit"]
-        kredit = saldo_per_akun[akun]["kredit"]
-        saldo = debit - kredit
-
-        saldo_debit = saldo if saldo > 0 else 0
-        saldo_kredit = -saldo if saldo < 0 else 0
-
-        total_debit += saldo_debit
-        total_kredit += saldo_kredit
-
-        rows.append({
-            "Akun": akun,
-            "Saldo Debit (Rp)": f"Rp {saldo_debit:,.2f}" if saldo_debit else "",
-            "Saldo Kredit (Rp)": f"Rp {saldo_kredit:,.2f}" if saldo_kredit else ""
-        })
-
-    st.table(rows)
-    st.markdown("---")
-    st.write(f"*Total Saldo Debit:* Rp {total_debit:,.2f}")
-    st.write(f"*Total Saldo Kredit:* Rp {total_kredit:,.2f}")
-
-    if abs(total_debit - total_kredit) > 0.01:
-        st.error("⚠ Neraca Saldo tidak seimbang! Total Debit tidak sama dengan Total Kredit.")
-    else:
-        st.success("Neraca Saldo seimbang (Total Debit = Total Kredit).")
-
-def laporan_laba_rugi(data):
-    st.subheader("Proyeksi Laporan Laba Rugi")
-    st.markdown("Untuk Periode yang berakhir")
-
-    jurnal_sorted = sorted(data["jurnal_umum"], key=lambda x: x["tanggal"])
-    if not jurnal_sorted:
-        st.info("Belum ada data jurnal umum.")
-        return
-
-    tgl_awal_default = datetime.strptime(jurnal_sorted[0]["tanggal"], "%Y-%m-%d").date()
-    col1, col2 = st.columns(2)
-    with col1:
-        tgl_mulai = st.date_input("Dari Tanggal", value=tgl_awal_default)
-    with col2:
-        tgl_akhir = st.date_input("Sampai Tanggal", value=date.today())
-
-    if tgl_akhir < tgl_mulai:
-        st.warning("Tanggal akhir harus sama atau setelah tanggal mulai.")
-        return
-
-    akun_pendapatan = {
-        "Penjualan Susu",
-        "Pendapatan dari Penjualan Perlengkapan",
-        "Pendapatan dari Penjualan Tanah",
-        "Pendapatan Saham"
-    }
-
-    akun_harga_pokok_penjualan = {
-        "Beban Pokok Pendapatan",
-    }
-    akun_beban = {
-        "Biaya Pakan",
-        "Biaya Obat",
-        "Biaya Listrik",
-        "Biaya Air",
-        "Biaya Operasional",
-        "Biaya Amortisasi Pajak",
-        "Biaya Depresiasi Kendaraan",
-        "Biaya Depresiasi Bangunan"
-    }
-
-    total_pendapatan = 0.0
-    total_persediaan_awal = 0.0
-    total_persediaan_akhir = 0.0
-    total_harga_pokok_penjualan = 0.0
-    total_beban = 0.0
-
-    for jurnal in data["jurnal_umum"]:
-        tgl = datetime.strptime(jurnal["tanggal"], "%Y-%m-%d").date()
-        for e in jurnal["entri"]:
-            akun = e["akun"]
-            debit = e["debit"]
-            kredit = e["kredit"]
-
-            if akun == "Persediaan":
-                if tgl < tgl_mulai:
-                    total_persediaan_awal += debit - kredit
-                elif tgl <= tgl_akhir:
-                    total_persediaan_akhir += debit - kredit
-
-    for jurnal in data["jurnal_umum"]:
-        tgl = datetime.strptime(jurnal["tanggal"], "%Y-%m-%d").date()
-        if not (tgl_mulai <= tgl <= tgl_akhir):
-            continue
-        for e in jurnal["entri"]:
-            akun = e["akun"]
-            debit = e["debit"]
-            kredit = e["kredit"]
-
-            if akun in akun_pendapatan:
-                total_pendapatan += kredit - debit
-            elif akun in akun_harga_pokok_penjualan:
-                total_harga_pokok_penjualan += debit - kredit
-            elif akun in akun_beban:
-                total_beban += debit - kredit
-
-    hpp = total_harga_pokok_penjualan + total_persediaan_awal - total_persediaan_akhir
-    laba_kotor = total_pendapatan - hpp
-    laba_rugi_bersih = laba_kotor - total_beban
-
-    laba_str = f"Rp {abs(laba_rugi_bersih):,.2f}"
-    if laba_rugi_bersih >= 0:
-        warna = "green"
-        status = "Laba Bersih"
-    else:
-        warna = "red"
-        status = "Rugi Bersih"
-
-    laporan_md = f"""
-| Keterangan                                         | Nilai (Rp)           |
-|---------------------------------------------------|----------------------|
-| *Pendapatan*                                     |                      |
-| {'<br>'.join(akun_pendapatan)}                    |                      |
-| Total Pendapatan                                   | Rp {total_pendapatan:,.2f}   |
-|                                                   |                      |
-| *Persediaan Awal*                                | Rp {total_persediaan_awal:,.2f}   |
-| *Pembelian (Beban Pokok Pendapatan)*            | Rp {total_harga_pokok_penjualan:,.2f}   |
-| *Persediaan Akhir*                               | Rp {total_persediaan_akhir:,.2f}   |
-| *Harga Pokok Penjualan (HPP)*                    | *Rp {hpp:,.2f}*   |
-| *Laba Kotor*                                     | *Rp {laba_kotor:,.2f}* |
-|                                                   |                      |
-| *Beban*                                          |                      |
-| Total Beban                                        | Rp {total_beban:,.2f}   |
-|                                                   |                      |
-| <span style="color:{warna};"><b>Proyeksi {status}</b></span> | <span style="color:{warna};"><b>{laba_str}</b></span>   |
-"""
-    st.markdown(laporan_md, unsafe_allow_html=True)
-
-def laporan_arus_kas_terperinci(data):
-    st.subheader("Laporan Arus Kas Terperinci")
-    st.markdown("Laporan arus kas berdasarkan aktivitas operasi, investasi, dan pendanaan")
-
-    if not data["jurnal_umum"]:
-        st.info("Belum ada data jurnal umum.")
-        return
-
-    jurnal_sorted = sorted(data["jurnal_umum"], key=lambda x: x["tanggal"])
-    tgl_awal_default = datetime.strptime(jurnal_sorted[0]["tanggal"], "%Y-%m-%d").date()
-    col1, col2 = st.columns(2)
-    with col1:
-        tgl_mulai = st.date_input("Dari Tanggal", value=tgl_awal_default)
-    with col2:
-        tgl_akhir = st.date_input("Sampai Tanggal", value=date.today())
-
-    if tgl_akhir < tgl_mulai:
-        st.warning("Tanggal akhir harus sama atau setelah tanggal mulai.")
-        return
-
-    aktivitas_operasi = {
-        "Pendapatan Bersih": ["Penjualan Susu", "Pendapatan dari Penjualan Perlengkapan", "Pendapatan dari Penjualan Tanah"],
-        "Kenaikan Piutang": ["Piutang"],
-        "Kenaikan Utang Usaha": ["Hutang"],
-        "Kenaikan Utang Karyawan": ["Hutang Karyawan"],
-        "Kenaikan Utang Pajak": ["Hutang Pajak"],
-        "Keuntungan Dari Penjualan Perlengkapan": ["Pendapatan dari Penjualan Perlengkapan"],
-        "Keuntungan Dari Penjualan Tanah": ["Pendapatan dari Penjualan Tanah"],
-        "Beban Amortisasi Pajak": ["Biaya Amortisasi Pajak"],
-        "Beban Depresiasi Kendaraan": ["Biaya Depresiasi Kendaraan"],
-        "Beban Depresiasi Bangunan": ["Biaya Depresiasi Bangunan"],
-        "Biaya Pakan": ["Biaya Pakan"],
-        "Biaya Obat": ["Biaya Obat"],
-        "Biaya Listrik": ["Biaya Listrik"],
-        "Biaya Air": ["Biaya Air"],
-        "Biaya Operasional": ["Biaya Operasional"]
-    }
-
-    aktivitas_investasi = {
-        "Penjualan Perlengkapan": ["Pendapatan dari Penjualan Perlengkapan"],
-        "Pembelian Perlengkapan": ["Biaya Pembelian Perlengkapan"],
-        "Penjualan Tanah": ["Pendapatan dari Penjualan Tanah"],
-        "Pembelian Tanah": ["Biaya Pembelian Tanah"],
-        "Pembelian Kendaraan": ["Biaya Pembelian Kendaraan"],
-        "Pembelian Bangunan": ["Biaya Pembelian Bangunan"]
-    }
-
-    aktivitas_pendanaan = {
-        "Pembayaran Dividen": ["Biaya Dividen"],
-        "Penerbitan Saham Biasa": ["Pendapatan Saham"]
-    }
-
-    def hitung_saldo(grup_akun):
-        saldo_total = 0.0
-        perinci = {k: 0.0 for k in grup_akun.keys()}
-
-        for jurnal in data["jurnal_umum"]:
-            tgl = datetime.strptime(jurnal["tanggal"], "%Y-%m-%d").date()
-            if not (tgl_mulai <= tgl <= tgl_akhir):
-                continue
-            for e in jurnal["entri"]:
-                for nama_aktivitas, akun_list in grup_akun.items():
-                    if e["akun"] in akun_list:
-                        arus = e["kredit"] - e["debit"]
-                        perinci[nama_aktivitas] += arus
-                        saldo_total += arus
-        return saldo_total, perinci
-
-    def tampilkan_tabel(judul, detail, total):
-        st.markdown(f"### Aktivitas {judul}")
-        if not any(nilai != 0 for nilai in detail.values()):
-            st.info(f"Tidak ada transaksi pada aktivitas {judul}.")
-            return
-
-        df = pd.DataFrame({
-            "Kategori": list(detail.keys()),
-            "Jumlah (Rp)": [f"{v:,.2f}" for v in detail.values()]
-        })
-        st.table(df)
-
-        label = "Kas Diterima" if total >= 0 else "Kas Digunakan"
-        st.markdown(f"{label} dari Aktivitas {judul}:** Rp {total:,.2f}")
-
-    saldo_op, detail_op = hitung_saldo(aktivitas_operasi)
-    saldo_inv, detail_inv = hitung_saldo(aktivitas_investasi)
-    saldo_pen, detail_pen = hitung_saldo(aktivitas_pendanaan)
-
-    tampilkan_tabel("Operasi", detail_op, saldo_op)
-    tampilkan_tabel("Investasi", detail_inv, saldo_inv)
-    tampilkan_tabel("Pendanaan", detail_pen, saldo_pen)
-
-    akun_kas = {"Kas", "Bank"}
-    kas_awal = 0.0
-    kas_akhir = 0.0
-    for jurnal in data["jurnal_umum"]:
-        tgl = datetime.strptime(jurnal["tanggal"], "%Y-%m-%d").date()
-        for e in jurnal["entri"]:
-            if e["akun"] in akun_kas:
-                if tgl < tgl_mulai:
-                    kas_awal += e["debit"] - e["kredit"]
-                if tgl <= tgl_akhir:
-                    kas_akhir += e["debit"] - e["kredit"]
-
-    kas_bersih = saldo_op + saldo_inv + saldo_pen
-
-    st.markdown("---")
-    st.write(f"*Kas Awal Periode ({tgl_mulai}):* Rp {kas_awal:,.2f}")
-    st.write(f"*Kas Bersih dari Semua Aktivitas:* Rp {kas_bersih:,.2f}")
-    st.write(f"*Kas Akhir Periode ({tgl_akhir}):* Rp {kas_akhir:,.2f}")
-
-def logout():
-    st.session_state['login_status'] = False
-    st.rerun()()
-
-def main():
-    st.set_page_config(page_title="Sistem Akuntansi Peternakan", layout="wide")
-	
-	
-
-    if 'login_status' not in st.session_state:
-        st.session_state['login_status'] = False
-
-    if not st.session_state['login_status']:
-        st.title("Login Sistem Akuntansi Peternakan")
-        username = st.text_input("Username")
-        password = st.text_input("Password", type="password")
-        if st.button("Login"):
-            if username == "sapiperahungaran" and password == "ungaran1991":
-                st.session_state['login_status'] = True
-                st.rerun()()
-            else:
-                st.error("Username / Password salah!")
-        return
-
-    data = load_data()
-
-    menu = st.sidebar.selectbox("Menu", [
-        "Tambah Jurnal Umum",
-        "Lihat Jurnal Umum",
-        "Buku Besar",
-        "Neraca Saldo",
-        "Laporan Laba Rugi",
-        "Laporan Arus Kas",
-        "Logout"
-    ])
-
-    if menu == "Tambah Jurnal Umum":
-        tambah_jurnal_umum(data)
-    elif menu == "Lihat Jurnal Umum":
-        if "edit_jurnal_id" in st.session_state:
-            edit_jurnal_form(data, st.session_state["edit_jurnal_id"])
-            st.write("---")
-        else:
-            lihat_jurnal_umum(data)
-    elif menu == "Buku Besar":
-        buku_besar(data)
-    elif menu == "Neraca Saldo":
-        neraca_saldo(data)
-    elif menu == "Laporan Laba Rugi":
-        laporan_laba_rugi(data)
-    elif menu == "Laporan Arus Kas":
-        laporan_arus_kas_terperinci(data)
-    elif menu == "Logout":
-        logout()
-
-
-if __name__ == "__main__":
+import streamlit as st
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+import bisect
+import functools
+import io
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: hanya penguncian antar-thread dalam satu proses.
+    fcntl = None
+
+
+DATA_FILE = "keuangan_peternakan_streamlit.json"
+LOG_FILE = "keuangan_peternakan_streamlit.log"
+BATAS_KOMPAKSI_LOG = 500
+
+# Nominal debit/kredit disimpan sebagai bilangan bulat sen (Rp 1 = 100 sen)
+# agar penjumlahan eksak; konversi hanya di form input dan saat ditampilkan.
+FORMAT_NOMINAL = "sen"
+
+# Format snapshot backend JSON: "json" atau "biner" (kolom, dibaca via memmap).
+FORMAT_SNAPSHOT = os.environ.get("PETERNAKAN_SNAPSHOT", "json")
+SNAPSHOT_BINER_FILE = "keuangan_peternakan_streamlit.bin"
+MAGIC_BINER = b"PETERNAKAN-KOLOM-1\n"
+
+# Instrumentasi per rerun (waktu per fase, jumlah data dipindai). Bawaan
+# mati; admin dapat menyalakannya dari sidebar. Bila PETERNAKAN_INSTRUMEN_FILE
+# diisi, setiap rekaman juga ditambahkan ke berkas itu (JSON lines).
+INSTRUMEN_AKTIF = os.environ.get("PETERNAKAN_INSTRUMEN", "0") == "1"
+INSTRUMEN_FILE = os.environ.get("PETERNAKAN_INSTRUMEN_FILE")
+BATAS_RIWAYAT_INSTRUMEN = 500
+
+# Backend penyimpanan: "json" (snapshot + log) atau "sqlite".
+STORAGE_BACKEND = os.environ.get("PETERNAKAN_STORAGE", "json")
+SQLITE_FILE = os.environ.get("PETERNAKAN_SQLITE_FILE", "keuangan_peternakan.sqlite")
+
+# Setiap peternakan punya ledger sendiri (shard) di direktorinya; nama berkas
+# di atas berlaku di dalam direktori itu. Peternakan bawaan memakai direktori
+# kerja agar data yang sudah ada tetap terbaca. Peternakan dan pengguna
+# tambahan dibaca dari PETERNAKAN_CONFIG, misalnya:
+#   {"peternakan": {"salatiga": {"nama": "Peternakan Salatiga"}},
+#    "pengguna": {"pemilik": {"sandi": "...", "peternakan": ["ungaran", "salatiga"], "admin": true}}}
+# Pengguna hanya dapat membuka peternakan yang tercantum di "peternakan"-nya.
+PETERNAKAN_CONFIG = os.environ.get("PETERNAKAN_CONFIG", "peternakan.json")
+PETERNAKAN_BAWAAN = "ungaran"
+KONSOLIDASI = "konsolidasi"
+
+def muat_konfigurasi():
+    peternakan = {PETERNAKAN_BAWAAN: {"nama": "Peternakan Sapi Perah Ungaran", "direktori": "."}}
+    pengguna = {"sapiperahungaran": {"sandi": "ungaran1991", "peternakan": [PETERNAKAN_BAWAAN], "admin": True}}
+    if os.path.exists(PETERNAKAN_CONFIG):
+        with open(PETERNAKAN_CONFIG, "r") as f:
+            konfigurasi = json.load(f)
+        for kode, info in konfigurasi.get("peternakan", {}).items():
+            peternakan[kode] = dict(peternakan.get(kode, {}), **info)
+        pengguna.update(konfigurasi.get("pengguna", {}))
+    for kode, info in peternakan.items():
+        info.setdefault("nama", kode)
+        info.setdefault("direktori", os.path.join("peternakan", kode))
+    return peternakan, pengguna
+
+PETERNAKAN, PENGGUNA = muat_konfigurasi()
+
+SKEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS jurnal (
+    id TEXT PRIMARY KEY,
+    tanggal TEXT NOT NULL,
+    deskripsi TEXT NOT NULL,
+    -- Urutan input; tetap saat jurnal diubah (rowid tidak, karena baris ditulis ulang).
+    urut INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entri (
+    jurnal_id TEXT NOT NULL REFERENCES jurnal(id) ON DELETE CASCADE,
+    urutan INTEGER NOT NULL,
+    tanggal TEXT NOT NULL,
+    akun TEXT NOT NULL,
+    debit INTEGER NOT NULL,
+    kredit INTEGER NOT NULL,
+    PRIMARY KEY (jurnal_id, urutan)
+);
+CREATE INDEX IF NOT EXISTS idx_jurnal_tanggal ON jurnal(tanggal);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jurnal_urut ON jurnal(urut);
+CREATE INDEX IF NOT EXISTS idx_entri_tanggal ON entri(tanggal);
+CREATE INDEX IF NOT EXISTS idx_entri_akun_tanggal ON entri(akun, tanggal);
+CREATE TABLE IF NOT EXISTS saldo_harian (
+    akun TEXT NOT NULL,
+    tanggal TEXT NOT NULL,
+    debit INTEGER NOT NULL,
+    kredit INTEGER NOT NULL,
+    jumlah INTEGER NOT NULL,
+    PRIMARY KEY (akun, tanggal)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_saldo_harian_tanggal ON saldo_harian(tanggal);
+CREATE TABLE IF NOT EXISTS tutup_buku (
+    sampai TEXT PRIMARY KEY,
+    ditutup TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS saldo_tutup (
+    sampai TEXT NOT NULL REFERENCES tutup_buku(sampai) ON DELETE CASCADE,
+    akun TEXT NOT NULL,
+    debit INTEGER NOT NULL,
+    kredit INTEGER NOT NULL,
+    PRIMARY KEY (sampai, akun)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS trg_entri_tambah AFTER INSERT ON entri BEGIN
+    INSERT INTO saldo_harian (akun, tanggal, debit, kredit, jumlah)
+    VALUES (NEW.akun, NEW.tanggal, NEW.debit, NEW.kredit, 1)
+    ON CONFLICT (akun, tanggal) DO UPDATE SET
+        debit = debit + excluded.debit,
+        kredit = kredit + excluded.kredit,
+        jumlah = jumlah + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_entri_hapus AFTER DELETE ON entri BEGIN
+    UPDATE saldo_harian
+    SET debit = debit - OLD.debit, kredit = kredit - OLD.kredit, jumlah = jumlah - 1
+    WHERE akun = OLD.akun AND tanggal = OLD.tanggal;
+    DELETE FROM saldo_harian WHERE akun = OLD.akun AND tanggal = OLD.tanggal AND jumlah <= 0;
+END;
+-- Indeks teks deskripsi + nama akun; rowid sama dengan rowid jurnal.
+CREATE VIRTUAL TABLE IF NOT EXISTS jurnal_cari USING fts5(teks, tokenize = 'unicode61 remove_diacritics 0');
+CREATE TRIGGER IF NOT EXISTS trg_jurnal_hapus AFTER DELETE ON jurnal BEGIN
+    DELETE FROM jurnal_cari WHERE rowid = OLD.rowid;
+END;
+"""
+VERSI_SKEMA_SQLITE = 2
+
+# Basis data versi < 2 belum punya kolom urut; urutan lama diambil dari rowid.
+MIGRASI_SQLITE_URUT = """
+ALTER TABLE jurnal ADD COLUMN urut INTEGER NOT NULL DEFAULT 0;
+UPDATE jurnal SET urut = rowid;
+"""
+
+# Basis data versi 0 menyimpan nominal rupiah sebagai REAL. Tabel entri
+# dibuat ulang dengan kolom INTEGER (sen); trigger mengisi ulang saldo_harian.
+MIGRASI_SQLITE_SEN = """
+DROP TRIGGER IF EXISTS trg_entri_tambah;
+DROP TRIGGER IF EXISTS trg_entri_hapus;
+DROP INDEX IF EXISTS idx_entri_tanggal;
+DROP INDEX IF EXISTS idx_entri_akun_tanggal;
+DROP TABLE IF EXISTS saldo_harian;
+ALTER TABLE entri RENAME TO entri_lama;
+""" + SKEMA_SQLITE + """
+INSERT INTO entri (jurnal_id, urutan, tanggal, akun, debit, kredit)
+SELECT jurnal_id, urutan, tanggal, akun, CAST(ROUND(debit * 100) AS INTEGER), CAST(ROUND(kredit * 100) AS INTEGER)
+FROM entri_lama;
+DROP TABLE entri_lama;
+"""
+
+def ke_sen(rupiah):
+    return int(round(rupiah * 100))
+
+def ke_rupiah(sen):
+    return sen / 100
+
+def format_rupiah(sen):
+    tanda = "-" if sen < 0 else ""
+    rupiah, sisa = divmod(abs(int(sen)), 100)
+    return f"{tanda}{rupiah:,}.{sisa:02d}"
+
+@st.cache_resource
+def _state_bersama():
+    # Streamlit mengeksekusi ulang skrip ini di namespace baru pada setiap
+    # rerun, jadi cache tingkat proses disimpan di objek bersama ini.
+    return {}
+
+_bersama = _state_bersama()
+
+# Peternakan aktif per thread: sesi Streamlit, worker, dan pemuatan shard
+# paralel masing-masing membaca/menulis berkas peternakannya sendiri.
+_konteks = _bersama.setdefault("konteks_peternakan", threading.local())
+
+def peternakan_aktif():
+    return getattr(_konteks, "peternakan", PETERNAKAN_BAWAAN)
+
+@contextmanager
+def pakai_peternakan(peternakan):
+    if peternakan not in PETERNAKAN:
+        raise KeyError(f"Peternakan tidak dikenal: {peternakan}")
+    os.makedirs(PETERNAKAN[peternakan]["direktori"], exist_ok=True)
+    lama = peternakan_aktif()
+    _konteks.peternakan = peternakan
+    try:
+        yield
+    finally:
+        _konteks.peternakan = lama
+
+def _path(nama):
+    return os.path.join(PETERNAKAN[peternakan_aktif()]["direktori"], nama)
+
+def _status_log():
+    return _bersama.setdefault("status_log_peternakan", {}).setdefault(peternakan_aktif(), {"jumlah": 0})
+
+# Rekaman rerun yang sedang berjalan disimpan per thread (satu thread per
+# eksekusi skrip). Bila instrumentasi mati tidak ada rekaman, dan fase()
+# serta catat() langsung kembali.
+_instrumen = _bersama.setdefault("instrumen", {
+    "aktif": INSTRUMEN_AKTIF,
+    "kunci": threading.Lock(),
+    "lokal": threading.local(),
+    "riwayat": deque(maxlen=BATAS_RIWAYAT_INSTRUMEN),
+})
+
+@contextmanager
+def rekam_rerun(peternakan):
+    if not _instrumen["aktif"]:
+        yield
+        return
+    rekaman = {
+        "waktu": datetime.now().isoformat(timespec="milliseconds"),
+        "peternakan": peternakan,
+        "menu": None,
+        "fase_ms": {},
+        "hitungan": {},
+    }
+    # Tumpukan waktu fase anak: setiap fase dicatat tanpa waktu fase di
+    # dalamnya, sehingga jumlah semua fase sama dengan total rerun.
+    _instrumen["lokal"].rekaman, _instrumen["lokal"].tumpukan = rekaman, [0.0]
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        total = time.perf_counter() - mulai
+        anak = _instrumen["lokal"].tumpukan[0]
+        _instrumen["lokal"].rekaman = None
+        rekaman["fase_ms"]["lain"] = (total - anak) * 1000
+        rekaman["fase_ms"] = {nama: round(ms, 3) for nama, ms in rekaman["fase_ms"].items()}
+        rekaman["total_ms"] = round(total * 1000, 3)
+        with _instrumen["kunci"]:
+            _instrumen["riwayat"].append(rekaman)
+            if INSTRUMEN_FILE:
+                with open(INSTRUMEN_FILE, "a") as f:
+                    f.write(json.dumps(rekaman) + "\n")
+
+@contextmanager
+def fase(nama):
+    lokal = _instrumen["lokal"]
+    if getattr(lokal, "rekaman", None) is None:
+        yield
+        return
+    lokal.tumpukan.append(0.0)
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        total = time.perf_counter() - mulai
+        anak = lokal.tumpukan.pop()
+        lokal.tumpukan[-1] += total
+        if lokal.rekaman is not None:
+            lokal.rekaman["fase_ms"][nama] = lokal.rekaman["fase_ms"].get(nama, 0) + (total - anak) * 1000
+
+def diukur(nama):
+    def bungkus(fungsi):
+        @functools.wraps(fungsi)
+        def jalan(*args, **kwargs):
+            with fase(nama):
+                return fungsi(*args, **kwargs)
+        return jalan
+    return bungkus
+
+def catat(nama, jumlah=1):
+    rekaman = getattr(_instrumen["lokal"], "rekaman", None)
+    if rekaman is not None:
+        rekaman["hitungan"][nama] = rekaman["hitungan"].get(nama, 0) + int(jumlah)
+
+def tandai_rekaman(**info):
+    rekaman = getattr(_instrumen["lokal"], "rekaman", None)
+    if rekaman is not None:
+        rekaman.update(info)
+
+def riwayat_instrumen():
+    with _instrumen["kunci"]:
+        return list(_instrumen["riwayat"])
+
+def ringkasan_instrumen(riwayat):
+    # Rata-rata per menu; fase hitung_* dijumlahkan menjadi satu kolom.
+    per_menu = {}
+    for r in riwayat:
+        per_menu.setdefault(r["menu"] or "-", []).append(r)
+    baris = []
+    for menu, daftar in sorted(per_menu.items()):
+        rata = lambda f: round(sum(f(r) for r in daftar) / len(daftar), 2)
+        baris.append({
+            "Menu": menu,
+            "Rerun": len(daftar),
+            "Total (ms)": rata(lambda r: r["total_ms"]),
+            "Muat (ms)": rata(lambda r: r["fase_ms"].get("muat", 0)),
+            "Hitung (ms)": rata(lambda r: sum(ms for f, ms in r["fase_ms"].items() if f.startswith("hitung_"))),
+            "Tampil (ms)": rata(lambda r: r["fase_ms"].get("tampil", 0)),
+            "Simpan (ms)": rata(lambda r: r["fase_ms"].get("simpan", 0)),
+            "Lain (ms)": rata(lambda r: r["fase_ms"].get("lain", 0)),
+        })
+    return baris
+
+class KonflikVersi(Exception):
+    pass
+
+class PeriodeTertutup(Exception):
+    pass
+
+def _cek_periode_terbuka(batas, daftar_tanggal):
+    # batas: tanggal akhir periode terakhir yang sudah ditutup (ISO) atau None.
+    if batas is not None and any(tgl <= batas for tgl in daftar_tanggal):
+        raise PeriodeTertutup(
+            f"Periode sampai {batas} sudah ditutup; jurnal bertanggal sampai tanggal itu "
+            "tidak dapat ditambah, diubah, atau dihapus."
+        )
+
+# Semua penulisan backend JSON (append log, kompaksi, impor) berjalan di bawah
+# kunci ini: RLock untuk thread dalam proses, flock untuk antar-proses.
+# Pembaca tidak mengambil kunci; mereka hanya melihat berkas yang diganti
+# secara atomik dan log yang bertambah di akhir.
+_kunci_tulis = _bersama.setdefault("kunci_tulis", threading.RLock())
+_pemegang_kunci = _bersama.setdefault("pemegang_kunci", threading.local())
+
+@contextmanager
+def _kunci_berkas():
+    with _kunci_tulis:
+        if getattr(_pemegang_kunci, "berkas", None) is not None:
+            yield
+            return
+        with open(_path(DATA_FILE) + ".lock", "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            _pemegang_kunci.berkas = f
+            try:
+                yield
+            finally:
+                _pemegang_kunci.berkas = None
+
+def _baca_log():
+    # Baris terakhir tanpa newline bisa berasal dari penulis yang sedang
+    # menulis; baris itu dilewati, tidak dipotong (lihat _rapikan_log).
+    catatan = []
+    path = _path(LOG_FILE)
+    if not os.path.exists(path):
+        return catatan
+
+    with open(path, "rb") as f:
+        for baris in f:
+            if not baris.endswith(b"\n"):
+                break
+            try:
+                catatan.append(json.loads(baris))
+            except ValueError:
+                break
+            catat("byte_dibaca", len(baris))
+    return catatan
+
+def _rapikan_log():
+    # Dipanggil di bawah kunci tulis: sisa baris yang terpotong (misalnya
+    # karena crash saat menulis) dibuang agar catatan berikutnya tidak
+    # tersambung ke baris yang rusak.
+    path = _path(LOG_FILE)
+    if not os.path.exists(path):
+        return
+    with open(path, "r+b") as f:
+        isi = f.read()
+        if isi and not isi.endswith(b"\n"):
+            f.truncate(isi.rfind(b"\n") + 1)
+
+def _terapkan_log(data, catatan):
+    if not catatan:
+        return
+    posisi = {jurnal_id: i for i, jurnal_id in enumerate(_daftar_id(data["jurnal_umum"]))}
+    dihapus = []
+    catat("jurnal_dipindai", len(catatan))
+    for c in catatan:
+        data["versi"] = max(data.get("versi", 0), c.get("versi", 0))
+        if c["op"] in ("tambah", "ubah"):
+            jurnal = c["jurnal"]
+            if jurnal["id"] in posisi:
+                data["jurnal_umum"][posisi[jurnal["id"]]] = jurnal
+            else:
+                posisi[jurnal["id"]] = len(data["jurnal_umum"])
+                data["jurnal_umum"].append(jurnal)
+        elif c["op"] == "hapus":
+            i = posisi.pop(c["id"], None)
+            if i is not None:
+                dihapus.append(i)
+        elif c["op"] == "tutup":
+            data["tutup_buku"] = [t for t in data.get("tutup_buku", []) if t["sampai"] != c["tutup"]["sampai"]] + [c["tutup"]]
+        elif c["op"] == "buka":
+            data["tutup_buku"] = [t for t in data.get("tutup_buku", []) if t["sampai"] != c["sampai"]]
+    for i in sorted(dihapus, reverse=True):
+        data["jurnal_umum"].pop(i)
+
+def _tulis_log(catatan):
+    baris = json.dumps(catatan) + "\n"
+    catat("byte_ditulis", len(baris))
+    with open(_path(LOG_FILE), "a") as f:
+        f.write(baris)
+        f.flush()
+        os.fsync(f.fileno())
+    _status_log()["jumlah"] += 1
+
+class BukuSqlite:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        versi_skema = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        ada_entri = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entri'").fetchone()
+        migrasi = ""
+        if versi_skema < 2 and ada_entri:
+            migrasi += MIGRASI_SQLITE_URUT
+        if versi_skema < 1 and ada_entri:
+            migrasi += MIGRASI_SQLITE_SEN
+        if migrasi:
+            self.conn.executescript("BEGIN;" + migrasi + f"PRAGMA user_version = {VERSI_SKEMA_SQLITE}; COMMIT;")
+        if versi_skema < VERSI_SKEMA_SQLITE:
+            self.conn.executescript(SKEMA_SQLITE + f"PRAGMA user_version = {VERSI_SKEMA_SQLITE};")
+        with self.conn:
+            kosong = self.conn.execute("SELECT NOT EXISTS (SELECT 1 FROM saldo_harian)").fetchone()[0]
+            if kosong:
+                self.conn.execute("""
+                    INSERT INTO saldo_harian (akun, tanggal, debit, kredit, jumlah)
+                    SELECT akun, tanggal, SUM(debit), SUM(kredit), COUNT(*) FROM entri GROUP BY akun, tanggal
+                """)
+            kosong = self.conn.execute("SELECT NOT EXISTS (SELECT 1 FROM jurnal_cari)").fetchone()[0]
+            if kosong:
+                self.conn.execute("""
+                    INSERT INTO jurnal_cari (rowid, teks)
+                    SELECT j.rowid, j.deskripsi || ' ' || COALESCE((SELECT group_concat(akun, ' ') FROM entri WHERE jurnal_id = j.id), '')
+                    FROM jurnal j
+                """)
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def versi(self):
+        # Berubah pada setiap commit: total_changes untuk koneksi ini,
+        # data_version untuk commit dari koneksi/proses lain.
+        with self.lock:
+            return (self.conn.total_changes, self.conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def jumlah_jurnal(self):
+        return self._query("SELECT COUNT(*) FROM jurnal")[0][0]
+
+    def rentang_tanggal(self):
+        return self._query("SELECT MIN(tanggal), MAX(tanggal) FROM jurnal")[0]
+
+    def akun_terpakai(self):
+        # Loncatan indeks (akun, tanggal): satu pencarian O(log n) per akun.
+        rows = self._query("""
+            WITH RECURSIVE a(akun) AS (
+                SELECT MIN(akun) FROM entri
+                UNION ALL
+                SELECT (SELECT MIN(akun) FROM entri WHERE akun > a.akun) FROM a WHERE a.akun IS NOT NULL
+            )
+            SELECT akun FROM a WHERE akun IS NOT NULL
+        """)
+        return [r[0] for r in rows]
+
+    def mutasi_akun(self, akun, mulai, akhir):
+        rows = self._query("""
+            SELECT e.tanggal, j.deskripsi, e.debit, e.kredit,
+                   SUM(e.debit - e.kredit) OVER (ORDER BY e.tanggal, j.urut, e.urutan)
+            FROM entri e JOIN jurnal j ON j.id = e.jurnal_id
+            WHERE e.akun = ? AND e.tanggal BETWEEN ? AND ?
+            ORDER BY e.tanggal, j.urut, e.urutan
+        """, (akun, mulai, akhir))
+        catat("entri_dipindai", len(rows))
+        return _tabel_mutasi(*(list(zip(*rows)) or [[]] * 5))
+
+    def mutasi_per_akun(self, mulai, akhir, akun=None):
+        # Dijumlahkan dari agregat harian yang dipelihara trigger, sehingga
+        # biayanya sebanding dengan jumlah hari, bukan jumlah baris entri.
+        sql = "SELECT akun, SUM(debit), SUM(kredit) FROM saldo_harian WHERE tanggal BETWEEN ? AND ?"
+        params = [mulai, akhir]
+        if akun is not None:
+            akun = list(akun)
+            sql += " AND akun IN (%s)" % ",".join("?" * len(akun))
+            params += akun
+        rows = self._query(sql + " GROUP BY akun", params)
+        catat("entri_dipindai", len(rows))
+        return {r[0]: {"debit": r[1], "kredit": r[2]} for r in rows}
+
+    def mutasi_berkala(self, batas, akun):
+        # Bila semua batas jatuh pada awal bulan, agregat harian sudah
+        # dijumlahkan per bulan di SQL (padanan kubus bulanan).
+        kunci = "substr(tanggal, 1, 8) || '01'" if _awal_bulan(batas) else "tanggal"
+        akun = list(akun)
+        rows = self._query(f"""
+            SELECT {kunci}, akun, SUM(debit), SUM(kredit) FROM saldo_harian
+            WHERE tanggal >= ? AND tanggal < ? AND akun IN ({",".join("?" * len(akun))})
+            GROUP BY 1, 2
+        """, [str(batas[0]), str(batas[-1])] + akun)
+        catat("entri_dipindai", len(rows))
+        return _kelompokkan_periode(batas, akun, rows)
+
+    def _baris_ke_jurnal(self, baris_jurnal):
+        entri = self._query(
+            "SELECT akun, debit, kredit FROM entri WHERE jurnal_id = ? ORDER BY urutan",
+            (baris_jurnal[0],)
+        )
+        return {
+            "id": baris_jurnal[0],
+            "tanggal": baris_jurnal[1],
+            "deskripsi": baris_jurnal[2],
+            "entri": [{"akun": e[0], "debit": e[1], "kredit": e[2]} for e in entri]
+        }
+
+    def ambil_jurnal(self, jurnal_id):
+        rows = self._query("SELECT id, tanggal, deskripsi FROM jurnal WHERE id = ?", (jurnal_id,))
+        return self._baris_ke_jurnal(rows[0]) if rows else None
+
+    def halaman_jurnal(self, mulai, akhir, token, offset, limit, akun=None, nominal_min=None, nominal_maks=None):
+        kondisi = "tanggal BETWEEN ? AND ?"
+        params = [mulai, akhir]
+        if token:
+            # Setiap token harus cocok sebagai awalan kata (seperti IndeksTeks).
+            kondisi += " AND rowid IN (SELECT rowid FROM jurnal_cari WHERE jurnal_cari MATCH ?)"
+            params.append(" ".join(f'"{t}"*' for t in token))
+        if akun:
+            kondisi += " AND EXISTS (SELECT 1 FROM entri WHERE entri.jurnal_id = jurnal.id AND entri.akun = ?)"
+            params.append(akun)
+        if nominal_min is not None or nominal_maks is not None:
+            kondisi += " AND (SELECT SUM(debit) FROM entri WHERE entri.jurnal_id = jurnal.id) BETWEEN ? AND ?"
+            params += [nominal_min if nominal_min is not None else -2**63,
+                       nominal_maks if nominal_maks is not None else 2**63 - 1]
+        total = self._query(f"SELECT COUNT(*) FROM jurnal WHERE {kondisi}", params)[0][0]
+        rows = self._query(
+            f"SELECT id, tanggal, deskripsi FROM jurnal WHERE {kondisi} ORDER BY tanggal DESC, urut DESC LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        )
+        catat("jurnal_dipindai", len(rows))
+        return total, [self._baris_ke_jurnal(r) for r in rows]
+
+    def _tulis_jurnal(self, jurnal):
+        # Jurnal yang diubah mempertahankan urutnya, seperti posisi di daftar
+        # jurnal backend JSON; jurnal baru masuk di akhir.
+        baris = self.conn.execute("SELECT urut FROM jurnal WHERE id = ?", (jurnal["id"],)).fetchone()
+        urut = baris[0] if baris else self.conn.execute("SELECT COALESCE(MAX(urut), 0) + 1 FROM jurnal").fetchone()[0]
+        self.conn.execute("DELETE FROM jurnal WHERE id = ?", (jurnal["id"],))
+        rowid = self.conn.execute(
+            "INSERT INTO jurnal (id, tanggal, deskripsi, urut) VALUES (?, ?, ?, ?)",
+            (jurnal["id"], jurnal["tanggal"], jurnal["deskripsi"], urut)
+        ).lastrowid
+        self.conn.execute(
+            "INSERT INTO jurnal_cari (rowid, teks) VALUES (?, ?)",
+            (rowid, " ".join([jurnal["deskripsi"]] + [e["akun"] for e in jurnal["entri"]]))
+        )
+        self.conn.executemany(
+            "INSERT INTO entri (jurnal_id, urutan, tanggal, akun, debit, kredit) VALUES (?, ?, ?, ?, ?, ?)",
+            [(jurnal["id"], i, jurnal["tanggal"], e["akun"], e["debit"], e["kredit"])
+             for i, e in enumerate(jurnal["entri"])]
+        )
+
+    def _mulai_tulis(self):
+        # BEGIN IMMEDIATE: pemeriksaan (versi, periode tertutup) dan penulisan
+        # dalam satu transaksi tulis, juga terhadap proses lain.
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn.execute("SELECT MAX(sampai) FROM tutup_buku").fetchone()[0]
+
+    def simpan_jurnal(self, jurnal, asal=None):
+        with self.lock, self.conn:
+            batas = self._mulai_tulis()
+            baris = self.conn.execute("SELECT id, tanggal, deskripsi FROM jurnal WHERE id = ?", (jurnal["id"],)).fetchall()
+            terkini = self._baris_ke_jurnal(baris[0]) if baris else None
+            if asal is not None and terkini != asal:
+                raise KonflikVersi(terkini)
+            _cek_periode_terbuka(batas, [jurnal["tanggal"]] + [b[1] for b in baris])
+            self._tulis_jurnal(jurnal)
+
+    def hapus_jurnal(self, jurnal_id):
+        with self.lock, self.conn:
+            batas = self._mulai_tulis()
+            _cek_periode_terbuka(batas, [b[0] for b in self.conn.execute("SELECT tanggal FROM jurnal WHERE id = ?", (jurnal_id,))])
+            self.conn.execute("DELETE FROM jurnal WHERE id = ?", (jurnal_id,))
+
+    def impor(self, data):
+        with self.lock, self.conn:
+            batas = self._mulai_tulis()
+            _cek_periode_terbuka(batas, [j["tanggal"] for j in data["jurnal_umum"]])
+            for jurnal in data["jurnal_umum"]:
+                self._tulis_jurnal(jurnal)
+            for tutup in data.get("tutup_buku", []):
+                self._tulis_tutup(tutup)
+
+    def daftar_tutup(self):
+        saldo = {}
+        for sampai, akun, debit, kredit in self._query("SELECT sampai, akun, debit, kredit FROM saldo_tutup"):
+            saldo.setdefault(sampai, {})[akun] = {"debit": debit, "kredit": kredit}
+        return [
+            {"sampai": sampai, "ditutup": ditutup, "saldo": saldo.get(sampai, {})}
+            for sampai, ditutup in self._query("SELECT sampai, ditutup FROM tutup_buku ORDER BY sampai")
+        ]
+
+    def _tulis_tutup(self, tutup):
+        self.conn.execute("INSERT INTO tutup_buku (sampai, ditutup) VALUES (?, ?)", (tutup["sampai"], tutup["ditutup"]))
+        self.conn.executemany(
+            "INSERT INTO saldo_tutup (sampai, akun, debit, kredit) VALUES (?, ?, ?, ?)",
+            [(tutup["sampai"], akun, m["debit"], m["kredit"]) for akun, m in tutup["saldo"].items()]
+        )
+
+    def tutup(self, sampai):
+        # Saldo dihitung di dalam transaksi tulis yang sama, sehingga jurnal
+        # yang disimpan proses lain tidak bisa menyelip di antara hitung dan simpan.
+        with self.lock, self.conn:
+            batas = self._mulai_tulis()
+            _cek_periode_terbuka(batas, [sampai])
+            rows = self.conn.execute("""
+                SELECT akun, SUM(debit), SUM(kredit) FROM (
+                    SELECT akun, debit, kredit FROM saldo_tutup WHERE sampai = ?
+                    UNION ALL
+                    SELECT akun, debit, kredit FROM saldo_harian WHERE tanggal > ? AND tanggal <= ?
+                ) GROUP BY akun
+            """, (batas, batas or "", sampai)).fetchall()
+            tutup = _rekaman_tutup(sampai, {r[0]: {"debit": r[1], "kredit": r[2]} for r in rows})
+            self._tulis_tutup(tutup)
+
+    def buka(self, sampai):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM tutup_buku WHERE sampai = ?", (sampai,))
+
+def _pakai_sqlite(data):
+    # Bukan isinstance(BukuSqlite): objek dari cache bersama dibuat oleh
+    # kelas pada rerun sebelumnya.
+    return not isinstance(data, dict)
+
+_buku_sqlite = _bersama.setdefault("buku_sqlite", {})
+
+def buka_sqlite():
+    path = _path(SQLITE_FILE)
+    if path not in _buku_sqlite:
+        buku = BukuSqlite(path)
+        buku.peternakan = peternakan_aktif()
+        # Pertama kali backend SQLite dipakai, isi dari ledger backend JSON
+        # yang sudah ada: snapshot JSON atau biner, ditambah log yang belum
+        # dikompaksi (ledger baru bisa hanya ada di log).
+        ada_ledger = any(os.path.exists(_path(nama)) for nama in (DATA_FILE, SNAPSHOT_BINER_FILE, LOG_FILE))
+        if buku.jumlah_jurnal() == 0 and ada_ledger:
+            buku.impor(_muat_snapshot()[0])
+        _buku_sqlite[path] = buku
+    return _buku_sqlite[path]
+
+# Satu salinan ledger hasil parsing dipakai bersama oleh semua sesi.
+# Setiap sesi menerima daftar jurnal salinan dangkal (copy-on-write):
+# perubahan mengganti dict jurnal, tidak pernah mengubahnya di tempat.
+_kunci_cache = _bersama.setdefault("kunci_data", threading.Lock())
+
+def _cache_ledger():
+    return _bersama.setdefault("data_peternakan", {}).setdefault(
+        peternakan_aktif(), {"tanda": None, "data": None, "hit": 0, "miss": 0}
+    )
+
+def _tanda_file():
+    tanda = []
+    for path in (_path(DATA_FILE), _path(SNAPSHOT_BINER_FILE), _path(LOG_FILE)):
+        try:
+            st_file = os.stat(path)
+            tanda.append((st_file.st_mtime_ns, st_file.st_size))
+        except FileNotFoundError:
+            tanda.append(None)
+    return tuple(tanda)
+
+def _salin_data(data):
+    salinan = dict(data)
+    salinan["jurnal_umum"] = data["jurnal_umum"].copy()
+    return salinan
+
+def _segarkan_cache(data, tanda_lama, versi_lama):
+    # Dipanggil setelah menulis: jika cache sebelumnya sinkron dengan keadaan
+    # yang menjadi dasar penulisan ini, pasang data sesi sebagai versi baru;
+    # jika tidak, buang cache agar rerun berikutnya membaca ulang dari disk.
+    with _kunci_cache:
+        cache = _cache_ledger()
+        if (cache["data"] is not None and cache["tanda"] == tanda_lama
+                and cache["data"]["versi"] == versi_lama):
+            cache["data"] = _salin_data(data)
+            cache["tanda"] = _tanda_file()
+            cache["nominal_lama"] = False
+        else:
+            cache["data"] = None
+            cache["tanda"] = None
+
+def statistik_cache_data():
+    cache = _cache_ledger()
+    return {"hit": cache["hit"], "miss": cache["miss"], "versi": (cache["data"] or {}).get("versi")}
+
+def load_data():
+    if STORAGE_BACKEND == "sqlite":
+        return buka_sqlite()
+
+    cache = _cache_ledger()
+    with _kunci_cache:
+        tanda = _tanda_file()
+        if cache["data"] is not None and cache["tanda"] == tanda:
+            cache["hit"] += 1
+        else:
+            cache["miss"] += 1
+            cache["data"], cache["nominal_lama"] = _muat_snapshot()
+            cache["tanda"] = tanda
+        return _salin_data(cache["data"])
+
+def _muat_snapshot():
+    # Hanya membaca: tidak ada berkas yang ditulis. Hanya satu format
+    # snapshot yang ada pada satu waktu; format yang dikonfigurasi didahulukan
+    # bila keduanya ada (crash saat kompaksi). Format berkas baru berganti
+    # ke FORMAT_SNAPSHOT saat kompaksi berikutnya.
+    path_json, path_biner = _path(DATA_FILE), _path(SNAPSHOT_BINER_FILE)
+    if os.path.exists(path_biner) and (FORMAT_SNAPSHOT == "biner" or not os.path.exists(path_json)):
+        snapshot = SnapshotBiner(path_biner)
+        data = dict(snapshot.header["data"], jurnal_umum=DaftarJurnalBiner(snapshot))
+        catat("byte_dibaca", os.path.getsize(path_biner))
+    elif os.path.exists(path_json):
+        with open(path_json, "r") as f:
+            data = json.load(f)
+        catat("byte_dibaca", os.path.getsize(path_json))
+    else:
+        data = {"jurnal_umum": [], "format_nominal": FORMAT_NOMINAL}
+    data.setdefault("versi", 0)
+    # Penanda shard: cache turunan per versi dikunci (peternakan, versi).
+    data["peternakan"] = peternakan_aktif()
+
+    catatan = _baca_log()
+    _terapkan_log(data, catatan)
+    _status_log()["jumlah"] = len(catatan)
+
+    nominal_lama = data.get("format_nominal") != FORMAT_NOMINAL
+    if nominal_lama:
+        # Berkas lama (nominal rupiah float, juga log-nya): diubah ke sen di
+        # memori. Berkasnya dikompaksi dalam sen oleh penulis pertama (lihat
+        # _sinkronkan), sebelum catatan log bernominal sen ditambahkan.
+        data["jurnal_umum"] = [_jurnal_ke_sen(j) for j in data["jurnal_umum"]]
+        data["format_nominal"] = FORMAT_NOMINAL
+    return data, nominal_lama
+
+def _jurnal_ke_sen(jurnal):
+    return dict(jurnal, entri=[
+        dict(e, debit=ke_sen(e["debit"]), kredit=ke_sen(e["kredit"])) for e in jurnal["entri"]
+    ])
+
+@diukur("simpan")
+def save_data(data):
+    if _pakai_sqlite(data):
+        # Setiap perubahan pada SQLite sudah di-commit per transaksi.
+        return
+
+    with _kunci_berkas():
+        _rapikan_log()
+        tanda_lama = _tanda_file()
+        if load_data()["versi"] > data.get("versi", 0):
+            raise KonflikVersi("Ledger di disk lebih baru daripada data yang akan disimpan.")
+        _tulis_snapshot(data)
+        _segarkan_cache(data, tanda_lama, data.get("versi", 0))
+    jadwalkan_prahitung(data)
+
+def _tulis_snapshot(data):
+    # Kompaksi: tulis snapshot lengkap secara atomik, lalu kosongkan log.
+    # Urutan ini aman karena pemutaran ulang log bersifat idempoten.
+    if FORMAT_SNAPSHOT == "biner":
+        path, path_lain = _path(SNAPSHOT_BINER_FILE), _path(DATA_FILE)
+    else:
+        path, path_lain = _path(DATA_FILE), _path(SNAPSHOT_BINER_FILE)
+    tmp_file = path + ".tmp"
+    if FORMAT_SNAPSHOT == "biner":
+        with open(tmp_file, "wb") as f:
+            _tulis_kolom_biner(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+    else:
+        with open(tmp_file, "w") as f:
+            json.dump(dict(data, jurnal_umum=list(data["jurnal_umum"])), f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+    catat("byte_ditulis", os.path.getsize(tmp_file))
+    os.replace(tmp_file, path)
+
+    for path in (path_lain, _path(LOG_FILE)):
+        if os.path.exists(path):
+            os.remove(path)
+    _status_log()["jumlah"] = 0
+
+def _pool_teks(daftar):
+    # Daftar string -> (byte UTF-8 bersambung, offset awal tiap string).
+    encoded = [t.encode("utf-8") for t in daftar]
+    offset = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offset[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offset
+
+def _baca_pool_teks(teks, offset):
+    mentah = teks.tobytes()
+    batas = offset.tolist()
+    return [mentah[a:b].decode("utf-8") for a, b in zip(batas[:-1], batas[1:])]
+
+def _tulis_kolom_biner(data, f):
+    kolom = _kolom_ledger(data["jurnal_umum"], dengan_id=True)
+    # Deskripsi sangat berulang (mis. "penjualan susu"), jadi disimpan sekali
+    # di pool dan setiap jurnal hanya menyimpan kodenya.
+    pool_deskripsi = {}
+    kode_deskripsi = np.fromiter(
+        (pool_deskripsi.setdefault(d, len(pool_deskripsi)) for d in kolom["deskripsi"]),
+        dtype=np.int32, count=len(kolom["deskripsi"])
+    )
+    awal_entri = np.zeros(len(kolom["jumlah_entri"]) + 1, dtype=np.int64)
+    np.cumsum(kolom["jumlah_entri"], out=awal_entri[1:])
+    id_teks, id_offset = _pool_teks(kolom["id"])
+    deskripsi_teks, deskripsi_offset = _pool_teks(list(pool_deskripsi))
+    susunan = {
+        "tanggal": kolom["tanggal"],
+        "awal_entri": awal_entri,
+        "deskripsi_kode": kode_deskripsi,
+        "entri_akun": kolom["entri_akun"],
+        "debit": kolom["debit"],
+        "kredit": kolom["kredit"],
+        "id_teks": id_teks,
+        "id_offset": id_offset,
+        "deskripsi_teks": deskripsi_teks,
+        "deskripsi_offset": deskripsi_offset,
+    }
+
+    posisi = 0
+    daftar_kolom = {}
+    for nama, arr in susunan.items():
+        posisi = -(-posisi // 64) * 64
+        daftar_kolom[nama] = {"dtype": arr.dtype.str, "jumlah": len(arr), "offset": posisi}
+        posisi += arr.nbytes
+    header = json.dumps({
+        "data": {k: v for k, v in data.items() if k != "jurnal_umum"},
+        "akun": kolom["akun"],
+        "kolom": daftar_kolom
+    }).encode("utf-8")
+
+    f.write(MAGIC_BINER)
+    f.write(len(header).to_bytes(8, "little"))
+    f.write(header)
+    awal_data = -(-f.tell() // 64) * 64
+    for nama, arr in susunan.items():
+        f.write(b"\0" * (awal_data + daftar_kolom[nama]["offset"] - f.tell()))
+        np.ascontiguousarray(arr).tofile(f)
+
+class SnapshotBiner:
+    # Snapshot kolom. Array dibaca langsung dari memmap tanpa disalin; akun
+    # disimpan sebagai kode ke tabel nama di header.
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC_BINER)) != MAGIC_BINER:
+                raise ValueError(f"{path} bukan snapshot biner peternakan")
+            panjang = int.from_bytes(f.read(8), "little")
+            self.header = json.loads(f.read(panjang))
+            awal_data = -(-f.tell() // 64) * 64
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        self.kolom = {
+            nama: np.frombuffer(buffer, dtype=k["dtype"], count=k["jumlah"], offset=awal_data + k["offset"])
+            for nama, k in self.header["kolom"].items()
+        }
+        self.akun = self.header["akun"]
+        self.jumlah_jurnal = len(self.kolom["tanggal"])
+        self._id = None
+        self._deskripsi = None
+
+    def semua_id(self):
+        if self._id is None:
+            self._id = _baca_pool_teks(self.kolom["id_teks"], self.kolom["id_offset"])
+        return self._id
+
+    def pool_deskripsi(self):
+        if self._deskripsi is None:
+            self._deskripsi = _baca_pool_teks(self.kolom["deskripsi_teks"], self.kolom["deskripsi_offset"])
+        return self._deskripsi
+
+    def jurnal(self, i):
+        k = self.kolom
+        a, b = k["awal_entri"][i], k["awal_entri"][i + 1]
+        return {
+            "id": self.semua_id()[i],
+            "tanggal": str(k["tanggal"][i]),
+            "deskripsi": self.pool_deskripsi()[k["deskripsi_kode"][i]],
+            "entri": [
+                {"akun": self.akun[akun], "debit": debit, "kredit": kredit}
+                for akun, debit, kredit in zip(k["entri_akun"][a:b].tolist(), k["debit"][a:b].tolist(), k["kredit"][a:b].tolist())
+            ]
+        }
+
+class DaftarJurnalBiner:
+    # Pengganti list jurnal_umum di atas SnapshotBiner. Elemen `isi` berupa
+    # nomor baris snapshot (dibuat menjadi dict saat diakses) atau dict jurnal
+    # yang ditambahkan/diubah sesudah snapshot ditulis.
+    def __init__(self, snapshot, isi=None):
+        self.snapshot = snapshot
+        self.isi = list(range(snapshot.jumlah_jurnal)) if isi is None else isi
+
+    def _jurnal(self, v):
+        return self.snapshot.jurnal(v) if type(v) is int else v
+
+    def __len__(self):
+        return len(self.isi)
+
+    def __getitem__(self, i):
+        return self._jurnal(self.isi[i])
+
+    def __setitem__(self, i, jurnal):
+        self.isi[i] = jurnal
+
+    def __iter__(self):
+        return map(self._jurnal, self.isi)
+
+    def append(self, jurnal):
+        self.isi.append(jurnal)
+
+    def extend(self, daftar_jurnal):
+        self.isi.extend(daftar_jurnal)
+
+    def pop(self, i):
+        return self._jurnal(self.isi.pop(i))
+
+    def copy(self):
+        return DaftarJurnalBiner(self.snapshot, list(self.isi))
+
+    def daftar_id(self):
+        semua_id = self.snapshot.semua_id()
+        return [semua_id[v] if type(v) is int else v["id"] for v in self.isi]
+
+    def daftar_tanggal(self):
+        semua_tanggal = np.datetime_as_string(self.snapshot.kolom["tanggal"], unit="D").tolist()
+        return [semua_tanggal[v] if type(v) is int else v["tanggal"] for v in self.isi]
+
+    def kolom(self, dengan_id=False):
+        # Baris yang masih berasal dari snapshot diambil secara vektor; hanya
+        # jurnal hasil perubahan sesudah snapshot yang dibaca satu per satu.
+        sumber = self.snapshot.kolom
+        baris = np.fromiter((v if type(v) is int else -1 for v in self.isi), dtype=np.int64, count=len(self.isi))
+        dari_snapshot = baris >= 0
+        b = baris[dari_snapshot]
+        posisi_baru = np.flatnonzero(~dari_snapshot)
+        jurnal_baru = [self.isi[p] for p in posisi_baru.tolist()]
+
+        jumlah_entri = np.zeros(len(baris), dtype=np.int64)
+        jumlah_entri[dari_snapshot] = sumber["awal_entri"][b + 1] - sumber["awal_entri"][b]
+        jumlah_entri[posisi_baru] = [len(j["entri"]) for j in jurnal_baru]
+        tanggal = np.empty(len(baris), dtype="datetime64[D]")
+        tanggal[dari_snapshot] = sumber["tanggal"][b]
+        tanggal[posisi_baru] = np.array([j["tanggal"] for j in jurnal_baru], dtype="datetime64[D]")
+
+        awal = np.zeros(len(baris) + 1, dtype=np.int64)
+        np.cumsum(jumlah_entri, out=awal[1:])
+        entri_akun = np.empty(awal[-1], dtype=np.int32)
+        debit = np.empty(awal[-1], dtype=np.int64)
+        kredit = np.empty(awal[-1], dtype=np.int64)
+
+        jumlah = jumlah_entri[dari_snapshot]
+        geser = np.arange(jumlah.sum()) - np.repeat(np.cumsum(jumlah) - jumlah, jumlah)
+        tujuan = np.repeat(awal[:-1][dari_snapshot], jumlah) + geser
+        asal = np.repeat(sumber["awal_entri"][b], jumlah) + geser
+        entri_akun[tujuan] = sumber["entri_akun"][asal]
+        debit[tujuan] = sumber["debit"][asal]
+        kredit[tujuan] = sumber["kredit"][asal]
+
+        kode_akun = {nama: k for k, nama in enumerate(self.snapshot.akun)}
+        for p, jurnal in zip(posisi_baru.tolist(), jurnal_baru):
+            for k, e in enumerate(jurnal["entri"], start=awal[p]):
+                entri_akun[k] = kode_akun.setdefault(e["akun"], len(kode_akun))
+                debit[k] = e["debit"]
+                kredit[k] = e["kredit"]
+
+        pool = self.snapshot.pool_deskripsi()
+        kode_deskripsi = sumber["deskripsi_kode"].tolist()
+        kolom = {
+            "tanggal": tanggal,
+            "jumlah_entri": jumlah_entri,
+            "akun": list(kode_akun),
+            "entri_akun": entri_akun,
+            "debit": debit,
+            "kredit": kredit,
+            "deskripsi": [pool[kode_deskripsi[v]] if type(v) is int else v["deskripsi"] for v in self.isi]
+        }
+        if dengan_id:
+            kolom["id"] = self.daftar_id()
+        return kolom
+
+def _daftar_id(jurnal_umum):
+    if not isinstance(jurnal_umum, list):
+        return jurnal_umum.daftar_id()
+    return [j["id"] for j in jurnal_umum]
+
+def _daftar_tanggal(jurnal_umum):
+    if not isinstance(jurnal_umum, list):
+        return jurnal_umum.daftar_tanggal()
+    return [j["tanggal"] for j in jurnal_umum]
+
+def _terpindai(kolom):
+    catat("jurnal_dipindai", len(kolom["jumlah_entri"]))
+    catat("entri_dipindai", len(kolom["debit"]))
+    return kolom
+
+def _kolom_ledger(jurnal_umum, dengan_id=False):
+    # Bentuk kolom seluruh ledger untuk MatriksEntri dan snapshot biner.
+    if not isinstance(jurnal_umum, list):
+        return _terpindai(jurnal_umum.kolom(dengan_id))
+
+    kode_akun = {}
+    jumlah_entri = []
+    akun, debit, kredit = [], [], []
+    for jurnal in jurnal_umum:
+        jumlah_entri.append(len(jurnal["entri"]))
+        for e in jurnal["entri"]:
+            akun.append(kode_akun.setdefault(e["akun"], len(kode_akun)))
+            debit.append(e["debit"])
+            kredit.append(e["kredit"])
+    kolom = {
+        "tanggal": np.array([j["tanggal"] for j in jurnal_umum], dtype="datetime64[D]"),
+        "jumlah_entri": np.array(jumlah_entri, dtype=np.int64),
+        "akun": list(kode_akun),
+        "entri_akun": np.array(akun, dtype=np.int32),
+        "debit": np.array(debit, dtype=np.int64),
+        "kredit": np.array(kredit, dtype=np.int64),
+        "deskripsi": [j["deskripsi"] for j in jurnal_umum]
+    }
+    if dengan_id:
+        kolom["id"] = [j["id"] for j in jurnal_umum]
+    return _terpindai(kolom)
+
+def _naikkan_versi(data):
+    data["versi"] = data.get("versi", 0) + 1
+    return data["versi"]
+
+def _setelah_tulis(data, tanda_lama):
+    _segarkan_cache(data, tanda_lama, data["versi"] - 1)
+    if _status_log()["jumlah"] >= BATAS_KOMPAKSI_LOG:
+        save_data(data)
+    jadwalkan_prahitung(data)
+
+def _sinkronkan(data):
+    # Dipanggil di bawah kunci tulis, sebelum perubahan diterapkan. Versi
+    # dinaikkan hanya oleh penulis yang memegang kunci, jadi versi yang sama
+    # berarti isi yang sama. Jika sesi/proses lain sudah menulis sejak data
+    # sesi ini dimuat, data sesi diganti (di tempat) dengan keadaan terbaru
+    # dan perubahan diterapkan di atasnya, sehingga tidak ada yang tertimpa.
+    _rapikan_log()
+    tanda = _tanda_file()
+    terbaru = load_data()
+    with _kunci_cache:
+        cache = _cache_ledger()
+        if cache.get("nominal_lama") and cache["tanda"] == tanda:
+            _tulis_snapshot(cache["data"])
+            cache["tanda"] = tanda = _tanda_file()
+            cache["nominal_lama"] = False
+    if terbaru["versi"] != data["versi"]:
+        data.clear()
+        data.update(terbaru)
+    return tanda
+
+@diukur("simpan")
+def simpan_jurnal_baru(data, jurnal):
+    if _pakai_sqlite(data):
+        data.simpan_jurnal(jurnal)
+        return
+    with _kunci_berkas():
+        tanda_lama = _sinkronkan(data)
+        _cek_periode_terbuka(_batas_tutup(data), [jurnal["tanggal"]])
+        indeks = indeks_jurnal(data)
+        data["jurnal_umum"].append(jurnal)
+        _tulis_log({"op": "tambah", "versi": _naikkan_versi(data), "jurnal": jurnal})
+        _perbarui_indeks(data, indeks, None, jurnal)
+        _perbarui_saldo_harian(data, None, jurnal)
+        _perbarui_kubus_bulanan(data, None, jurnal)
+        _perbarui_indeks_teks(data, indeks, None, jurnal)
+        _setelah_tulis(data, tanda_lama)
+
+@diukur("simpan")
+def perbarui_jurnal(data, jurnal, asal=None):
+    # asal: isi jurnal saat form edit dibuka. Bila jurnal itu sudah diubah
+    # atau dihapus orang lain sejak itu, KonflikVersi dilempar membawa isi
+    # terkininya; perubahan pada jurnal lain digabung tanpa konflik.
+    if _pakai_sqlite(data):
+        data.simpan_jurnal(jurnal, asal)
+        return
+    with _kunci_berkas():
+        tanda_lama = _sinkronkan(data)
+        indeks = indeks_jurnal(data)
+        i = indeks.posisi(jurnal["id"])
+        lama = data["jurnal_umum"][i] if i is not None else None
+        if lama is None or (asal is not None and lama != asal):
+            raise KonflikVersi(lama)
+        _cek_periode_terbuka(_batas_tutup(data), [lama["tanggal"], jurnal["tanggal"]])
+        data["jurnal_umum"][i] = jurnal
+        _tulis_log({"op": "ubah", "versi": _naikkan_versi(data), "jurnal": jurnal})
+        _perbarui_indeks(data, indeks, lama, jurnal)
+        _perbarui_saldo_harian(data, lama, jurnal)
+        _perbarui_kubus_bulanan(data, lama, jurnal)
+        _perbarui_indeks_teks(data, indeks, lama, jurnal)
+        _setelah_tulis(data, tanda_lama)
+
+@diukur("simpan")
+def hapus_jurnal(data, jurnal_id):
+    if _pakai_sqlite(data):
+        data.hapus_jurnal(jurnal_id)
+        return
+    with _kunci_berkas():
+        tanda_lama = _sinkronkan(data)
+        indeks = indeks_jurnal(data)
+        i = indeks.posisi(jurnal_id)
+        if i is None:
+            return
+        _cek_periode_terbuka(_batas_tutup(data), [data["jurnal_umum"][i]["tanggal"]])
+        lama = data["jurnal_umum"].pop(i)
+        _tulis_log({"op": "hapus", "versi": _naikkan_versi(data), "id": jurnal_id})
+        _perbarui_indeks(data, indeks, lama, None)
+        _perbarui_saldo_harian(data, lama, None)
+        _perbarui_kubus_bulanan(data, lama, None)
+        _perbarui_indeks_teks(data, indeks, lama, None)
+        _setelah_tulis(data, tanda_lama)
+
+@diukur("simpan")
+def simpan_jurnal_massal(data, daftar_jurnal):
+    # Untuk impor: semua jurnal masuk dalam satu penulisan (satu transaksi
+    # SQLite, atau satu snapshot JSON) dan menjadi satu versi baru.
+    if _pakai_sqlite(data):
+        data.impor({"jurnal_umum": daftar_jurnal})
+        return
+    with _kunci_berkas():
+        tanda_lama = _sinkronkan(data)
+        _cek_periode_terbuka(_batas_tutup(data), [j["tanggal"] for j in daftar_jurnal])
+        data["jurnal_umum"].extend(daftar_jurnal)
+        _naikkan_versi(data)
+        _tulis_snapshot(data)
+        _segarkan_cache(data, tanda_lama, data["versi"] - 1)
+    jadwalkan_prahitung(data)
+
+@diukur("simpan")
+def tutup_periode(data, sampai):
+    # Membekukan semua jurnal s.d. `sampai` dan menyimpan saldo kumulatif
+    # per akun pada tanggal itu sebagai saldo awal periode berikutnya.
+    if _pakai_sqlite(data):
+        data.tutup(sampai.isoformat())
+        return
+    with _kunci_berkas():
+        tanda_lama = _sinkronkan(data)
+        _cek_periode_terbuka(_batas_tutup(data), [sampai.isoformat()])
+        tutup = _rekaman_tutup(sampai.isoformat(), saldo_sampai(data, sampai))
+        data["tutup_buku"] = data.get("tutup_buku", []) + [tutup]
+        _tulis_log({"op": "tutup", "versi": _naikkan_versi(data), "tutup": tutup})
+        _bawa_cache_versi(data)
+        _setelah_tulis(data, tanda_lama)
+
+@diukur("simpan")
+def buka_periode_terakhir(data):
+    terakhir = tutup_buku_terakhir(data)
+    if terakhir is None:
+        return
+    if _pakai_sqlite(data):
+        data.buka(terakhir["sampai"])
+        return
+    with _kunci_berkas():
+        tanda_lama = _sinkronkan(data)
+        terakhir = tutup_buku_terakhir(data)
+        if terakhir is None:
+            return
+        data["tutup_buku"] = [t for t in data["tutup_buku"] if t is not terakhir]
+        _tulis_log({"op": "buka", "versi": _naikkan_versi(data), "sampai": terakhir["sampai"]})
+        _bawa_cache_versi(data)
+        _setelah_tulis(data, tanda_lama)
+
+def _rekaman_tutup(sampai, saldo):
+    return {
+        "sampai": sampai,
+        "ditutup": datetime.now().isoformat(timespec="seconds"),
+        "saldo": saldo
+    }
+
+def _bawa_cache_versi(data):
+    # Tutup/buka periode tidak mengubah jurnal: struktur turunan versi
+    # sebelumnya tetap berlaku untuk versi baru.
+    for cache in (_cache_indeks, _cache_matriks, _cache_saldo_harian, _cache_kubus_bulanan, _cache_indeks_teks):
+        if _kunci_versi(data, 1) in cache:
+            _simpan_cache_versi(cache, _kunci_versi(data), cache[_kunci_versi(data, 1)])
+
+BATAS_DELTA_INDEKS = 1024
+
+class IndeksJurnal:
+    # Indeks id dan urutan tanggal data["jurnal_umum"]. Versi yang sudah
+    # di-cache tidak pernah diubah (mungkin sedang dibaca sesi lain); agar
+    # satu penulisan tidak menyalin seluruh indeks, setiap versi terdiri dari
+    # bagian dasar yang dipakai bersama dan delta kecil yang disalin:
+    #   kunci: id -> (tanggal, nomor, id); nomor mengikuti urutan masuk,
+    #     sehingga jurnal bertanggal sama tetap stabil dan urutan nomor sama
+    #     dengan urutan di data["jurnal_umum"]. kunci_ubah menimpa
+    #     kunci_dasar (None = dihapus).
+    #   urut: urut_dasar terurut, dikurangi urut_buang, ditambah urut_tambah.
+    #   terhapus: nomor yang sudah dihapus (terurut); posisi jurnal di daftar
+    #     = nomor - banyaknya nomor terhapus sebelumnya.
+    # Delta dilebur ke dasar setiap BATAS_DELTA_INDEKS perubahan (O(n)).
+    def __init__(self, daftar_id=(), daftar_tanggal=()):
+        self.kunci_dasar = {jurnal_id: (tgl, i, jurnal_id) for i, (jurnal_id, tgl) in enumerate(zip(daftar_id, daftar_tanggal))}
+        self.urut_dasar = sorted(self.kunci_dasar.values())
+        self.kunci_ubah = {}
+        self.urut_tambah = []
+        self.urut_buang = set()
+        self.terhapus = np.array([], dtype=np.int64)
+        self.nomor_berikut = len(self.kunci_dasar)
+
+    def kunci(self, jurnal_id):
+        if jurnal_id in self.kunci_ubah:
+            return self.kunci_ubah[jurnal_id]
+        return self.kunci_dasar.get(jurnal_id)
+
+    def nomor(self, jurnal_id):
+        kunci = self.kunci(jurnal_id)
+        return kunci[1] if kunci is not None else None
+
+    def posisi(self, jurnal_id):
+        nomor = self.nomor(jurnal_id)
+        if nomor is None:
+            return None
+        return nomor - int(np.searchsorted(self.terhapus, nomor))
+
+    def dengan_perubahan(self, lama, baru):
+        # O(log n + ukuran delta) per perubahan; array nomor terhapus disalin
+        # utuh (memcpy, sebanding dengan jumlah jurnal yang pernah dihapus).
+        hasil = IndeksJurnal()
+        hasil.kunci_dasar = self.kunci_dasar
+        hasil.urut_dasar = self.urut_dasar
+        hasil.kunci_ubah = dict(self.kunci_ubah)
+        hasil.urut_tambah = list(self.urut_tambah)
+        hasil.urut_buang = set(self.urut_buang)
+        hasil.terhapus = self.terhapus
+        hasil.nomor_berikut = self.nomor_berikut
+        if lama is not None:
+            kunci = self.kunci(lama["id"])
+            i = bisect.bisect_left(hasil.urut_tambah, kunci)
+            if i < len(hasil.urut_tambah) and hasil.urut_tambah[i] == kunci:
+                del hasil.urut_tambah[i]
+            else:
+                hasil.urut_buang.add(kunci)
+            nomor = kunci[1]
+            if baru is None:
+                hasil.kunci_ubah[lama["id"]] = None
+                hasil.terhapus = np.insert(self.terhapus, np.searchsorted(self.terhapus, nomor), nomor)
+        else:
+            nomor = hasil.nomor_berikut
+            hasil.nomor_berikut += 1
+        if baru is not None:
+            kunci = (baru["tanggal"], nomor, baru["id"])
+            hasil.kunci_ubah[baru["id"]] = kunci
+            bisect.insort(hasil.urut_tambah, kunci)
+        if len(hasil.kunci_ubah) > BATAS_DELTA_INDEKS:
+            hasil._lebur()
+        return hasil
+
+    def _lebur(self):
+        kunci = dict(self.kunci_dasar)
+        for jurnal_id, k in self.kunci_ubah.items():
+            if k is None:
+                kunci.pop(jurnal_id, None)
+            else:
+                kunci[jurnal_id] = k
+        # Dua deret terurut: sorted (timsort) cukup menggabungkannya.
+        self.urut_dasar = sorted([k for k in self.urut_dasar if k not in self.urut_buang] + self.urut_tambah)
+        self.kunci_dasar = kunci
+        self.kunci_ubah, self.urut_tambah, self.urut_buang = {}, [], set()
+
+    def rentang(self, mulai, akhir):
+        kiri, kanan = (mulai,), (akhir, float("inf"))
+        hasil = self.urut_dasar[bisect.bisect_left(self.urut_dasar, kiri):bisect.bisect_right(self.urut_dasar, kanan)]
+        if self.urut_buang:
+            hasil = [k for k in hasil if k not in self.urut_buang]
+        tambah = self.urut_tambah[bisect.bisect_left(self.urut_tambah, kiri):bisect.bisect_right(self.urut_tambah, kanan)]
+        return sorted(hasil + tambah) if tambah else hasil
+
+    def ujung(self):
+        # (kunci pertama, kunci terakhir) menurut tanggal, atau None bila kosong.
+        calon = self.urut_tambah[:1] + self.urut_tambah[-1:]
+        for deret in (self.urut_dasar, reversed(self.urut_dasar)):
+            calon += [next((k for k in deret if k not in self.urut_buang), None)]
+        calon = [k for k in calon if k is not None]
+        return (min(calon), max(calon)) if calon else None
+
+_cache_indeks = _bersama.setdefault("indeks_jurnal_peternakan", {})
+
+def indeks_jurnal(data):
+    kunci = _kunci_versi(data)
+    indeks = _cache_indeks.get(kunci) if kunci is not None else None
+    if indeks is None:
+        catat("jurnal_dipindai", len(data["jurnal_umum"]))
+        indeks = IndeksJurnal(_daftar_id(data["jurnal_umum"]), _daftar_tanggal(data["jurnal_umum"]))
+        if kunci is not None:
+            _simpan_cache_versi(_cache_indeks, kunci, indeks)
+    return indeks
+
+def _perbarui_indeks(data, indeks, lama, baru):
+    _simpan_cache_versi(_cache_indeks, _kunci_versi(data), indeks.dengan_perubahan(lama, baru))
+
+class MatriksEntri:
+    # Representasi kolom seluruh baris entri, diurutkan menurut tanggal
+    # sehingga filter periode cukup dengan searchsorted.
+    def __init__(self, data):
+        kolom = _kolom_ledger(data["jurnal_umum"])
+        jumlah_entri = kolom["jumlah_entri"]
+        tanggal = np.repeat(kolom["tanggal"], jumlah_entri)
+        urut = np.argsort(tanggal, kind="stable")
+
+        self.nama_akun = kolom["akun"]
+        self.kode_akun = {nama: k for k, nama in enumerate(self.nama_akun)}
+        self.tanggal = tanggal[urut]
+        self.akun = kolom["entri_akun"][urut]
+        self.debit = kolom["debit"][urut]
+        self.kredit = kolom["kredit"][urut]
+        self.jurnal = np.repeat(np.arange(len(jumlah_entri), dtype=np.int64), jumlah_entri)[urut]
+        self.deskripsi = kolom["deskripsi"]
+
+    def rentang(self, mulai, akhir):
+        kiri = 0 if mulai is None else np.searchsorted(self.tanggal, np.datetime64(mulai, "D"), side="left")
+        kanan = len(self.tanggal) if akhir is None else np.searchsorted(self.tanggal, np.datetime64(akhir, "D"), side="right")
+        return slice(kiri, kanan)
+
+    def mutasi_akun(self, akun, mulai, akhir):
+        if akun not in self.kode_akun:
+            return _tabel_mutasi([], [], [], [], [])
+        sl = self.rentang(mulai, akhir)
+        catat("entri_dipindai", sl.stop - sl.start)
+        pilih = np.flatnonzero(self.akun[sl] == self.kode_akun[akun]) + sl.start
+        debit = self.debit[pilih]
+        kredit = self.kredit[pilih]
+        deskripsi = [self.deskripsi[j] for j in self.jurnal[pilih].tolist()]
+        return _tabel_mutasi(self.tanggal[pilih], deskripsi, debit, kredit, np.cumsum(debit - kredit))
+
+# Mutasi buku besar sebagai DataFrame berbasis Arrow dengan kolom numerik
+# (tanggal date32, nominal sen int64); pemformatan rupiah dilakukan hanya
+# untuk baris yang ditampilkan atau diekspor.
+SKEMA_MUTASI = pa.schema([
+    ("tanggal", pa.date32()),
+    ("deskripsi", pa.string()),
+    ("debit", pa.int64()),
+    ("kredit", pa.int64()),
+    ("saldo", pa.int64()),
+])
+
+def _tabel_mutasi(tanggal, deskripsi, debit, kredit, saldo):
+    kolom = [
+        pa.array(np.asarray(tanggal, dtype="datetime64[D]")),
+        pa.array(deskripsi, type=pa.string()),
+        pa.array(np.asarray(debit, dtype=np.int64)),
+        pa.array(np.asarray(kredit, dtype=np.int64)),
+        pa.array(np.asarray(saldo, dtype=np.int64)),
+    ]
+    return pa.Table.from_arrays(kolom, schema=SKEMA_MUTASI).to_pandas(types_mapper=pd.ArrowDtype)
+
+_cache_matriks = _bersama.setdefault("matriks_peternakan", {})
+BATAS_CACHE_MATRIKS = 4
+
+def _kunci_versi(data, mundur=0):
+    # Kunci cache struktur turunan: versi saja tidak cukup karena setiap
+    # peternakan punya penomoran versinya sendiri.
+    versi = data.get("versi")
+    return (data.get("peternakan"), versi - mundur) if versi is not None else None
+
+def matriks_entri(data):
+    kunci = _kunci_versi(data)
+    matriks = _cache_matriks.get(kunci) if kunci is not None else None
+    if matriks is None:
+        matriks = MatriksEntri(data)
+        if kunci is not None:
+            _simpan_cache_versi(_cache_matriks, kunci, matriks)
+    return matriks
+
+def _hari(tgl):
+    return np.datetime64(tgl, "D")
+
+class SaldoHarian:
+    # Agregat debit/kredit per akun per hari, disimpan sebagai jumlah
+    # kumulatif (prefix sum) sehingga saldo "sampai tanggal X" atau
+    # "antara X dan Y" cukup dengan pencarian biner.
+    def __init__(self, per_akun):
+        # akun -> (hari, debit_kumulatif, kredit_kumulatif, jumlah_baris_kumulatif)
+        self.per_akun = per_akun
+
+    @classmethod
+    def dari_matriks(cls, matriks):
+        per_akun = {}
+        for k, nama in enumerate(matriks.nama_akun):
+            pilih = matriks.akun == k
+            tanggal = matriks.tanggal[pilih]
+            hari, awal = np.unique(tanggal, return_index=True)
+            if not len(hari):
+                continue
+            jumlah = np.diff(np.append(awal, len(tanggal)))
+            per_akun[nama] = (
+                hari,
+                np.cumsum(np.add.reduceat(matriks.debit[pilih], awal)),
+                np.cumsum(np.add.reduceat(matriks.kredit[pilih], awal)),
+                np.cumsum(jumlah)
+            )
+        return cls(per_akun)
+
+    def _kumulatif(self, akun, posisi_hari, sisi):
+        hari, debit, kredit, jumlah = self.per_akun[akun]
+        i = np.searchsorted(hari, posisi_hari, side=sisi)
+        if i == 0:
+            return 0, 0, 0
+        return debit[i - 1], kredit[i - 1], jumlah[i - 1]
+
+    def mutasi_per_akun(self, mulai, akhir, akun=None):
+        hasil = {}
+        for nama in (self.per_akun if akun is None else akun):
+            if nama not in self.per_akun:
+                continue
+            d0, k0, n0 = (0, 0, 0) if mulai is None else self._kumulatif(nama, _hari(mulai), "left")
+            if akhir is None:
+                d1, k1, n1 = (a[-1] for a in self.per_akun[nama][1:])
+            else:
+                d1, k1, n1 = self._kumulatif(nama, _hari(akhir), "right")
+            if n1 - n0 > 0:
+                hasil[nama] = {"debit": int(d1 - d0), "kredit": int(k1 - k0)}
+        return hasil
+
+    def mutasi_berkala(self, batas, akun):
+        debit = np.zeros((len(batas) - 1, len(akun)), dtype=np.int64)
+        kredit = np.zeros_like(debit)
+        for j, nama in enumerate(akun):
+            if nama not in self.per_akun:
+                continue
+            hari, d, k, _ = self.per_akun[nama]
+            i = np.searchsorted(hari, batas, side="left")
+            debit[:, j] = np.diff(np.append(0, d)[i])
+            kredit[:, j] = np.diff(np.append(0, k)[i])
+        return debit, kredit
+
+    def akun_terpakai(self):
+        return sorted(nama for nama, kolom in self.per_akun.items() if kolom[3][-1] > 0)
+
+    def dengan_perubahan(self, lama, baru):
+        # Menghasilkan agregat versi baru; hanya akun yang tersentuh yang
+        # disalin, akun lain dipakai bersama dengan versi sebelumnya.
+        delta = {}
+        for jurnal, tanda in ((lama, -1), (baru, 1)):
+            if jurnal is None:
+                continue
+            for e in jurnal["entri"]:
+                d = delta.setdefault((e["akun"], jurnal["tanggal"]), [0, 0, 0])
+                d[0] += tanda * e["debit"]
+                d[1] += tanda * e["kredit"]
+                d[2] += tanda
+
+        per_akun = dict(self.per_akun)
+        for (nama, tanggal), (d, k, n) in delta.items():
+            hari_baru = _hari(tanggal)
+            if nama in per_akun:
+                hari, debit, kredit, jumlah = per_akun[nama]
+            else:
+                hari = np.array([], dtype="datetime64[D]")
+                debit = np.array([], dtype=np.int64)
+                kredit = np.array([], dtype=np.int64)
+                jumlah = np.array([], dtype=np.int64)
+            i = np.searchsorted(hari, hari_baru)
+            if i == len(hari) or hari[i] != hari_baru:
+                hari = np.insert(hari, i, hari_baru)
+                debit = np.insert(debit, i, debit[i - 1] if i else 0)
+                kredit = np.insert(kredit, i, kredit[i - 1] if i else 0)
+                jumlah = np.insert(jumlah, i, jumlah[i - 1] if i else 0)
+            else:
+                debit, kredit, jumlah = debit.copy(), kredit.copy(), jumlah.copy()
+            debit[i:] += d
+            kredit[i:] += k
+            jumlah[i:] += n
+            per_akun[nama] = (hari, debit, kredit, jumlah)
+        return SaldoHarian(per_akun)
+
+_cache_saldo_harian = _bersama.setdefault("saldo_harian_peternakan", {})
+
+def _simpan_cache_versi(cache, kunci, nilai):
+    # Batas berlaku per peternakan, agar peternakan yang aktif bersamaan tidak
+    # saling mengusir. Bisa dipanggil bersamaan oleh sesi lain dan worker.
+    sejenis = [k for k in list(cache) if k[0] == kunci[0]]
+    for k in sejenis[:max(0, len(sejenis) - BATAS_CACHE_MATRIKS + 1)]:
+        cache.pop(k, None)
+    cache[kunci] = nilai
+
+def saldo_harian(data):
+    kunci = _kunci_versi(data)
+    agregat = _cache_saldo_harian.get(kunci) if kunci is not None else None
+    if agregat is None:
+        agregat = SaldoHarian.dari_matriks(matriks_entri(data))
+        if kunci is not None:
+            _simpan_cache_versi(_cache_saldo_harian, kunci, agregat)
+    return agregat
+
+def _perbarui_saldo_harian(data, lama, baru):
+    sebelumnya = _cache_saldo_harian.get(_kunci_versi(data, 1))
+    if sebelumnya is not None:
+        _simpan_cache_versi(_cache_saldo_harian, _kunci_versi(data), sebelumnya.dengan_perubahan(lama, baru))
+
+def _bulan_ke(bulan, awal):
+    return int((bulan - awal).astype(np.int64))
+
+class KubusBulanan:
+    # Agregat debit/kredit per (bulan, akun) sebagai dua matriks padat
+    # (bulan x akun) mulai bulan `awal`. Tren bulanan, kuartalan, dan
+    # tahunan cukup menjumlahkan baris kubus, tanpa memindai entri.
+    def __init__(self, awal, nama_akun, debit, kredit):
+        self.awal = awal
+        self.nama_akun = nama_akun
+        self.kode_akun = {nama: j for j, nama in enumerate(nama_akun)}
+        self.debit = debit
+        self.kredit = kredit
+
+    @classmethod
+    def dari_matriks(cls, matriks):
+        nama_akun = list(matriks.nama_akun)
+        if not len(matriks.tanggal):
+            kosong = np.zeros((0, len(nama_akun)), dtype=np.int64)
+            return cls(None, nama_akun, kosong, kosong.copy())
+        # Satu lintasan: entri sudah urut tanggal, sel = bulan * jumlah akun + akun.
+        bulan = matriks.tanggal.astype("datetime64[M]")
+        awal = bulan[0]
+        bentuk = (_bulan_ke(bulan[-1], awal) + 1, len(nama_akun))
+        sel = (bulan - awal).astype(np.int64) * len(nama_akun) + matriks.akun
+        debit = np.zeros(bentuk[0] * bentuk[1], dtype=np.int64)
+        kredit = np.zeros_like(debit)
+        np.add.at(debit, sel, matriks.debit)
+        np.add.at(kredit, sel, matriks.kredit)
+        return cls(awal, nama_akun, debit.reshape(bentuk), kredit.reshape(bentuk))
+
+    def mutasi_berkala(self, batas, akun):
+        # batas harus jatuh pada awal bulan (lihat _awal_bulan).
+        debit = np.zeros((len(batas) - 1, len(akun)), dtype=np.int64)
+        kredit = np.zeros_like(debit)
+        pasangan = [(j, self.kode_akun[a]) for j, a in enumerate(akun) if a in self.kode_akun]
+        if self.awal is None or not pasangan:
+            return debit, kredit
+        tujuan, sumber = (list(x) for x in zip(*pasangan))
+        posisi = np.clip((batas.astype("datetime64[M]") - self.awal).astype(np.int64), 0, len(self.debit))
+        for hasil, bulanan in ((debit, self.debit), (kredit, self.kredit)):
+            kumulatif = np.zeros((len(bulanan) + 1, len(sumber)), dtype=np.int64)
+            np.cumsum(bulanan[:, sumber], axis=0, out=kumulatif[1:])
+            hasil[:, tujuan] = np.diff(kumulatif[posisi], axis=0)
+        return debit, kredit
+
+    def dengan_perubahan(self, lama, baru):
+        # Kubus versi baru: matriks disalin (ukurannya bulan x akun, kecil)
+        # lalu diperluas bila ada bulan atau akun baru.
+        delta = {}
+        for jurnal, tanda in ((lama, -1), (baru, 1)):
+            if jurnal is None:
+                continue
+            bulan = np.datetime64(jurnal["tanggal"][:7], "M")
+            for e in jurnal["entri"]:
+                d = delta.setdefault((bulan, e["akun"]), [0, 0])
+                d[0] += tanda * e["debit"]
+                d[1] += tanda * e["kredit"]
+
+        nama_akun = self.nama_akun + sorted({a for _, a in delta if a not in self.kode_akun})
+        daftar_bulan = [b for b, _ in delta]
+        if self.awal is not None:
+            daftar_bulan += [self.awal, self.awal + (len(self.debit) - 1)]
+        awal = min(daftar_bulan)
+        geser = 0 if self.awal is None else _bulan_ke(self.awal, awal)
+        bentuk = (_bulan_ke(max(daftar_bulan), awal) + 1, len(nama_akun))
+        debit = np.zeros(bentuk, dtype=np.int64)
+        kredit = np.zeros_like(debit)
+        debit[geser:geser + len(self.debit), :len(self.nama_akun)] = self.debit
+        kredit[geser:geser + len(self.kredit), :len(self.nama_akun)] = self.kredit
+        kubus = KubusBulanan(awal, nama_akun, debit, kredit)
+        for (bulan, nama), (d, k) in delta.items():
+            i = _bulan_ke(bulan, awal)
+            debit[i, kubus.kode_akun[nama]] += d
+            kredit[i, kubus.kode_akun[nama]] += k
+        return kubus
+
+_cache_kubus_bulanan = _bersama.setdefault("kubus_bulanan_peternakan", {})
+
+def kubus_bulanan(data):
+    kunci = _kunci_versi(data)
+    kubus = _cache_kubus_bulanan.get(kunci) if kunci is not None else None
+    if kubus is None:
+        kubus = KubusBulanan.dari_matriks(matriks_entri(data))
+        if kunci is not None:
+            _simpan_cache_versi(_cache_kubus_bulanan, kunci, kubus)
+    return kubus
+
+def _perbarui_kubus_bulanan(data, lama, baru):
+    sebelumnya = _cache_kubus_bulanan.get(_kunci_versi(data, 1))
+    if sebelumnya is not None:
+        _simpan_cache_versi(_cache_kubus_bulanan, _kunci_versi(data), sebelumnya.dengan_perubahan(lama, baru))
+
+def _token(teks):
+    return re.findall(r"[^\W_]+", teks.lower())
+
+def _gabung_terurut(daftar):
+    # Gabungan tanpa duplikat dari array nomor, hasilnya terurut.
+    a = np.sort(np.concatenate(daftar))
+    return a[np.concatenate(([True], a[1:] != a[:-1]))] if len(a) else a
+
+class IndeksTeks:
+    # Indeks terbalik untuk pencarian jurnal. Jurnal dirujuk dengan nomor
+    # urutnya di IndeksJurnal, sehingga urutan (tanggal, nomor) sama dengan
+    # urutan daftar jurnal.
+    # token: token deskripsi/nama akun -> array nomor terurut
+    # daftar_token: token terurut, untuk pencocokan awalan dengan bisect
+    # akun: nama akun -> array nomor terurut
+    # id, tanggal, nominal (total debit, sen), hidup: per nomor
+    def __init__(self, jurnal_umum=(), indeks=None):
+        self.token, self.akun, self.daftar_token, self.id = {}, {}, [], []
+        self.tanggal = np.array([], dtype="datetime64[D]")
+        self.nominal = np.array([], dtype=np.int64)
+        self.hidup = np.array([], dtype=bool)
+        if not len(jurnal_umum):
+            return
+        kolom = _kolom_ledger(jurnal_umum, dengan_id=True)
+        nomor = np.array([indeks.nomor(i) for i in kolom["id"]], dtype=np.int64)
+        jumlah_entri = kolom["jumlah_entri"]
+        batas = np.concatenate(([0], np.cumsum(jumlah_entri)))
+        total_debit = np.concatenate(([0], np.cumsum(kolom["debit"])))
+
+        self.id = [None] * indeks.nomor_berikut
+        for n, jurnal_id in zip(nomor.tolist(), kolom["id"]):
+            self.id[n] = jurnal_id
+        self.tanggal = np.zeros(indeks.nomor_berikut, dtype="datetime64[D]")
+        self.tanggal[nomor] = kolom["tanggal"]
+        self.nominal = np.zeros(indeks.nomor_berikut, dtype=np.int64)
+        self.nominal[nomor] = total_debit[batas[1:]] - total_debit[batas[:-1]]
+        self.hidup = np.zeros(indeks.nomor_berikut, dtype=bool)
+        self.hidup[nomor] = True
+
+        nomor_baris = np.repeat(nomor, jumlah_entri)
+        for k, nama in enumerate(kolom["akun"]):
+            anggota = _gabung_terurut([nomor_baris[kolom["entri_akun"] == k]])
+            if len(anggota):
+                self.akun[nama] = anggota
+        # Deskripsi banyak berulang: setiap deskripsi unik cukup dipecah sekali.
+        kode, unik = pd.factorize(pd.Series(kolom["deskripsi"], dtype=object))
+        urut = np.argsort(kode, kind="stable")
+        awal = np.searchsorted(kode[urut], np.arange(len(unik) + 1))
+        kelompok = [(teks, nomor[urut[awal[i]:awal[i + 1]]]) for i, teks in enumerate(unik)]
+        bagian = {}
+        for teks, anggota in kelompok + list(self.akun.items()):
+            for t in set(_token(teks)):
+                bagian.setdefault(t, []).append(anggota)
+        self.token = {t: _gabung_terurut(daftar) for t, daftar in bagian.items()}
+        self.daftar_token = sorted(self.token)
+
+    @staticmethod
+    def _token_jurnal(jurnal):
+        return set(_token(" ".join([jurnal["deskripsi"]] + [e["akun"] for e in jurnal["entri"]])))
+
+    def dengan_perubahan(self, lama, baru, nomor):
+        # Versi baru berbagi array yang tidak tersentuh dengan versi
+        # sebelumnya; yang berubah disalin, seperti SaldoHarian.dengan_perubahan.
+        hasil = IndeksTeks()
+        hasil.token, hasil.akun, hasil.daftar_token = dict(self.token), dict(self.akun), list(self.daftar_token)
+        hasil.id = list(self.id)
+        tambahan = max(0, nomor + 1 - len(self.id))
+        hasil.id += [None] * tambahan
+        hasil.tanggal = np.concatenate((self.tanggal, np.zeros(tambahan, dtype="datetime64[D]")))
+        hasil.nominal = np.concatenate((self.nominal, np.zeros(tambahan, dtype=np.int64)))
+        hasil.hidup = np.concatenate((self.hidup, np.zeros(tambahan, dtype=bool)))
+
+        for jurnal, tambah in ((lama, False), (baru, True)):
+            if jurnal is None:
+                continue
+            for peta, daftar_kunci, terurut in (
+                (hasil.token, self._token_jurnal(jurnal), hasil.daftar_token),
+                (hasil.akun, {e["akun"] for e in jurnal["entri"]}, None),
+            ):
+                for kunci in daftar_kunci:
+                    anggota = peta.get(kunci, np.array([], dtype=np.int64))
+                    i = np.searchsorted(anggota, nomor)
+                    if tambah:
+                        anggota = np.insert(anggota, i, nomor)
+                    elif i < len(anggota) and anggota[i] == nomor:
+                        anggota = np.delete(anggota, i)
+                    if len(anggota):
+                        if kunci not in peta and terurut is not None:
+                            bisect.insort(terurut, kunci)
+                        peta[kunci] = anggota
+                    elif kunci in peta:
+                        del peta[kunci]
+                        if terurut is not None:
+                            del terurut[bisect.bisect_left(terurut, kunci)]
+        hasil.hidup[nomor] = baru is not None
+        if baru is not None:
+            hasil.id[nomor] = baru["id"]
+            hasil.tanggal[nomor] = _hari(baru["tanggal"])
+            hasil.nominal[nomor] = sum(e["debit"] for e in baru["entri"])
+        return hasil
+
+    def _awalan(self, t):
+        # Gabungan nomor semua token yang diawali t.
+        kiri = bisect.bisect_left(self.daftar_token, t)
+        kanan = bisect.bisect_left(self.daftar_token, t + "\uffff")
+        if kanan - kiri == 1:
+            return self.token[self.daftar_token[kiri]]
+        if kanan == kiri:
+            return np.array([], dtype=np.int64)
+        return _gabung_terurut([self.token[k] for k in self.daftar_token[kiri:kanan]])
+
+    def halaman(self, token, akun, nominal_min, nominal_maks, mulai, akhir, offset, limit):
+        # -> (jumlah cocok, [id jurnal terbaru lebih dulu]); None bila tanpa filter.
+        daftar = [self._awalan(t) for t in token]
+        if akun:
+            daftar.append(self.akun.get(akun, np.array([], dtype=np.int64)))
+        if not daftar and nominal_min is None and nominal_maks is None:
+            return None
+        if daftar:
+            # Irisan array terurut dimulai dari yang terkecil: cukup
+            # searchsorted anggota kecil ke dalam array yang lebih besar.
+            daftar.sort(key=len)
+            cocok = daftar[0]
+            for besar in daftar[1:]:
+                if not len(cocok):
+                    break
+                i = np.minimum(np.searchsorted(besar, cocok), len(besar) - 1)
+                cocok = cocok[besar[i] == cocok]
+        else:
+            cocok = np.flatnonzero(self.hidup)
+
+        tanggal = self.tanggal[cocok]
+        pilih = np.ones(len(cocok), dtype=bool)
+        if mulai:
+            pilih &= tanggal >= _hari(mulai)
+        pilih &= tanggal <= _hari(akhir)
+        if nominal_min is not None or nominal_maks is not None:
+            nominal = self.nominal[cocok]
+            if nominal_min is not None:
+                pilih &= nominal >= nominal_min
+            if nominal_maks is not None:
+                pilih &= nominal <= nominal_maks
+        cocok, tanggal = cocok[pilih], tanggal[pilih]
+
+        # Kunci urut (tanggal, nomor) dalam satu int64; hanya sebanyak
+        # offset + limit teratas yang perlu diurutkan.
+        kunci = (tanggal.astype(np.int64) << 32) | cocok
+        ambil = len(kunci) if limit is None else min(len(kunci), offset + limit)
+        if ambil < len(kunci):
+            kunci = kunci[np.argpartition(-kunci, ambil - 1)[:ambil]] if ambil else kunci[:0]
+        kunci = np.sort(kunci)[::-1][offset:ambil]
+        return len(cocok), [self.id[n] for n in (kunci & 0xFFFFFFFF).tolist()]
+
+_cache_indeks_teks = _bersama.setdefault("indeks_teks_peternakan", {})
+
+def indeks_teks(data):
+    kunci = _kunci_versi(data)
+    indeks = _cache_indeks_teks.get(kunci) if kunci is not None else None
+    if indeks is None:
+        indeks = IndeksTeks(data["jurnal_umum"], indeks_jurnal(data))
+        if kunci is not None:
+            _simpan_cache_versi(_cache_indeks_teks, kunci, indeks)
+    return indeks
+
+def _perbarui_indeks_teks(data, indeks, lama, baru):
+    # Hanya bila indeks versi sebelumnya sudah pernah dibangun; bila belum,
+    # indeks dibangun saat pencarian pertama. indeks: IndeksJurnal versi
+    # sebelum perubahan, sumber nomor jurnal (jurnal baru mendapat nomor_berikut).
+    sebelumnya = _cache_indeks_teks.get(_kunci_versi(data, 1))
+    if sebelumnya is not None:
+        nomor = indeks.nomor(lama["id"]) if lama else indeks.nomor_berikut
+        _simpan_cache_versi(_cache_indeks_teks, _kunci_versi(data), sebelumnya.dengan_perubahan(lama, baru, nomor))
+
+def kosongkan_cache():
+    with _kunci_cache:
+        _cache_ledger().update({"tanda": None, "data": None})
+    for cache in (_cache_matriks, _cache_saldo_harian, _cache_kubus_bulanan, _cache_indeks, _cache_indeks_teks):
+        cache.clear()
+
+def _iso(tgl, default):
+    return tgl.isoformat() if tgl else default
+
+def ada_jurnal(data):
+    if _pakai_sqlite(data):
+        return data.jumlah_jurnal() > 0
+    return bool(data["jurnal_umum"])
+
+def rentang_tanggal_jurnal(data):
+    if _pakai_sqlite(data):
+        rentang = data.rentang_tanggal()
+    else:
+        ujung = indeks_jurnal(data).ujung()
+        rentang = (ujung[0][0], ujung[1][0]) if ujung else (None, None)
+    return tuple(datetime.strptime(tgl, "%Y-%m-%d").date() if tgl else None for tgl in rentang)
+
+def tanggal_jurnal_pertama(data):
+    return rentang_tanggal_jurnal(data)[0]
+
+def akun_terpakai(data):
+    if _pakai_sqlite(data):
+        return data.akun_terpakai()
+    return saldo_harian(data).akun_terpakai()
+
+def ambil_jurnal(data, jurnal_id):
+    if _pakai_sqlite(data):
+        return data.ambil_jurnal(jurnal_id)
+    i = indeks_jurnal(data).posisi(jurnal_id)
+    return data["jurnal_umum"][i] if i is not None else None
+
+def halaman_jurnal(data, tgl_mulai, tgl_akhir, teks="", offset=0, limit=None,
+                   akun=None, nominal_min=None, nominal_maks=None):
+    # teks dicocokkan per kata: setiap kata harus menjadi awalan kata di
+    # deskripsi atau nama akun jurnal. Nominal (sen) = total debit jurnal.
+    mulai = _iso(tgl_mulai, "")
+    akhir = _iso(tgl_akhir, "9999-12-31")
+    token = _token(teks)
+    if _pakai_sqlite(data):
+        return data.halaman_jurnal(mulai, akhir, token, offset, -1 if limit is None else limit,
+                                   akun, nominal_min, nominal_maks)
+
+    indeks = indeks_jurnal(data)
+    jurnal_umum = data["jurnal_umum"]
+    hasil = indeks_teks(data).halaman(token, akun, nominal_min, nominal_maks, mulai, akhir, offset, limit)
+    if hasil is not None:
+        total, daftar_id = hasil
+        return total, [jurnal_umum[indeks.posisi(i)] for i in daftar_id]
+
+    # Urutan tanggal diambil dari indeks (terbaru lebih dulu), tanpa sort ulang.
+    kunci = indeks.rentang(mulai, akhir)
+    kunci.reverse()
+    akhir_halaman = None if limit is None else offset + limit
+    return len(kunci), [jurnal_umum[indeks.posisi(k[2])] for k in kunci[offset:akhir_halaman]]
+
+def mutasi_akun(data, akun, tgl_mulai, tgl_akhir):
+    if _pakai_sqlite(data):
+        return data.mutasi_akun(akun, _iso(tgl_mulai, ""), _iso(tgl_akhir, "9999-12-31"))
+    return matriks_entri(data).mutasi_akun(akun, tgl_mulai, tgl_akhir)
+
+def mutasi_per_akun(data, tgl_mulai=None, tgl_akhir=None, akun=None):
+    if _pakai_sqlite(data):
+        return data.mutasi_per_akun(_iso(tgl_mulai, ""), _iso(tgl_akhir, "9999-12-31"), akun)
+    return saldo_harian(data).mutasi_per_akun(tgl_mulai, tgl_akhir, akun)
+
+def _awal_bulan(batas):
+    return bool((batas == batas.astype("datetime64[M]")).all())
+
+def _kelompokkan_periode(batas, akun, rows):
+    # rows: (tanggal ISO, akun, debit, kredit) -> matriks periode x akun.
+    debit = np.zeros((len(batas) - 1, len(akun)), dtype=np.int64)
+    kredit = np.zeros_like(debit)
+    if rows:
+        tanggal, nama, d, k = zip(*rows)
+        kolom = {a: j for j, a in enumerate(akun)}
+        i = np.searchsorted(batas, np.array(tanggal, dtype="datetime64[D]"), side="right") - 1
+        j = np.array([kolom[a] for a in nama], dtype=np.int64)
+        np.add.at(debit, (i, j), np.array(d, dtype=np.int64))
+        np.add.at(kredit, (i, j), np.array(k, dtype=np.int64))
+    return debit, kredit
+
+def mutasi_berkala(data, batas, akun):
+    # Debit/kredit (sen) per periode [batas[i], batas[i+1]) per akun, sebagai
+    # dua matriks jumlah periode x jumlah akun. Periode berbatas awal bulan
+    # dibaca dari kubus bulanan, periode lain (mingguan) dari saldo harian.
+    if _pakai_sqlite(data):
+        return data.mutasi_berkala(batas, akun)
+    if _awal_bulan(batas):
+        return kubus_bulanan(data).mutasi_berkala(batas, akun)
+    return saldo_harian(data).mutasi_berkala(batas, akun)
+
+def daftar_tutup_buku(data):
+    if _pakai_sqlite(data):
+        return data.daftar_tutup()
+    return data.get("tutup_buku", [])
+
+def tutup_buku_terakhir(data, tgl=None):
+    # Penutupan terakhir yang berakhir pada/sebelum tgl (atau yang terakhir sama sekali).
+    batas = _iso(tgl, "9999-12-31")
+    terakhir = None
+    for tutup in daftar_tutup_buku(data):
+        if tutup["sampai"] <= batas and (terakhir is None or tutup["sampai"] > terakhir["sampai"]):
+            terakhir = tutup
+    return terakhir
+
+def _batas_tutup(data):
+    terakhir = tutup_buku_terakhir(data)
+    return terakhir["sampai"] if terakhir else None
+
+def saldo_sampai(data, tgl, akun=None):
+    # Saldo kumulatif per akun s.d. tgl: saldo penutupan terakhir ditambah
+    # mutasi sesudahnya, jadi histori yang sudah ditutup tidak dipindai ulang.
+    tutup = tutup_buku_terakhir(data, tgl)
+    if tutup is None:
+        return mutasi_per_akun(data, None, tgl, akun)
+    hasil = {a: dict(m) for a, m in tutup["saldo"].items() if akun is None or a in akun}
+    mulai = datetime.strptime(tutup["sampai"], "%Y-%m-%d").date() + timedelta(days=1)
+    if mulai <= tgl:
+        for a, m in mutasi_per_akun(data, mulai, tgl, akun).items():
+            saldo = hasil.setdefault(a, {"debit": 0, "kredit": 0})
+            saldo["debit"] += m["debit"]
+            saldo["kredit"] += m["kredit"]
+    return hasil
+
+def saldo_akun(mutasi, akun_list):
+    return sum(mutasi[a]["debit"] - mutasi[a]["kredit"] for a in akun_list if a in mutasi)
+
+# Bagan akun: (kode, nama, kode induk, tag). Akun daun dipakai di jurnal;
+# akun induk hanya menampung subtotal. Laporan membaca posisi akun dari
+# sini, sehingga akun baru cukup ditambahkan di bawah induk yang sesuai:
+#   laba rugi : daun di bawah grup LABA_RUGI (Pendapatan, HPP, Beban)
+#   arus kas  : tag "arus_kas:<aktivitas>/<kategori>" (boleh lebih dari satu)
+#   "kas", "persediaan": saldo akun dipakai langsung oleh laporan
+BAGAN_AKUN = [
+    (1000, "Aset", None, ()),
+    (1100, "Aset Lancar", 1000, ()),
+    (1101, "Kas", 1100, ("kas",)),
+    (1102, "Bank", 1100, ("kas",)),
+    (1103, "Piutang", 1100, ("arus_kas:Operasi/Kenaikan Piutang",)),
+    (1104, "Persediaan", 1100, ("persediaan",)),
+    (1200, "Aset Tetap", 1000, ()),
+    (1201, "Biaya Pembelian Perlengkapan", 1200, ("arus_kas:Investasi/Pembelian Perlengkapan",)),
+    (1202, "Biaya Pembelian Tanah", 1200, ("arus_kas:Investasi/Pembelian Tanah",)),
+    (1203, "Biaya Pembelian Kendaraan", 1200, ("arus_kas:Investasi/Pembelian Kendaraan",)),
+    (1204, "Biaya Pembelian Bangunan", 1200, ("arus_kas:Investasi/Pembelian Bangunan",)),
+    (2000, "Kewajiban", None, ()),
+    (2101, "Hutang", 2000, ("arus_kas:Operasi/Kenaikan Utang Usaha",)),
+    (2102, "Hutang Karyawan", 2000, ("arus_kas:Operasi/Kenaikan Utang Karyawan",)),
+    (2103, "Hutang Pajak", 2000, ("arus_kas:Operasi/Kenaikan Utang Pajak",)),
+    (3000, "Ekuitas", None, ()),
+    (3101, "Biaya Dividen", 3000, ("arus_kas:Pendanaan/Pembayaran Dividen",)),
+    (4000, "Pendapatan", None, ()),
+    (4101, "Penjualan Susu", 4000, ("arus_kas:Operasi/Pendapatan Bersih",)),
+    (4102, "Pendapatan dari Penjualan Perlengkapan", 4000, (
+        "arus_kas:Operasi/Pendapatan Bersih",
+        "arus_kas:Operasi/Keuntungan Dari Penjualan Perlengkapan",
+        "arus_kas:Investasi/Penjualan Perlengkapan",
+    )),
+    (4103, "Pendapatan dari Penjualan Tanah", 4000, (
+        "arus_kas:Operasi/Pendapatan Bersih",
+        "arus_kas:Operasi/Keuntungan Dari Penjualan Tanah",
+        "arus_kas:Investasi/Penjualan Tanah",
+    )),
+    # Setoran saham tetap dilaporkan sebagai pendapatan di laba rugi, seperti sebelumnya.
+    (4104, "Pendapatan Saham", 4000, ("arus_kas:Pendanaan/Penerbitan Saham Biasa",)),
+    (5000, "Harga Pokok Penjualan", None, ()),
+    (5101, "Beban Pokok Pendapatan", 5000, ()),
+    (6000, "Beban", None, ()),
+    (6101, "Biaya Pakan", 6000, ("arus_kas:Operasi/Biaya Pakan",)),
+    (6102, "Biaya Obat", 6000, ("arus_kas:Operasi/Biaya Obat",)),
+    (6103, "Biaya Listrik", 6000, ("arus_kas:Operasi/Biaya Listrik",)),
+    (6104, "Biaya Air", 6000, ("arus_kas:Operasi/Biaya Air",)),
+    (6105, "Biaya Operasional", 6000, ("arus_kas:Operasi/Biaya Operasional",)),
+    (6106, "Biaya Amortisasi Pajak", 6000, ("arus_kas:Operasi/Beban Amortisasi Pajak",)),
+    (6107, "Biaya Depresiasi Kendaraan", 6000, ("arus_kas:Operasi/Beban Depresiasi Kendaraan",)),
+    (6108, "Biaya Depresiasi Bangunan", 6000, ("arus_kas:Operasi/Beban Depresiasi Bangunan",)),
+    # Penampung akun di jurnal yang tidak ada di bagan (data lama/impor).
+    (9000, "Akun Lain", None, ()),
+]
+KODE_AKUN_LAIN = 9000
+
+# Bagian laba rugi: grup bagan dan tanda nilai (tanda * (debit - kredit)).
+LABA_RUGI = {"Pendapatan": (4000, -1), "Harga Pokok Penjualan": (5000, 1), "Beban": (6000, 1)}
+
+# Urutan baris arus kas; kategori dari tag yang tidak tercantum di sini
+# ditampilkan sesudahnya menurut urutan bagan.
+URUTAN_ARUS_KAS = {
+    "Operasi": [
+        "Pendapatan Bersih", "Kenaikan Piutang", "Kenaikan Utang Usaha", "Kenaikan Utang Karyawan",
+        "Kenaikan Utang Pajak", "Keuntungan Dari Penjualan Perlengkapan", "Keuntungan Dari Penjualan Tanah",
+        "Beban Amortisasi Pajak", "Beban Depresiasi Kendaraan", "Beban Depresiasi Bangunan",
+        "Biaya Pakan", "Biaya Obat", "Biaya Listrik", "Biaya Air", "Biaya Operasional"
+    ],
+    "Investasi": [
+        "Penjualan Perlengkapan", "Pembelian Perlengkapan", "Penjualan Tanah", "Pembelian Tanah",
+        "Pembelian Kendaraan", "Pembelian Bangunan"
+    ],
+    "Pendanaan": ["Pembayaran Dividen", "Penerbitan Saham Biasa"],
+}
+
+class BaganAkun:
+    def __init__(self, baris):
+        self.urut = [b[0] for b in baris]
+        self.posisi = {kode: i for i, kode in enumerate(self.urut)}
+        self.nama = {b[0]: b[1] for b in baris}
+        self.induk = {b[0]: b[2] for b in baris}
+        self.tag = {b[0]: b[3] for b in baris}
+        self.anak = {}
+        for kode, induk in self.induk.items():
+            if induk is not None:
+                self.anak.setdefault(induk, []).append(kode)
+        self.tingkat = {}
+        for kode in self.urut:
+            self.tingkat[kode] = 0 if self.induk[kode] is None else self.tingkat[self.induk[kode]] + 1
+        self.daun = [kode for kode in self.urut if kode not in self.anak and kode != KODE_AKUN_LAIN]
+        self.kode = {self.nama[kode]: kode for kode in self.daun}
+        # Rollup dari tingkat terdalam: setiap simpul sudah lengkap sebelum
+        # ditambahkan ke induknya.
+        self.langkah_rollup = [
+            (self.posisi[kode], self.posisi[self.induk[kode]])
+            for kode in sorted(self.urut, key=lambda k: -self.tingkat[k]) if self.induk[kode] is not None
+        ]
+
+    def daftar_akun(self):
+        return [self.nama[kode] for kode in self.daun]
+
+    def label(self, nama):
+        return f"{self.kode[nama]} - {nama}" if nama in self.kode else nama
+
+    def daun_di_bawah(self, kode):
+        if kode not in self.anak:
+            return [kode]
+        return [d for anak in self.anak[kode] for d in self.daun_di_bawah(anak)]
+
+    def akun_bertag(self, tag):
+        return [self.nama[kode] for kode in self.daun if tag in self.tag[kode]]
+
+    def peta_tag(self, awalan):
+        # {nama akun: [nilai tag, ...]} untuk tag "<awalan>:<nilai>".
+        peta = {}
+        for kode in self.daun:
+            for tag in self.tag[kode]:
+                if tag.startswith(awalan + ":"):
+                    peta.setdefault(self.nama[kode], []).append(tag[len(awalan) + 1:])
+        return peta
+
+    def rollup(self, mutasi):
+        # Satu lintasan mutasi per akun ke kode daun, lalu penjumlahan dari
+        # bawah ke atas: -> ({kode: {"debit", "kredit"}} untuk semua simpul,
+        # {nama: mutasi} akun yang tidak ada di bagan).
+        debit = [0] * len(self.urut)
+        kredit = [0] * len(self.urut)
+        lain = {}
+        for nama, m in mutasi.items():
+            kode = self.kode.get(nama)
+            if kode is None:
+                lain[nama] = m
+                kode = KODE_AKUN_LAIN
+            i = self.posisi[kode]
+            debit[i] += m["debit"]
+            kredit[i] += m["kredit"]
+        for i, induk in self.langkah_rollup:
+            debit[induk] += debit[i]
+            kredit[induk] += kredit[i]
+        return {kode: {"debit": debit[i], "kredit": kredit[i]} for i, kode in enumerate(self.urut)}, lain
+
+BAGAN = BaganAkun(BAGAN_AKUN)
+DAFTAR_AKUN = BAGAN.daftar_akun()
+AKUN_KAS = BAGAN.akun_bertag("kas")
+AKUN_PERSEDIAAN = BAGAN.akun_bertag("persediaan")
+PETA_ARUS_KAS = {
+    nama: [tuple(nilai.split("/", 1)) for nilai in daftar]
+    for nama, daftar in BAGAN.peta_tag("arus_kas").items()
+}
+
+def kategori_arus_kas():
+    kategori = {aktivitas: list(daftar) for aktivitas, daftar in URUTAN_ARUS_KAS.items()}
+    for daftar in PETA_ARUS_KAS.values():
+        for aktivitas, nama in daftar:
+            if nama not in kategori.setdefault(aktivitas, []):
+                kategori[aktivitas].append(nama)
+    return kategori
+
+KATEGORI_ARUS_KAS = kategori_arus_kas()
+
+def _nilai(m, tanda=1):
+    return tanda * (m["debit"] - m["kredit"])
+
+def hitung_laba_rugi(data, tgl_mulai, tgl_akhir):
+    mutasi_periode = mutasi_per_akun(data, tgl_mulai, tgl_akhir)
+    mutasi_sebelum = saldo_sampai(data, tgl_mulai - timedelta(days=1), akun=AKUN_PERSEDIAAN)
+    total_simpul, _ = BAGAN.rollup(mutasi_periode)
+    detail = {}
+    total = {}
+    for grup, (kode, tanda) in LABA_RUGI.items():
+        detail[grup] = {
+            BAGAN.nama[daun]: _nilai(total_simpul[daun], tanda) for daun in BAGAN.daun_di_bawah(kode)
+        }
+        total[grup] = _nilai(total_simpul[kode], tanda)
+    persediaan_awal = saldo_akun(mutasi_sebelum, AKUN_PERSEDIAAN)
+    persediaan_akhir = saldo_akun(mutasi_periode, AKUN_PERSEDIAAN)
+    hpp = total["Harga Pokok Penjualan"] + persediaan_awal - persediaan_akhir
+    laba_kotor = total["Pendapatan"] - hpp
+    return {
+        "detail": detail,
+        "total": total,
+        "persediaan_awal": persediaan_awal,
+        "persediaan_akhir": persediaan_akhir,
+        "hpp": hpp,
+        "laba_kotor": laba_kotor,
+        "laba_bersih": laba_kotor - total["Beban"]
+    }
+
+def hitung_buku_besar(data, akun, tgl_mulai, tgl_akhir):
+    return mutasi_akun(data, akun, tgl_mulai, tgl_akhir)
+
+def _sisi_saldo(saldo):
+    return (saldo, 0) if saldo > 0 else (0, -saldo)
+
+def hitung_neraca_saldo(data, tgl_mulai, tgl_akhir):
+    saldo_per_akun = {akun: {"debit": 0, "kredit": 0} for akun in akun_terpakai(data)}
+    saldo_per_akun.update(mutasi_per_akun(data, tgl_mulai, tgl_akhir))
+
+    baris = []
+    total_debit = 0
+    total_kredit = 0
+    for akun in sorted(saldo_per_akun):
+        saldo_debit, saldo_kredit = _sisi_saldo(_nilai(saldo_per_akun[akun]))
+        total_debit += saldo_debit
+        total_kredit += saldo_kredit
+        baris.append({"akun": akun, "saldo_debit": saldo_debit, "saldo_kredit": saldo_kredit})
+
+    # Neraca bertingkat menurut bagan: subtotal grup dari hasil rollup.
+    total_simpul, lain = BAGAN.rollup(saldo_per_akun)
+    tampil = set()
+    for akun in saldo_per_akun:
+        kode = BAGAN.kode.get(akun, KODE_AKUN_LAIN)
+        while kode is not None:
+            tampil.add(kode)
+            kode = BAGAN.induk[kode]
+    hierarki = []
+    for kode in BAGAN.urut:
+        if kode not in tampil:
+            continue
+        grup = kode in BAGAN.anak or kode == KODE_AKUN_LAIN
+        if grup or kode in BAGAN.daun:
+            saldo_debit, saldo_kredit = _sisi_saldo(_nilai(total_simpul[kode]))
+            hierarki.append({"kode": kode, "akun": BAGAN.nama[kode], "tingkat": BAGAN.tingkat[kode],
+                             "grup": grup, "saldo_debit": saldo_debit, "saldo_kredit": saldo_kredit})
+        if kode == KODE_AKUN_LAIN:
+            for akun in sorted(lain):
+                saldo_debit, saldo_kredit = _sisi_saldo(_nilai(lain[akun]))
+                hierarki.append({"kode": None, "akun": akun, "tingkat": 1,
+                                 "grup": False, "saldo_debit": saldo_debit, "saldo_kredit": saldo_kredit})
+
+    return {
+        "baris": baris,
+        "hierarki": hierarki,
+        "total_debit": total_debit,
+        "total_kredit": total_kredit,
+        "seimbang": total_debit == total_kredit
+    }
+
+def hitung_arus_kas(data, tgl_mulai, tgl_akhir):
+    # Nilai = -(debit - kredit); satu akun boleh masuk beberapa kategori.
+    detail = {aktivitas: {kategori: 0 for kategori in daftar} for aktivitas, daftar in KATEGORI_ARUS_KAS.items()}
+    for akun, m in mutasi_per_akun(data, tgl_mulai, tgl_akhir).items():
+        for aktivitas, kategori in PETA_ARUS_KAS.get(akun, ()):
+            detail[aktivitas][kategori] += _nilai(m, -1)
+    total = {aktivitas: sum(nilai.values()) for aktivitas, nilai in detail.items()}
+    return {
+        "detail": detail,
+        "total": total,
+        "kas_awal": saldo_akun(saldo_sampai(data, tgl_mulai - timedelta(days=1), akun=AKUN_KAS), AKUN_KAS),
+        "kas_akhir": saldo_akun(saldo_sampai(data, tgl_akhir, akun=AKUN_KAS), AKUN_KAS),
+        "kas_bersih": sum(total.values())
+    }
+
+_pelaksana_shard = _bersama.setdefault("pelaksana_shard", ThreadPoolExecutor(max_workers=4, thread_name_prefix="shard"))
+
+FREKUENSI_TREN = {"Mingguan": "W", "Bulanan": "M", "Kuartalan": "Q", "Tahunan": "Y"}
+LANGKAH_BULAN = {"M": 1, "Q": 3, "Y": 12}
+
+# Seri dasbor tren: nama -> (akun, tanda); nilai = tanda * (debit - kredit).
+SERI_TREN = {
+    "Penjualan Susu": (["Penjualan Susu"], -1),
+    "Biaya Pakan": (["Biaya Pakan"], 1),
+    "Biaya Obat": (["Biaya Obat"], 1),
+    "Listrik & Air": (["Biaya Listrik", "Biaya Air"], 1),
+}
+
+def batas_periode(frekuensi, tgl_mulai, tgl_akhir):
+    # Awal setiap periode kalender yang menyentuh [tgl_mulai, tgl_akhir],
+    # ditambah hari sesudah tgl_akhir; periode tepi dipotong pada rentang.
+    mulai = _hari(tgl_mulai)
+    akhir = _hari(tgl_akhir) + 1
+    if frekuensi == "W":
+        # Minggu dimulai Senin; 1970-01-01 jatuh pada hari Kamis.
+        awal = np.arange(mulai - (mulai.astype(np.int64) + 3) % 7, akhir, 7)
+    else:
+        langkah = LANGKAH_BULAN[frekuensi]
+        bulan = mulai.astype("datetime64[M]")
+        bulan -= bulan.astype(np.int64) % langkah
+        awal = np.arange(bulan, _hari(tgl_akhir).astype("datetime64[M]") + 1, langkah).astype("datetime64[D]")
+    return np.append(np.maximum(awal, mulai), akhir)
+
+def _label_periode(frekuensi, awal):
+    # -> (label, tahun, urutan periode dalam tahun)
+    tgl = awal.astype(date)
+    if frekuensi == "W":
+        tahun, minggu, _ = tgl.isocalendar()
+        return f"{tahun}-W{minggu:02d}", tahun, minggu
+    if frekuensi == "M":
+        return f"{tgl.year}-{tgl.month:02d}", tgl.year, tgl.month
+    if frekuensi == "Q":
+        kuartal = (tgl.month - 1) // 3 + 1
+        return f"{tgl.year}-Q{kuartal}", tgl.year, kuartal
+    return str(tgl.year), tgl.year, 1
+
+def hitung_tren(data, frekuensi, tgl_mulai, tgl_akhir):
+    # Semua periode dari satu kueri mutasi_berkala, bukan satu laporan laba
+    # rugi per periode. Laba bersih per periode sama dengan hitung_laba_rugi
+    # untuk periode itu, termasuk koreksi persediaan; baris tambahan di depan
+    # menampung seluruh mutasi sebelum tgl_mulai (saldo awal persediaan).
+    batas = batas_periode(frekuensi, tgl_mulai, tgl_akhir)
+    grup = {
+        nama: ([BAGAN.nama[daun] for daun in BAGAN.daun_di_bawah(kode)], tanda)
+        for nama, (kode, tanda) in LABA_RUGI.items()
+    }
+    akun = list(dict.fromkeys(
+        [a for daftar, _ in SERI_TREN.values() for a in daftar]
+        + [a for daftar, _ in grup.values() for a in daftar]
+        + AKUN_PERSEDIAAN
+    ))
+    debit, kredit = mutasi_berkala(data, np.append(np.datetime64("0001-01-01"), batas), akun)
+    sebelum, neto = np.split(debit - kredit, [1])
+    kolom = {a: j for j, a in enumerate(akun)}
+
+    def nilai(daftar, tanda):
+        return tanda * neto[:, [kolom[a] for a in daftar]].sum(axis=1)
+
+    total = {nama: nilai(*g) for nama, g in grup.items()}
+    persediaan_akhir = nilai(AKUN_PERSEDIAAN, 1)
+    saldo_awal = sebelum[0, [kolom[a] for a in AKUN_PERSEDIAAN]].sum()
+    persediaan_awal = saldo_awal + np.cumsum(persediaan_akhir) - persediaan_akhir
+    hpp = total["Harga Pokok Penjualan"] + persediaan_awal - persediaan_akhir
+
+    tren = pd.DataFrame([_label_periode(frekuensi, b) for b in batas[:-1]], columns=["Periode", "Tahun", "Ke"])
+    tren["Mulai"] = batas[:-1]
+    for nama, (daftar, tanda) in SERI_TREN.items():
+        tren[nama] = nilai(daftar, tanda)
+    tren["Laba Bersih"] = total["Pendapatan"] - hpp - total["Beban"]
+    return tren
+
+def tren_per_tahun(tren, seri, tahun_awal, tahun_akhir):
+    # Satu kolom per tahun; baris = urutan periode dalam tahun. Minggu ISO
+    # terpotong di tepi rentang bisa milik tahun ISO di luar tahun terpilih
+    # (1 Januari 2023 = 2022-W52, 30 Desember 2024 = 2025-W01) dan tidak
+    # dibandingkan, agar tidak muncul sebagai tahun satu-minggu.
+    tren = tren[tren["Tahun"].between(tahun_awal, tahun_akhir)]
+    return tren.pivot_table(index="Ke", columns="Tahun", values=seri, aggfunc="sum")
+
+def _di_shard(peternakan, fungsi, *args):
+    with pakai_peternakan(peternakan):
+        return fungsi(*args)
+
+def _ke_tanggal(iso):
+    return datetime.strptime(iso, "%Y-%m-%d").date() if iso else None
+
+class LedgerGabungan:
+    # Ledger konsolidasi beberapa peternakan. Untuk kueri laporan ia tampil
+    # seperti BukuSqlite (lihat _pakai_sqlite); setiap kueri dijawab dengan
+    # menjumlahkan total per akun yang sudah diagregasi di tiap shard (prefix
+    # sum / tabel saldo_harian), dihitung paralel, tanpa menggabungkan jurnal.
+    def __init__(self, daftar_peternakan):
+        self.peternakan = KONSOLIDASI
+        self.shard = dict(zip(daftar_peternakan, _pelaksana_shard.map(
+            lambda p: _di_shard(p, load_data), daftar_peternakan
+        )))
+
+    def _per_shard(self, fungsi, *args):
+        return list(_pelaksana_shard.map(lambda p: _di_shard(p, fungsi, self.shard[p], *args), self.shard))
+
+    def versi(self):
+        return tuple((p, _versi_data(data)) for p, data in self.shard.items())
+
+    def jumlah_jurnal(self):
+        return sum(data.jumlah_jurnal() if _pakai_sqlite(data) else len(data["jurnal_umum"]) for data in self.shard.values())
+
+    def rentang_tanggal(self):
+        rentang = [r for r in self._per_shard(rentang_tanggal_jurnal) if r[0] is not None]
+        if not rentang:
+            return (None, None)
+        return (min(r[0] for r in rentang).isoformat(), max(r[1] for r in rentang).isoformat())
+
+    def akun_terpakai(self):
+        return sorted(set().union(*self._per_shard(akun_terpakai)))
+
+    def daftar_tutup(self):
+        # Tiap shard memakai saldo penutupannya sendiri di mutasi_per_akun.
+        return []
+
+    def mutasi_per_akun(self, mulai, akhir, akun=None):
+        if mulai:
+            bagian = self._per_shard(mutasi_per_akun, _ke_tanggal(mulai), _ke_tanggal(akhir), akun)
+        else:
+            bagian = self._per_shard(saldo_sampai, _ke_tanggal(akhir), akun)
+        hasil = {}
+        for mutasi in bagian:
+            for a, m in mutasi.items():
+                total = hasil.setdefault(a, {"debit": 0, "kredit": 0})
+                total["debit"] += m["debit"]
+                total["kredit"] += m["kredit"]
+        return hasil
+
+    def mutasi_berkala(self, batas, akun):
+        bagian = self._per_shard(mutasi_berkala, batas, akun)
+        return sum(b[0] for b in bagian), sum(b[1] for b in bagian)
+
+FUNGSI_LAPORAN = {
+    "buku_besar": hitung_buku_besar,
+    "neraca_saldo": hitung_neraca_saldo,
+    "laba_rugi": hitung_laba_rugi,
+    "arus_kas": hitung_arus_kas,
+    "tren": hitung_tren,
+}
+# Laporan yang menerima opsi (lihat hitung_laporan) sebelum periode.
+OPSI_LAPORAN = {"buku_besar": "akun", "tren": "frekuensi"}
+LAPORAN_PRAHITUNG = ("neraca_saldo", "laba_rugi", "arus_kas")
+
+# Laporan standar untuk periode umum dihitung ulang di latar belakang setelah
+# setiap penulisan, sehingga tampilan default menu laporan tidak menunggu.
+# Satu worker thread cukup: hasil hanya berlaku untuk versi terbaru, dan
+# struktur turunan (matriks, saldo harian) dipakai bersama lewat cache versi.
+_prahitung = _bersama.setdefault("prahitung_peternakan", {
+    "pelaksana": ThreadPoolExecutor(max_workers=1, thread_name_prefix="prahitung"),
+    "kunci": threading.Lock(),
+    "status": {}
+})
+PRAHITUNG_AKTIF = os.environ.get("PETERNAKAN_PRAHITUNG", "1") != "0"
+
+def periode_umum(data, hari_ini=None):
+    hari_ini = hari_ini or date.today()
+    periode = [(hari_ini.replace(day=1), hari_ini), (hari_ini.replace(month=1, day=1), hari_ini)]
+    tgl_pertama = tanggal_jurnal_pertama(data)
+    if tgl_pertama is not None and tgl_pertama <= hari_ini:
+        periode.append((tgl_pertama, hari_ini))
+    return periode
+
+def jadwalkan_prahitung(data):
+    # Hanya backend JSON: versi ledger menandai isi, sehingga hasil prahitung
+    # bisa dicocokkan tanpa membaca ulang. SQLite menghitung langsung dengan SQL.
+    if not PRAHITUNG_AKTIF or _pakai_sqlite(data):
+        return
+    penanda = (data["versi"], date.today())
+    with _prahitung["kunci"]:
+        status = _status_prahitung(data["peternakan"])
+        if status["dijadwalkan"] == penanda:
+            return
+        status["dijadwalkan"] = penanda
+    _prahitung["pelaksana"].submit(_jalankan_prahitung, _salin_data(data), penanda)
+
+def _status_prahitung(peternakan):
+    return _prahitung["status"].setdefault(peternakan, {"dijadwalkan": None, "siap": None, "hasil": {}})
+
+def _jalankan_prahitung(data, penanda):
+    hasil = {}
+    with _prahitung["kunci"]:
+        status = _status_prahitung(data["peternakan"])
+    with pakai_peternakan(data["peternakan"]):
+        for jenis in LAPORAN_PRAHITUNG:
+            for tgl_mulai, tgl_akhir in periode_umum(data, penanda[1]):
+                with _prahitung["kunci"]:
+                    if status["dijadwalkan"] != penanda:
+                        # Sudah ada penulisan baru; hasil versi ini tidak akan terpakai.
+                        return
+                hasil[(jenis, tgl_mulai, tgl_akhir)] = FUNGSI_LAPORAN[jenis](data, tgl_mulai, tgl_akhir)
+    with _prahitung["kunci"]:
+        if status["dijadwalkan"] == penanda:
+            status["siap"] = data["versi"]
+            status["hasil"] = hasil
+
+# Hasil laporan yang sudah dihitung, dipakai bersama semua sesi: rerun karena
+# widget lain tidak menghitung ulang. Kunci memuat versi ledger, dan entri
+# versi lama dibuang begitu versi baru peternakan itu terlihat. Dibatasi
+# jumlah entri dan perkiraan ukuran (LRU).
+_cache_laporan = _bersama.setdefault("laporan_peternakan", {
+    "kunci": threading.Lock(),
+    "versi": {},
+    "hasil": OrderedDict(),
+    "byte": 0,
+    "statistik": {}
+})
+BATAS_CACHE_LAPORAN = 256
+BATAS_BYTE_CACHE_LAPORAN = 64 * 2**20
+
+def _versi_data(data):
+    return data.versi() if _pakai_sqlite(data) else data["versi"]
+
+def _peternakan_data(data):
+    return data.peternakan if _pakai_sqlite(data) else data.get("peternakan")
+
+def _ukuran_hasil(obj):
+    # Perkiraan kasar; daftar panjang diukur dari sampel.
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_ukuran_hasil(k) + _ukuran_hasil(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        sampel = obj[:100]
+        isi = sum(_ukuran_hasil(x) for x in sampel)
+        return sys.getsizeof(obj) + (isi * len(obj) // len(sampel) if sampel else 0)
+    return sys.getsizeof(obj)
+
+def _statistik_laporan(jenis):
+    return _cache_laporan["statistik"].setdefault(jenis, {"hit": 0, "prahitung": 0, "miss": 0, "detik": 0.0})
+
+def hitung_laporan(data, jenis, tgl_mulai, tgl_akhir, opsi=None):
+    # opsi: argumen tambahan laporan di OPSI_LAPORAN (akun buku besar,
+    # frekuensi tren); ikut menjadi bagian kunci cache.
+    if (opsi is None) == (jenis in OPSI_LAPORAN):
+        raise ValueError(f"Opsi laporan {jenis} tidak sesuai: {opsi!r}")
+    peternakan = _peternakan_data(data)
+    versi = _versi_data(data)
+    kunci = (peternakan, jenis, tgl_mulai, tgl_akhir, opsi)
+    cache = _cache_laporan
+    with cache["kunci"]:
+        if cache["versi"].get(peternakan) != versi:
+            cache["versi"][peternakan] = versi
+            for k in [k for k in cache["hasil"] if k[0] == peternakan]:
+                cache["byte"] -= cache["hasil"].pop(k)[1]
+        stat = _statistik_laporan(jenis)
+        if kunci in cache["hasil"]:
+            cache["hasil"].move_to_end(kunci)
+            stat["hit"] += 1
+            catat("laporan_cache_hit")
+            return cache["hasil"][kunci][0]
+
+    # Hasil prahitung dipakai bila versi dan periodenya cocok.
+    if not _pakai_sqlite(data) and opsi is None:
+        with _prahitung["kunci"]:
+            status = _status_prahitung(peternakan)
+            hasil = status["hasil"].get((jenis, tgl_mulai, tgl_akhir)) if status["siap"] == versi else None
+        if hasil is not None:
+            with cache["kunci"]:
+                stat["prahitung"] += 1
+            catat("laporan_prahitung")
+            return hasil
+
+    mulai = time.perf_counter()
+    with fase("hitung_" + jenis):
+        if opsi is None:
+            hasil = FUNGSI_LAPORAN[jenis](data, tgl_mulai, tgl_akhir)
+        else:
+            hasil = FUNGSI_LAPORAN[jenis](data, opsi, tgl_mulai, tgl_akhir)
+    detik = time.perf_counter() - mulai
+    ukuran = _ukuran_hasil(hasil)
+
+    with cache["kunci"]:
+        stat["miss"] += 1
+        stat["detik"] += detik
+        if cache["versi"].get(peternakan) != versi or ukuran > BATAS_BYTE_CACHE_LAPORAN or kunci in cache["hasil"]:
+            return hasil
+        cache["hasil"][kunci] = (hasil, ukuran)
+        cache["byte"] += ukuran
+        while len(cache["hasil"]) > BATAS_CACHE_LAPORAN or cache["byte"] > BATAS_BYTE_CACHE_LAPORAN:
+            _, (_, ukuran_lama) = cache["hasil"].popitem(last=False)
+            cache["byte"] -= ukuran_lama
+    return hasil
+
+def statistik_cache_laporan():
+    with _cache_laporan["kunci"]:
+        baris = []
+        for jenis, stat in sorted(_cache_laporan["statistik"].items()):
+            total = stat["hit"] + stat["prahitung"] + stat["miss"]
+            baris.append({
+                "Laporan": jenis,
+                "Hit": stat["hit"],
+                "Prahitung": stat["prahitung"],
+                "Miss": stat["miss"],
+                "Hit Rate": f"{(stat['hit'] + stat['prahitung']) / total:.0%}" if total else "-",
+                "Rata-rata Hitung (ms)": round(stat["detik"] / stat["miss"] * 1000, 2) if stat["miss"] else None
+            })
+        return {"entri": len(_cache_laporan["hasil"]), "byte": _cache_laporan["byte"], "baris": baris}
+
+# Laporan sebagai DataFrame (nominal dalam rupiah), tanpa Streamlit: untuk
+# ekspor batch (laporan_peternakan.py) maupun pemakaian lain di luar UI.
+def tabel_buku_besar(data, akun, tgl_mulai, tgl_akhir):
+    return _format_buku_besar(hitung_laporan(data, "buku_besar", tgl_mulai, tgl_akhir, opsi=akun), akun)
+
+def _format_buku_besar(mutasi, akun):
+    return pd.DataFrame({
+        "Akun": akun,
+        "Tanggal": mutasi["tanggal"].astype(str).to_numpy(),
+        "Deskripsi": mutasi["deskripsi"].to_numpy(),
+        "Debit (Rp)": ke_rupiah(mutasi["debit"].to_numpy(dtype=np.int64)),
+        "Kredit (Rp)": ke_rupiah(mutasi["kredit"].to_numpy(dtype=np.int64)),
+        "Saldo (Rp)": ke_rupiah(mutasi["saldo"].to_numpy(dtype=np.int64)),
+    }, columns=["Akun", "Tanggal", "Deskripsi", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"])
+
+UKURAN_CHUNK_EKSPOR = 20000
+
+def ekspor_buku_besar(mutasi, akun, format_berkas, ukuran_chunk=UKURAN_CHUNK_EKSPOR):
+    # Ditulis per potongan baris, sehingga tabel berformat lengkap tidak
+    # pernah dibuat sekaligus. Hasilnya BytesIO karena st.download_button
+    # hanya menerima str/bytes/BytesIO/berkas biner dari callable.
+    f = io.BytesIO()
+    potongan = (
+        _format_buku_besar(mutasi.iloc[i:i + ukuran_chunk], akun)
+        for i in range(0, len(mutasi), ukuran_chunk)
+    )
+    kepala = list(_format_buku_besar(mutasi.iloc[:0], akun).columns)
+    if format_berkas == "csv":
+        f.write(pd.DataFrame(columns=kepala).to_csv(index=False).encode("utf-8"))
+        for df in potongan:
+            f.write(df.to_csv(index=False, header=False).encode("utf-8"))
+    else:
+        # openpyxl opsional; mode write_only menulis baris tanpa menahan sel di memori.
+        from openpyxl import Workbook
+        buku = Workbook(write_only=True)
+        lembar = buku.create_sheet("Buku Besar")
+        lembar.append(kepala)
+        for df in potongan:
+            for baris in df.itertuples(index=False):
+                lembar.append(list(baris))
+        buku.save(f)
+    f.seek(0)
+    return f
+
+def tabel_neraca_saldo(data, tgl_mulai, tgl_akhir):
+    neraca = hitung_laporan(data, "neraca_saldo", tgl_mulai, tgl_akhir)
+    baris = [(b["akun"], b["saldo_debit"], b["saldo_kredit"]) for b in neraca["baris"]]
+    baris.append(("Total", neraca["total_debit"], neraca["total_kredit"]))
+    return pd.DataFrame({
+        "Akun": [b[0] for b in baris],
+        "Saldo Debit (Rp)": [ke_rupiah(b[1]) for b in baris],
+        "Saldo Kredit (Rp)": [ke_rupiah(b[2]) for b in baris],
+    })
+
+def tabel_laba_rugi(data, tgl_mulai, tgl_akhir):
+    laba_rugi = hitung_laporan(data, "laba_rugi", tgl_mulai, tgl_akhir)
+    baris = []
+    for grup, detail in laba_rugi["detail"].items():
+        baris += [(grup, kategori, nilai) for kategori, nilai in detail.items()]
+        baris.append((grup, f"Total {grup}", laba_rugi["total"][grup]))
+    baris += [
+        ("Ringkasan", "Persediaan Awal", laba_rugi["persediaan_awal"]),
+        ("Ringkasan", "Persediaan Akhir", laba_rugi["persediaan_akhir"]),
+        ("Ringkasan", "Harga Pokok Penjualan (HPP)", laba_rugi["hpp"]),
+        ("Ringkasan", "Laba Kotor", laba_rugi["laba_kotor"]),
+        ("Ringkasan", "Laba Bersih", laba_rugi["laba_bersih"]),
+    ]
+    return pd.DataFrame({
+        "Kelompok": [b[0] for b in baris],
+        "Keterangan": [b[1] for b in baris],
+        "Nilai (Rp)": [ke_rupiah(b[2]) for b in baris],
+    })
+
+def tabel_arus_kas(data, tgl_mulai, tgl_akhir):
+    arus_kas = hitung_laporan(data, "arus_kas", tgl_mulai, tgl_akhir)
+    baris = []
+    for aktivitas, detail in arus_kas["detail"].items():
+        baris += [(aktivitas, kategori, nilai) for kategori, nilai in detail.items()]
+        baris.append((aktivitas, f"Total Aktivitas {aktivitas}", arus_kas["total"][aktivitas]))
+    baris += [
+        ("Ringkasan", "Kas Awal Periode", arus_kas["kas_awal"]),
+        ("Ringkasan", "Kas Bersih dari Semua Aktivitas", arus_kas["kas_bersih"]),
+        ("Ringkasan", "Kas Akhir Periode", arus_kas["kas_akhir"]),
+    ]
+    return pd.DataFrame({
+        "Aktivitas": [b[0] for b in baris],
+        "Kategori": [b[1] for b in baris],
+        "Jumlah (Rp)": [ke_rupiah(b[2]) for b in baris],
+    })
+
+KOLOM_IMPOR = ["no_jurnal", "tanggal", "deskripsi", "akun", "debit", "kredit"]
+UKURAN_CHUNK_IMPOR = 20000
+# Batas nominal per baris (rupiah), jauh di bawah batas int64 sen sehingga
+# jumlah per jurnal tidak meluap.
+NOMINAL_MAKS_IMPOR = 10**12
+# Format nominal yang diterima (rupiah, tanpa "Rp"):
+#   polos     : titik desimal, maks. 2 angka di belakang: 1500000, 1500000.5
+#   Indonesia : titik pemisah ribuan, koma desimal: 1.500.000, 1.500.000,50, 1500,5
+# "1.500" berarti seribu lima ratus. Bentuk lain (mis. "1,500.00" atau
+# "1.500.00") ditolak, tidak ditebak.
+POLA_NOMINAL_POLOS = r"\d+(?:\.\d{1,2})?"
+POLA_NOMINAL_INDONESIA = r"(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d{1,2})?"
+
+def baca_chunk_impor(berkas, nama_berkas, ukuran_chunk=UKURAN_CHUNK_IMPOR):
+    if nama_berkas.lower().endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        buku_kerja = load_workbook(berkas, read_only=True, data_only=True)
+        baris = buku_kerja.active.iter_rows(values_only=True)
+        header = [str(h).strip().lower() if h is not None else "" for h in next(baris, ())]
+        while True:
+            chunk = [r for _, r in zip(range(ukuran_chunk), baris)]
+            if not chunk:
+                break
+            df = pd.DataFrame(chunk, columns=header, dtype=object)
+            if "tanggal" in df.columns:
+                # Sel tanggal Excel terbaca sebagai datetime; samakan dengan CSV.
+                df["tanggal"] = [v.strftime("%Y-%m-%d") if hasattr(v, "strftime") else v for v in df["tanggal"]]
+            for kolom in ("debit", "kredit"):
+                if kolom in df.columns:
+                    # Sel angka Excel ditulis ulang dalam format polos.
+                    df[kolom] = [f"{v:.2f}" if type(v) is float else v for v in df[kolom]]
+            yield df
+        buku_kerja.close()
+    else:
+        for chunk in pd.read_csv(berkas, chunksize=ukuran_chunk, dtype=str, keep_default_na=False):
+            chunk.columns = [c.strip().lower() for c in chunk.columns]
+            yield chunk
+
+def _validasi_baris_impor(chunk, nomor_awal):
+    # Validasi per baris secara vektor: tanggal, akun, dan nominal.
+    kurang = [k for k in KOLOM_IMPOR if k not in chunk.columns]
+    if kurang:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(kurang)}")
+
+    df = pd.DataFrame({
+        "baris": np.arange(nomor_awal, nomor_awal + len(chunk)),
+        "no_jurnal": chunk["no_jurnal"].fillna("").astype(str).str.strip().to_numpy(),
+        "deskripsi": chunk["deskripsi"].fillna("").astype(str).str.strip().to_numpy(),
+        "akun": chunk["akun"].fillna("").astype(str).str.strip().to_numpy(),
+    })
+    tanggal = chunk["tanggal"].fillna("").astype(str).str.strip()
+    df["tanggal"] = pd.to_datetime(tanggal, format="%Y-%m-%d", errors="coerce").to_numpy()
+
+    pesan = pd.Series("", index=df.index)
+    for kolom in ("debit", "kredit"):
+        mentah = chunk[kolom].fillna("").astype(str).str.strip().reset_index(drop=True)
+        angka = mentah.str.removeprefix("-")
+        polos = angka.str.fullmatch(POLA_NOMINAL_POLOS)
+        indonesia = ~polos & angka.str.fullmatch(POLA_NOMINAL_INDONESIA)
+        normal = angka.where(polos, angka.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+        nilai = pd.to_numeric(normal.where(polos | indonesia), errors="coerce")
+        nilai = nilai.where(~mentah.str.startswith("-"), -nilai)
+        kosong = (mentah == "").to_numpy()
+        pesan[(nilai.isna() & ~kosong).to_numpy()] += (
+            f"{kolom.capitalize()} bukan angka yang dikenali (contoh: 1500000, 1500000.50, 1.500.000,50). "
+        )
+        terhingga = np.isfinite(nilai)
+        pesan[(nilai < 0).to_numpy()] += f"{kolom.capitalize()} tidak boleh negatif. "
+        pesan[(nilai.notna() & ~terhingga).to_numpy()] += f"{kolom.capitalize()} harus angka terhingga. "
+        terlalu_besar = terhingga & (nilai > NOMINAL_MAKS_IMPOR)
+        pesan[terlalu_besar.to_numpy()] += f"{kolom.capitalize()} melebihi Rp {format_rupiah(ke_sen(NOMINAL_MAKS_IMPOR))}. "
+        aman = nilai.where(terhingga & ~terlalu_besar, 0.0)
+        df[kolom] = np.rint(aman.to_numpy() * 100).astype(np.int64)
+
+    pesan[(df["no_jurnal"] == "").to_numpy()] += "No jurnal kosong. "
+    pesan[df["tanggal"].isna().to_numpy()] += "Tanggal tidak valid (format YYYY-MM-DD). "
+    pesan[~df["akun"].isin(DAFTAR_AKUN).to_numpy()] += "Akun tidak dikenal. "
+    pesan[((df["debit"] > 0) & (df["kredit"] > 0)).to_numpy()] += "Debit dan Kredit tidak boleh diisi bersamaan. "
+    df["pesan"] = pesan.str.strip().to_numpy()
+    return df
+
+def validasi_impor(chunks, batas_tutup=None):
+    # Berkas dibaca dan divalidasi per chunk, tetapi kolom hasil validasi
+    # seluruh berkas ditahan sampai akhir: baris satu jurnal boleh tersebar
+    # di mana saja dalam berkas, jadi jurnal baru bisa diperiksa setelah
+    # semua baris terbaca.
+    bagian = []
+    nomor_awal = 2
+    for chunk in chunks:
+        bagian.append(_validasi_baris_impor(chunk, nomor_awal))
+        nomor_awal += len(chunk)
+    if not bagian:
+        return [], []
+    df = pd.concat(bagian, ignore_index=True)
+
+    # Validasi per jurnal: satu tanggal, ada nominal, dan debit = kredit.
+    df["salah"] = df["pesan"] != ""
+    grup = df.groupby("no_jurnal", sort=False)
+    ringkas = pd.DataFrame({
+        "baris": grup["baris"].min(),
+        "ada_salah": grup["salah"].any(),
+        "jumlah_tanggal": grup["tanggal"].nunique(),
+        "debit": grup["debit"].sum(),
+        "kredit": grup["kredit"].sum(),
+    })
+    pesan_jurnal = pd.Series("", index=ringkas.index)
+    pesan_jurnal[ringkas["jumlah_tanggal"] > 1] += "Baris dalam satu jurnal harus bertanggal sama. "
+    pesan_jurnal[(ringkas["debit"] == 0) & (ringkas["kredit"] == 0)] += "Masukkan minimal satu nominal debit atau kredit. "
+    pesan_jurnal[ringkas["debit"] != ringkas["kredit"]] += "Total debit dan kredit harus sama. "
+    if batas_tutup is not None:
+        tertutup = grup["tanggal"].min() <= np.datetime64(batas_tutup)
+        pesan_jurnal[tertutup.to_numpy()] += f"Periode sampai {batas_tutup} sudah ditutup. "
+    pesan_jurnal = pesan_jurnal.str.strip()
+
+    kesalahan = [
+        {"Baris": int(b), "No Jurnal": n, "Kesalahan": p}
+        for b, n, p in zip(df["baris"][df["salah"]], df["no_jurnal"][df["salah"]], df["pesan"][df["salah"]])
+    ]
+    salah_jurnal = pesan_jurnal != ""
+    kesalahan += [
+        {"Baris": int(b), "No Jurnal": n, "Kesalahan": p}
+        for b, n, p in zip(ringkas["baris"][salah_jurnal], ringkas.index[salah_jurnal], pesan_jurnal[salah_jurnal])
+    ]
+    kesalahan.sort(key=lambda k: k["Baris"])
+
+    valid = ringkas.index[~ringkas["ada_salah"] & ~salah_jurnal]
+    df = df[df["no_jurnal"].isin(valid) & ((df["debit"] > 0) | (df["kredit"] > 0))]
+
+    # Susun jurnal dari kolom-kolom terurut per no_jurnal (urutan kemunculan).
+    kode, _ = pd.factorize(df["no_jurnal"])
+    urut = np.argsort(kode, kind="stable")
+    kode = kode[urut]
+    tanggal = np.datetime_as_string(df["tanggal"].to_numpy()[urut], unit="D").tolist()
+    deskripsi = df["deskripsi"].to_numpy()[urut].tolist()
+    akun = df["akun"].to_numpy()[urut].tolist()
+    debit = df["debit"].to_numpy()[urut].tolist()
+    kredit = df["kredit"].to_numpy()[urut].tolist()
+    batas = np.flatnonzero(np.diff(kode)) + 1
+    awal = [0] + batas.tolist()
+    akhir = batas.tolist() + [len(kode)]
+
+    daftar_jurnal = []
+    for i, j in zip(awal, akhir):
+        if i == j:
+            continue
+        daftar_jurnal.append({
+            "id": str(uuid.uuid4()),
+            "tanggal": tanggal[i],
+            "deskripsi": deskripsi[i],
+            "entri": [{"akun": akun[k], "debit": debit[k], "kredit": kredit[k]} for k in range(i, j)]
+        })
+    return daftar_jurnal, kesalahan
+
+def tambah_jurnal_umum(data):
+    st.subheader("Tambah Jurnal Umum")
+
+    with st.form("form_jurnal"):
+        tanggal = st.date_input("Tanggal", value=date.today())
+        deskripsi = st.text_input("Deskripsi Transaksi")
+
+        daftar_akun = DAFTAR_AKUN
+
+        entri = []
+        baris_entri = st.number_input("Jumlah Entri Akun", min_value=2, max_value=20, value=2, step=1)
+
+        for i in range(baris_entri):
+            st.markdown(f"*Entri {i+1}*")
+            akun = st.selectbox(f"Akun {i+1}", daftar_akun, format_func=BAGAN.label, key=f"akun_{i}")
+            debit = st.number_input(f"Debit {i+1} (Rp)", min_value=0.0, format="%.2f", key=f"debit_{i}")
+            kredit = st.number_input(f"Kredit {i+1} (Rp)", min_value=0.0, format="%.2f", key=f"kredit_{i}")
+            entri.append({"akun": akun, "debit": ke_sen(debit), "kredit": ke_sen(kredit)})
+
+        submit = st.form_submit_button("Simpan Jurnal")
+
+        if submit:
+            for idx, e in enumerate(entri):
+                if e["debit"] > 0 and e["kredit"] > 0:
+                    st.warning(f"Pada entri {idx+1}, kolom Debit dan Kredit tidak boleh diisi bersamaan.")
+                    return
+
+            total_debit = sum(e["debit"] for e in entri)
+            total_kredit = sum(e["kredit"] for e in entri)
+            if total_debit == 0 and total_kredit == 0:
+                st.warning("Masukkan minimal satu nominal debit atau kredit.")
+            elif total_debit != total_kredit:
+                st.warning(f"Total debit (Rp {format_rupiah(total_debit)}) dan kredit (Rp {format_rupiah(total_kredit)}) harus sama.")
+            else:
+                jurnal_baru = {
+                    "id": str(uuid.uuid4()),
+                    "tanggal": tanggal.strftime("%Y-%m-%d"),
+                    "deskripsi": deskripsi.strip(),
+                    "entri": [e for e in entri if e["debit"] > 0 or e["kredit"] > 0]
+                }
+                try:
+                    simpan_jurnal_baru(data, jurnal_baru)
+                except PeriodeTertutup as e:
+                    st.error(str(e))
+                    return
+                st.success("Jurnal berhasil disimpan.")
+
+def edit_jurnal_form(data, jurnal_id):
+    jurnal = ambil_jurnal(data, jurnal_id)
+    if not jurnal:
+        st.error("Jurnal tidak ditemukan.")
+        return
+
+    st.subheader("Edit Jurnal Umum")
+
+    with st.form(f"form_edit_{jurnal_id}"):
+        tanggal = st.date_input("Tanggal", datetime.strptime(jurnal["tanggal"], "%Y-%m-%d").date())
+        deskripsi = st.text_input("Deskripsi Transaksi", value=jurnal["deskripsi"])
+
+        daftar_akun = DAFTAR_AKUN
+
+        baris_entri = len(jurnal["entri"])
+        baris_entri = st.number_input("Jumlah Entri Akun", min_value=2, max_value=20, value=baris_entri, step=1)
+
+        entri_baru = []
+        for i in range(baris_entri):
+            st.markdown(f"*Entri {i+1}*")
+            akun_default = jurnal["entri"][i]["akun"] if i < len(jurnal["entri"]) else daftar_akun[0]
+            debit_default = ke_rupiah(jurnal["entri"][i]["debit"]) if i < len(jurnal["entri"]) else 0.0
+            kredit_default = ke_rupiah(jurnal["entri"][i]["kredit"]) if i < len(jurnal["entri"]) else 0.0
+
+            akun = st.selectbox(f"Akun {i+1}", daftar_akun, index=daftar_akun.index(akun_default), format_func=BAGAN.label,
+                                key=f"edit_akun_{jurnal_id}_{i}")
+            debit = st.number_input(f"Debit {i+1} (Rp)", min_value=0.0, format="%.2f", value=debit_default, key=f"edit_debit_{jurnal_id}_{i}")
+            kredit = st.number_input(f"Kredit {i+1} (Rp)", min_value=0.0, format="%.2f", value=kredit_default, key=f"edit_kredit_{jurnal_id}_{i}")
+            entri_baru.append({"akun": akun, "debit": ke_sen(debit), "kredit": ke_sen(kredit)})
+
+        submit = st.form_submit_button("Update Jurnal")
+
+        if submit:
+            for idx, e in enumerate(entri_baru):
+                if e["debit"] > 0 and e["kredit"] > 0:
+                    st.warning(f"Pada entri {idx+1}, kolom Debit dan Kredit tidak boleh diisi bersamaan.")
+                    return
+
+            total_debit = sum(e["debit"] for e in entri_baru)
+            total_kredit = sum(e["kredit"] for e in entri_baru)
+            if total_debit == 0 and total_kredit == 0:
+                st.warning("Masukkan minimal satu nominal debit atau kredit.")
+            elif total_debit != total_kredit:
+                st.warning(f"Total debit (Rp {format_rupiah(total_debit)}) dan kredit (Rp {format_rupiah(total_kredit)}) harus sama.")
+            else:
+                jurnal_baru = {
+                    "id": jurnal["id"],
+                    "tanggal": tanggal.strftime("%Y-%m-%d"),
+                    "deskripsi": deskripsi.strip(),
+                    "entri": [e for e in entri_baru if e["debit"] > 0 or e["kredit"] > 0]
+                }
+                try:
+                    perbarui_jurnal(data, jurnal_baru, st.session_state.get("edit_jurnal_asal"))
+                except KonflikVersi as konflik:
+                    terkini = konflik.args[0]
+                    if terkini is None:
+                        st.session_state.pop("edit_jurnal_id", None)
+                        st.session_state.pop("edit_jurnal_asal", None)
+                        st.error("Jurnal ini sudah dihapus oleh pengguna lain.")
+                    else:
+                        # Simpan berikutnya dianggap sudah melihat versi terkini.
+                        st.session_state["edit_jurnal_asal"] = terkini
+                        st.warning("Jurnal ini sudah diubah oleh pengguna lain sejak form dibuka. "
+                                   "Periksa versi terbaru di daftar jurnal, lalu tekan Update Jurnal lagi "
+                                   "untuk tetap menyimpan perubahan Anda.")
+                    return
+                except PeriodeTertutup as e:
+                    st.error(str(e))
+                    return
+                st.session_state.pop("edit_jurnal_id", None)
+                st.session_state.pop("edit_jurnal_asal", None)
+                st.success("Jurnal berhasil diperbarui.")
+                st.rerun()
+
+def lihat_jurnal_umum(data):
+    st.subheader("Daftar Jurnal Umum")
+
+    if "edit_jurnal_id" in st.session_state:
+        edit_jurnal_form(data, st.session_state["edit_jurnal_id"])
+        st.write("---")
+
+    if not ada_jurnal(data):
+        st.info("Belum ada jurnal umum.")
+        return
+
+    tgl_pertama, tgl_terakhir = rentang_tanggal_jurnal(data)
+    col1, col2, col3 = st.columns([2, 2, 3])
+    with col1:
+        tgl_mulai = st.date_input("Dari Tanggal", value=tgl_pertama or date.today(), key="filter_jurnal_mulai")
+    with col2:
+        tgl_akhir = st.date_input("Sampai Tanggal", value=max(tgl_terakhir or date.today(), date.today()), key="filter_jurnal_akhir")
+    with col3:
+        teks = st.text_input("Cari deskripsi / akun", key="filter_jurnal_teks")
+
+    col1, col2, col3 = st.columns([3, 2, 2])
+    with col1:
+        akun = st.selectbox("Akun", ["Semua akun"] + akun_terpakai(data), key="filter_jurnal_akun")
+    with col2:
+        nominal_min = st.number_input("Nominal min (Rp)", min_value=0.0, format="%.2f", key="filter_jurnal_min")
+    with col3:
+        nominal_maks = st.number_input("Nominal maks (Rp)", min_value=0.0, format="%.2f", key="filter_jurnal_maks",
+                                       help="0 = tanpa batas")
+    # Nominal 0 berarti filter tidak dipakai.
+    filter_jurnal = {
+        "akun": None if akun == "Semua akun" else akun,
+        "nominal_min": ke_sen(nominal_min) if nominal_min else None,
+        "nominal_maks": ke_sen(nominal_maks) if nominal_maks else None,
+    }
+
+    if tgl_akhir < tgl_mulai:
+        st.warning("Tanggal akhir harus sama atau setelah tanggal mulai.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        per_halaman = st.selectbox("Jurnal per halaman", [10, 25, 50, 100], key="jurnal_per_halaman")
+    with col2:
+        halaman = int(st.number_input("Halaman", min_value=1, value=1, step=1, key="halaman_jurnal"))
+
+    total, jurnal_urut = halaman_jurnal(data, tgl_mulai, tgl_akhir, teks, (halaman - 1) * per_halaman, per_halaman,
+                                        **filter_jurnal)
+    if total == 0:
+        st.info("Tidak ada jurnal yang cocok dengan filter.")
+        return
+
+    jumlah_halaman = -(-total // per_halaman)
+    if halaman > jumlah_halaman:
+        halaman = jumlah_halaman
+        _, jurnal_urut = halaman_jurnal(data, tgl_mulai, tgl_akhir, teks, (halaman - 1) * per_halaman, per_halaman,
+                                        **filter_jurnal)
+    st.caption(f"Menampilkan {len(jurnal_urut)} dari {total} jurnal (halaman {halaman} / {jumlah_halaman})")
+
+    batas = _batas_tutup(data)
+    for jurnal in jurnal_urut:
+        st.markdown(f"*Tanggal:* {jurnal['tanggal']}  |  *Deskripsi:* {jurnal['deskripsi']}")
+
+        cols = st.columns([6, 1, 1])
+
+        with cols[0]:
+            baris = ["| Akun | Debit (Rp) | Kredit (Rp) |", "|-------|------------|-------------|"]
+            baris += [f"| {e['akun']} | {format_rupiah(e['debit'])} | {format_rupiah(e['kredit'])} |" for e in jurnal["entri"]]
+            st.markdown("\n".join(baris))
+
+        if batas is not None and jurnal["tanggal"] <= batas:
+            cols[1].caption("Periode ditutup")
+            continue
+
+        with cols[1]:
+            if st.button("Edit", key=f"edit_{jurnal['id']}"):
+                st.session_state["edit_jurnal_id"] = jurnal["id"]
+                st.session_state["edit_jurnal_asal"] = jurnal
+                st.rerun()
+
+        with cols[2]:
+            if st.button("Hapus", key=f"hapus_{jurnal['id']}"):
+                try:
+                    hapus_jurnal(data, jurnal["id"])
+                except PeriodeTertutup as e:
+                    st.error(str(e))
+                    return
+                st.success("Jurnal berhasil dihapus.")
+                st.rerun()
+
+def impor_jurnal(data):
+    st.subheader("Impor Jurnal (CSV / Excel)")
+    st.markdown(
+        "Satu baris per entri akun. Kolom wajib: `" + "`, `".join(KOLOM_IMPOR) + "`. "
+        "Baris dengan `no_jurnal` yang sama digabung menjadi satu jurnal; tanggal ditulis `YYYY-MM-DD`. "
+        "Nominal ditulis polos (`1500000.50`) atau format Indonesia (`1.500.000,50`)."
+    )
+
+    berkas = st.file_uploader("Pilih berkas", type=["csv", "xlsx"])
+    if berkas is None:
+        return
+
+    if st.button("Proses Impor"):
+        try:
+            with st.spinner("Memvalidasi berkas..."):
+                daftar_jurnal, kesalahan = validasi_impor(baca_chunk_impor(berkas, berkas.name), _batas_tutup(data))
+        except (ValueError, ImportError) as e:
+            st.error(f"Berkas tidak dapat dibaca: {e}")
+            return
+
+        if kesalahan:
+            st.warning(f"{len(kesalahan)} kesalahan ditemukan; jurnal yang bermasalah tidak diimpor.")
+            st.dataframe(pd.DataFrame(kesalahan[:1000]), hide_index=True)
+
+        if daftar_jurnal:
+            try:
+                simpan_jurnal_massal(data, daftar_jurnal)
+            except PeriodeTertutup as e:
+                st.error(str(e))
+                return
+            st.success(f"{len(daftar_jurnal)} jurnal berhasil diimpor.")
+        else:
+            st.info("Tidak ada jurnal valid untuk diimpor.")
+
+def buku_besar(data):
+    st.subheader("Buku Besar")
+
+    if not ada_jurnal(data):
+        st.info("Belum ada data jurnal umum.")
+        return
+
+    daftar_akun = akun_terpakai(data)
+
+    akun_terpilih = st.selectbox("Pilih Akun", daftar_akun)
+
+    tgl_awal_default = tanggal_jurnal_pertama(data) or date.today()
+    col1, col2 = st.columns(2)
+    with col1:
+        tgl_mulai = st.date_input("Dari Tanggal", value=tgl_awal_default)
+    with col2:
+        tgl_akhir = st.date_input("Sampai Tanggal", value=date.today())
+
+    if tgl_akhir < tgl_mulai:
+        st.warning("Tanggal akhir harus sama atau setelah tanggal mulai.")
+        return
+
+    mutasi = hitung_laporan(data, "buku_besar", tgl_mulai, tgl_akhir, opsi=akun_terpilih)
+
+    if mutasi.empty:
+        st.warning(f"Tidak ada mutasi pada akun '{akun_terpilih}' untuk periode ini.")
+        return
+
+    st.markdown(f"### Mutasi Akun: {akun_terpilih}")
+    st.write(
+        f"*Total Debit:* Rp {format_rupiah(mutasi['debit'].sum())}  |  "
+        f"*Total Kredit:* Rp {format_rupiah(mutasi['kredit'].sum())}  |  "
+        f"*Saldo Akhir:* Rp {format_rupiah(mutasi['saldo'].iloc[-1])}"
+    )
+
+    # Hanya satu halaman yang diformat dan dikirim ke browser.
+    col1, col2 = st.columns(2)
+    with col1:
+        per_halaman = st.selectbox("Baris per halaman", [50, 100, 500, 1000], key="buku_besar_per_halaman")
+    jumlah_halaman = -(-len(mutasi) // per_halaman)
+    with col2:
+        halaman = int(st.number_input("Halaman", min_value=1, max_value=jumlah_halaman, value=1, step=1,
+                                      key="halaman_buku_besar"))
+    awal = (halaman - 1) * per_halaman
+    tampil = mutasi.iloc[awal:awal + per_halaman]
+    st.dataframe(pd.DataFrame({
+        "Tanggal": tampil["tanggal"].astype(str).to_numpy(),
+        "Deskripsi": tampil["deskripsi"].to_numpy(),
+        "Debit": [f"Rp {format_rupiah(v)}" if v else "" for v in tampil["debit"].tolist()],
+        "Kredit": [f"Rp {format_rupiah(v)}" if v else "" for v in tampil["kredit"].tolist()],
+        "Saldo": [f"Rp {format_rupiah(v)}" for v in tampil["saldo"].tolist()],
+    }), hide_index=True)
+    st.caption(f"Baris {awal + 1}–{awal + len(tampil)} dari {len(mutasi)} (halaman {halaman} / {jumlah_halaman})")
+
+    # Berkas ekspor baru dibuat saat tombol diklik, di luar rerun halaman.
+    nama_berkas = f"buku_besar_{akun_terpilih}_{tgl_mulai}_{tgl_akhir}".replace(" ", "_")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Unduh CSV", lambda: ekspor_buku_besar(mutasi, akun_terpilih, "csv"),
+                           file_name=f"{nama_berkas}.csv", mime="text/csv", on_click="ignore")
+    with col2:
+        st.download_button("Unduh XLSX", lambda: ekspor_buku_besar(mutasi, akun_terpilih, "xlsx"),
+                           file_name=f"{nama_berkas}.xlsx", on_click="ignore",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+def neraca_saldo(data):
+    st.subheader("Neraca Saldo")
+
+    if not ada_jurnal(data):
+        st.info("Belum ada data jurnal umum.")
+        return
+
+    tgl_awal_default = tanggal_jurnal_pertama(data) or date.today()
+    col1, col2 = st.columns(2)
+    with col1:
+        tgl_mulai = st.date_input("Dari Tanggal", value=tgl_awal_default)
+    with col2:
+        tgl_akhir = st.date_input("Sampai Tanggal", value=date.today())
+
+    if tgl_akhir < tgl_mulai:
+        st.warning("Tanggal akhir harus sama atau setelah tanggal mulai.")
+        return
+
+    neraca = hitung_laporan(data, "neraca_saldo", tgl_mulai, tgl_akhir)
+    total_debit = neraca["total_debit"]
+    total_kredit = neraca["total_kredit"]
+
+    # Baris grup menampilkan subtotal seluruh akun di bawahnya.
+    rows = []
+    for baris in neraca["hierarki"]:
+        rows.append({
+            "Kode": baris["kode"] or "",
+            "Akun": "\u00a0" * 4 * baris["tingkat"] + (baris["akun"].upper() if baris["grup"] else baris["akun"]),
+            "Saldo Debit (Rp)": f"Rp {format_rupiah(baris['saldo_debit'])}" if baris["saldo_debit"] else "",
+            "Saldo Kredit (Rp)": f"Rp {format_rupiah(baris['saldo_kredit'])}" if baris["saldo_kredit"] else ""
+        })
+
+    st.table(rows)
+    st.markdown("---")
+    st.write(f"*Total Saldo Debit:* Rp {format_rupiah(total_debit)}")
+    st.write(f"*Total Saldo Kredit:* Rp {format_rupiah(total_kredit)}")
+
+    if not neraca["seimbang"]:
+        st.error("⚠ Neraca Saldo tidak seimbang! Total Debit tidak sama dengan Total Kredit.")
+    else:
+        st.success("Neraca Saldo seimbang (Total Debit = Total Kredit).")
+
+def tutup_buku(data):
+    st.subheader("Tutup Buku")
+    st.markdown(
+        "Menutup periode membekukan semua jurnal sampai akhir periode dan menyimpan saldo akhir "
+        "tiap akun sebagai saldo awal periode berikutnya."
+    )
+
+    terakhir = tutup_buku_terakhir(data)
+    col1, col2 = st.columns(2)
+    with col1:
+        jenis = st.radio("Jenis Periode", ["Bulanan", "Tahunan"], horizontal=True)
+    with col2:
+        if jenis == "Bulanan":
+            tgl = st.date_input("Bulan (pilih tanggal mana pun di bulan itu)", value=date.today().replace(day=1) - timedelta(days=1))
+            sampai = (tgl.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        else:
+            tahun = int(st.number_input("Tahun", min_value=1900, max_value=date.today().year, value=date.today().year - 1, step=1))
+            sampai = date(tahun, 12, 31)
+
+    st.write(f"*Periode ditutup sampai:* {sampai.isoformat()}")
+    if st.button("Tutup Periode"):
+        if sampai >= date.today():
+            st.warning("Periode yang belum berakhir tidak dapat ditutup.")
+        elif terakhir is not None and sampai.isoformat() <= terakhir["sampai"]:
+            st.warning(f"Periode sampai {terakhir['sampai']} sudah ditutup; pilih periode sesudahnya.")
+        else:
+            try:
+                tutup_periode(data, sampai)
+            except PeriodeTertutup as e:
+                st.error(str(e))
+                return
+            st.success(f"Periode sampai {sampai.isoformat()} berhasil ditutup.")
+            st.rerun()
+
+    daftar = daftar_tutup_buku(data)
+    if not daftar:
+        st.info("Belum ada periode yang ditutup.")
+        return
+
+    st.markdown("---")
+    st.table([
+        {"Ditutup Sampai": t["sampai"], "Waktu Penutupan": t["ditutup"], "Jumlah Akun": len(t["saldo"])}
+        for t in sorted(daftar, key=lambda t: t["sampai"], reverse=True)
+    ])
+    if st.button(f"Buka Kembali Periode sampai {terakhir['sampai']}"):
+        buka_periode_terakhir(data)
+        st.success("Periode berhasil dibuka kembali.")
+        st.rerun()
+
+def laporan_laba_rugi(data):
+    st.subheader("Proyeksi Laporan Laba Rugi")
+    st.markdown("Untuk Periode yang berakhir")
+
+    tgl_awal_default = tanggal_jurnal_pertama(data)
+    if tgl_awal_default is None:
+        st.info("Belum ada data jurnal umum.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        tgl_mulai = st.date_input("Dari Tanggal", value=tgl_awal_default)
+    with col2:
+        tgl_akhir = st.date_input("Sampai Tanggal", value=date.today())
+
+    if tgl_akhir < tgl_mulai:
+        st.warning("Tanggal akhir harus sama atau setelah tanggal mulai.")
+        return
+
+    laba_rugi = hitung_laporan(data, "laba_rugi", tgl_mulai, tgl_akhir)
+    total_pendapatan = laba_rugi["total"]["Pendapatan"]
+    total_persediaan_awal = laba_rugi["persediaan_awal"]
+    total_persediaan_akhir = laba_rugi["persediaan_akhir"]
+    total_harga_pokok_penjualan = laba_rugi["total"]["Harga Pokok Penjualan"]
+    total_beban = laba_rugi["total"]["Beban"]
+    hpp = laba_rugi["hpp"]
+    laba_kotor = laba_rugi["laba_kotor"]
+    laba_rugi_bersih = laba_rugi["laba_bersih"]
+
+    laba_str = f"Rp {format_rupiah(abs(laba_rugi_bersih))}"
+    if laba_rugi_bersih >= 0:
+        warna = "green"
+        status = "Laba Bersih"
+    else:
+        warna = "red"
+        status = "Rugi Bersih"
+
+    laporan_md = f"""
+| Keterangan                                         | Nilai (Rp)           |
+|---------------------------------------------------|----------------------|
+| *Pendapatan*                                     |                      |
+| {'<br>'.join(laba_rugi['detail']['Pendapatan'])}                    |                      |
+| Total Pendapatan                                   | Rp {format_rupiah(total_pendapatan)}   |
+|                                                   |                      |
+| *Persediaan Awal*                                | Rp {format_rupiah(total_persediaan_awal)}   |
+| *Pembelian (Beban Pokok Pendapatan)*            | Rp {format_rupiah(total_harga_pokok_penjualan)}   |
+| *Persediaan Akhir*                               | Rp {format_rupiah(total_persediaan_akhir)}   |
+| *Harga Pokok Penjualan (HPP)*                    | *Rp {format_rupiah(hpp)}*   |
+| *Laba Kotor*                                     | *Rp {format_rupiah(laba_kotor)}* |
+|                                                   |                      |
+| *Beban*                                          |                      |
+| Total Beban                                        | Rp {format_rupiah(total_beban)}   |
+|                                                   |                      |
+| <span style="color:{warna};"><b>Proyeksi {status}</b></span> | <span style="color:{warna};"><b>{laba_str}</b></span>   |
+"""
+    st.markdown(laporan_md, unsafe_allow_html=True)
+
+def laporan_arus_kas_terperinci(data):
+    st.subheader("Laporan Arus Kas Terperinci")
+    st.markdown("Laporan arus kas berdasarkan aktivitas operasi, investasi, dan pendanaan")
+
+    if not ada_jurnal(data):
+        st.info("Belum ada data jurnal umum.")
+        return
+
+    tgl_awal_default = tanggal_jurnal_pertama(data)
+    col1, col2 = st.columns(2)
+    with col1:
+        tgl_mulai = st.date_input("Dari Tanggal", value=tgl_awal_default)
+    with col2:
+        tgl_akhir = st.date_input("Sampai Tanggal", value=date.today())
+
+    if tgl_akhir < tgl_mulai:
+        st.warning("Tanggal akhir harus sama atau setelah tanggal mulai.")
+        return
+
+    arus_kas = hitung_laporan(data, "arus_kas", tgl_mulai, tgl_akhir)
+
+    def tampilkan_tabel(judul, detail, total):
+        st.markdown(f"### Aktivitas {judul}")
+        if not any(nilai != 0 for nilai in detail.values()):
+            st.info(f"Tidak ada transaksi pada aktivitas {judul}.")
+            return
+
+        df = pd.DataFrame({
+            "Kategori": list(detail.keys()),
+            "Jumlah (Rp)": [format_rupiah(v) for v in detail.values()]
+        })
+        st.table(df)
+
+        label = "Kas Diterima" if total >= 0 else "Kas Digunakan"
+        st.markdown(f"{label} dari Aktivitas {judul}:** Rp {format_rupiah(total)}")
+
+    for judul in arus_kas["detail"]:
+        tampilkan_tabel(judul, arus_kas["detail"][judul], arus_kas["total"][judul])
+
+    kas_awal = arus_kas["kas_awal"]
+    kas_akhir = arus_kas["kas_akhir"]
+    kas_bersih = arus_kas["kas_bersih"]
+
+    st.markdown("---")
+    st.write(f"*Kas Awal Periode ({tgl_mulai}):* Rp {format_rupiah(kas_awal)}")
+    st.write(f"*Kas Bersih dari Semua Aktivitas:* Rp {format_rupiah(kas_bersih)}")
+    st.write(f"*Kas Akhir Periode ({tgl_akhir}):* Rp {format_rupiah(kas_akhir)}")
+
+def dasbor_tren(data):
+    st.subheader("Dasbor Tren")
+    st.markdown("Penjualan susu, biaya utama, dan laba bersih per periode")
+
+    tgl_pertama, tgl_terakhir = rentang_tanggal_jurnal(data)
+    if tgl_pertama is None:
+        st.info("Belum ada data jurnal umum.")
+        return
+
+    daftar_tahun = list(range(tgl_pertama.year, tgl_terakhir.year + 1))
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        nama_frekuensi = st.selectbox("Frekuensi", list(FREKUENSI_TREN), index=1)
+    with col2:
+        tahun_awal = st.selectbox("Dari Tahun", daftar_tahun, index=max(0, len(daftar_tahun) - 10))
+    with col3:
+        tahun_akhir = st.selectbox("Sampai Tahun", daftar_tahun, index=len(daftar_tahun) - 1)
+
+    if tahun_akhir < tahun_awal:
+        st.warning("Tahun akhir harus sama atau setelah tahun awal.")
+        return
+
+    tgl_mulai = date(tahun_awal, 1, 1)
+    tgl_akhir = date(tahun_akhir, 12, 31)
+    tren = hitung_laporan(data, "tren", tgl_mulai, tgl_akhir, opsi=FREKUENSI_TREN[nama_frekuensi])
+    # Periode sesudah jurnal terakhir belum berjalan; tidak digambar sebagai nol.
+    tren = tren[tren["Mulai"] <= pd.Timestamp(tgl_terakhir)]
+
+    seri = list(SERI_TREN) + ["Laba Bersih"]
+    pilihan = st.multiselect("Seri", seri, default=seri)
+    if pilihan:
+        st.line_chart(tren.set_index("Periode")[pilihan] / 100)
+        with st.expander("Tabel"):
+            st.dataframe(pd.DataFrame({
+                "Periode": tren["Periode"],
+                **{nama: [f"Rp {format_rupiah(v)}" for v in tren[nama].tolist()] for nama in pilihan}
+            }), hide_index=True)
+
+    st.markdown("### Perbandingan Tahun ke Tahun")
+    seri_banding = st.selectbox("Seri yang dibandingkan", seri, index=len(seri) - 1)
+    if nama_frekuensi != "Tahunan":
+        per_tahun = tren_per_tahun(tren, seri_banding, tahun_awal, tahun_akhir)
+        st.line_chart(per_tahun.rename(columns=str) / 100)
+
+    tahunan = hitung_laporan(data, "tren", tgl_mulai, tgl_akhir, opsi="Y")
+    tahunan = tahunan[tahunan["Mulai"] <= pd.Timestamp(tgl_terakhir)]
+    rows = []
+    sebelumnya = None
+    for tahun, nilai in zip(tahunan["Tahun"].tolist(), tahunan[seri_banding].tolist()):
+        perubahan = "-"
+        if sebelumnya:
+            perubahan = f"{(nilai - sebelumnya) / abs(sebelumnya):+.1%}"
+        rows.append({"Tahun": str(tahun), seri_banding: f"Rp {format_rupiah(nilai)}", "Perubahan": perubahan})
+        sebelumnya = nilai
+    st.table(rows)
+    if tgl_terakhir.year == tahun_akhir and tgl_terakhir < tgl_akhir:
+        st.caption(f"Tahun {tahun_akhir} dihitung sampai jurnal terakhir ({tgl_terakhir}).")
+
+def peternakan_pengguna(pengguna):
+    # Hanya peternakan yang tercantum eksplisit dan dikenal konfigurasi;
+    # pengguna tanpa daftar "peternakan" tidak mendapat akses apa pun.
+    return [p for p in pengguna.get("peternakan", []) if p in PETERNAKAN]
+
+def logout():
+    st.session_state['login_status'] = False
+    st.session_state.pop('pengguna', None)
+    st.rerun()
+
+def main():
+    st.set_page_config(page_title="Sistem Akuntansi Peternakan", layout="wide")
+	
+	
+
+    if 'login_status' not in st.session_state:
+        st.session_state['login_status'] = False
+
+    if not st.session_state['login_status']:
+        st.title("Login Sistem Akuntansi Peternakan")
+        username = st.text_input("Username")
+        password = st.text_input("Password", type="password")
+        if st.button("Login"):
+            pengguna = PENGGUNA.get(username)
+            if pengguna is not None and password == pengguna["sandi"] and not peternakan_pengguna(pengguna):
+                st.error("Akun ini belum diberi akses ke peternakan mana pun. Hubungi admin.")
+            elif pengguna is not None and password == pengguna["sandi"]:
+                st.session_state['login_status'] = True
+                st.session_state['pengguna'] = username
+                st.rerun()
+            else:
+                st.error("Username / Password salah!")
+        return
+
+    # Peternakan yang boleh dibuka ditentukan oleh identitas login.
+    pengguna = PENGGUNA.get(st.session_state.get("pengguna"), {})
+    daftar_peternakan = peternakan_pengguna(pengguna)
+    if not daftar_peternakan:
+        # Konfigurasi bisa berubah setelah login.
+        st.error("Akun ini belum diberi akses ke peternakan mana pun. Hubungi admin.")
+        if st.button("Logout"):
+            logout()
+        return
+    pilihan = daftar_peternakan + ([KONSOLIDASI] if len(daftar_peternakan) > 1 else [])
+    if len(pilihan) > 1:
+        peternakan = st.sidebar.selectbox(
+            "Peternakan", pilihan,
+            format_func=lambda p: "Konsolidasi (semua peternakan)" if p == KONSOLIDASI else PETERNAKAN[p]["nama"]
+        )
+    else:
+        peternakan = pilihan[0]
+        st.sidebar.caption(PETERNAKAN[peternakan]["nama"])
+
+    with rekam_rerun(peternakan):
+        if peternakan == KONSOLIDASI:
+            halaman_konsolidasi(daftar_peternakan)
+        else:
+            with pakai_peternakan(peternakan):
+                halaman_peternakan()
+    if pengguna.get("admin"):
+        panel_instrumentasi()
+
+def _ubah_instrumen():
+    _instrumen["aktif"] = st.session_state["instrumen_aktif"]
+
+def panel_instrumentasi():
+    with st.sidebar.expander("Instrumentasi"):
+        # Saklar berlaku untuk seluruh proses: setiap sesi admin menampilkan
+        # keadaan terkini, dan hanya klik pada saklar yang mengubahnya.
+        st.session_state["instrumen_aktif"] = _instrumen["aktif"]
+        st.checkbox("Rekam setiap rerun", key="instrumen_aktif", on_change=_ubah_instrumen)
+        riwayat = riwayat_instrumen()
+        if not riwayat:
+            st.caption("Belum ada rekaman.")
+            return
+        terakhir = riwayat[-1]
+        st.caption(f"Rerun terakhir ({terakhir['menu']}): {terakhir['total_ms']:.1f} ms")
+        st.dataframe(pd.DataFrame(
+            [{"Fase": nama, "ms": ms} for nama, ms in terakhir["fase_ms"].items()]
+            + [{"Fase": nama, "ms": None, "Jumlah": n} for nama, n in terakhir["hitungan"].items()]
+        ), hide_index=True)
+        st.caption(f"Rata-rata {len(riwayat)} rerun terakhir")
+        st.dataframe(pd.DataFrame(ringkasan_instrumen(riwayat)), hide_index=True)
+        st.download_button(
+            "Unduh (JSON lines)", "".join(json.dumps(r) + "\n" for r in riwayat),
+            file_name="instrumen_peternakan.jsonl", mime="application/x-ndjson"
+        )
+        if st.button("Kosongkan rekaman", key="instrumen_kosongkan"):
+            with _instrumen["kunci"]:
+                _instrumen["riwayat"].clear()
+
+def halaman_konsolidasi(daftar_peternakan):
+    data = LedgerGabungan(daftar_peternakan)
+    st.sidebar.caption("Konsolidasi: " + ", ".join(PETERNAKAN[p]["nama"] for p in daftar_peternakan))
+
+    menu = st.sidebar.selectbox("Menu", [
+        "Neraca Saldo",
+        "Laporan Laba Rugi",
+        "Laporan Arus Kas",
+        "Dasbor Tren",
+        "Logout"
+    ])
+    tandai_rekaman(menu=menu)
+
+    with fase("tampil"):
+        if menu == "Neraca Saldo":
+            neraca_saldo(data)
+        elif menu == "Laporan Laba Rugi":
+            laporan_laba_rugi(data)
+        elif menu == "Laporan Arus Kas":
+            laporan_arus_kas_terperinci(data)
+        elif menu == "Dasbor Tren":
+            dasbor_tren(data)
+        elif menu == "Logout":
+            logout()
+
+def halaman_peternakan():
+    with fase("muat"):
+        data = load_data()
+    # Juga menangkap penulisan oleh proses lain dan start pertama.
+    jadwalkan_prahitung(data)
+
+    menu = st.sidebar.selectbox("Menu", [
+        "Tambah Jurnal Umum",
+        "Lihat Jurnal Umum",
+        "Impor Jurnal",
+        "Buku Besar",
+        "Neraca Saldo",
+        "Laporan Laba Rugi",
+        "Laporan Arus Kas",
+        "Dasbor Tren",
+        "Tutup Buku",
+        "Logout"
+    ])
+
+    if STORAGE_BACKEND != "sqlite":
+        stat = statistik_cache_data()
+        st.sidebar.caption(f"Cache ledger: {stat['hit']} hit / {stat['miss']} miss (versi {stat['versi']})")
+    stat_laporan = statistik_cache_laporan()
+    if stat_laporan["baris"]:
+        with st.sidebar.expander("Cache laporan"):
+            st.caption(f"{stat_laporan['entri']} entri, {stat_laporan['byte'] / 2**20:.1f} MB")
+            st.dataframe(pd.DataFrame(stat_laporan["baris"]), hide_index=True)
+
+    tandai_rekaman(menu=menu)
+
+    with fase("tampil"):
+        if menu == "Tambah Jurnal Umum":
+            tambah_jurnal_umum(data)
+        elif menu == "Lihat Jurnal Umum":
+            if "edit_jurnal_id" in st.session_state:
+                edit_jurnal_form(data, st.session_state["edit_jurnal_id"])
+                st.write("---")
+            else:
+                lihat_jurnal_umum(data)
+        elif menu == "Impor Jurnal":
+            impor_jurnal(data)
+        elif menu == "Buku Besar":
+            buku_besar(data)
+        elif menu == "Neraca Saldo":
+            neraca_saldo(data)
+        elif menu == "Laporan Laba Rugi":
+            laporan_laba_rugi(data)
+        elif menu == "Laporan Arus Kas":
+            laporan_arus_kas_terperinci(data)
+        elif menu == "Dasbor Tren":
+            dasbor_tren(data)
+        elif menu == "Tutup Buku":
+            tutup_buku(data)
+        elif menu == "Logout":
+            logout()
+
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,239 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta
+
+import app_peternakan as app
+
+
+# (bobot, deskripsi, [(akun_debit, ...)], [(akun_kredit, ...)], nominal_min, nominal_maks) dalam rupiah
+# Bobot meniru buku peternakan sapi perah: penjualan susu dan pembelian
+# pakan mendominasi, transaksi investasi dan pendanaan jarang.
+POLA_TRANSAKSI = [
+    (30, "penjualan susu", ["Kas", "Bank", "Piutang"], ["Penjualan Susu"], 500_000, 15_000_000),
+    (22, "pembelian pakan", ["Biaya Pakan"], ["Kas", "Bank", "Hutang"], 200_000, 8_000_000),
+    (6, "pembelian obat", ["Biaya Obat"], ["Kas"], 50_000, 2_000_000),
+    (4, "bayar listrik", ["Biaya Listrik"], ["Kas", "Bank"], 300_000, 3_000_000),
+    (4, "bayar air", ["Biaya Air"], ["Kas"], 100_000, 1_000_000),
+    (6, "biaya operasional", ["Biaya Operasional"], ["Kas", "Hutang Karyawan"], 100_000, 5_000_000),
+    (6, "pembelian persediaan", ["Persediaan"], ["Kas", "Hutang"], 500_000, 10_000_000),
+    (4, "pemakaian persediaan", ["Beban Pokok Pendapatan"], ["Persediaan"], 500_000, 8_000_000),
+    (5, "pelunasan piutang", ["Kas", "Bank"], ["Piutang"], 500_000, 10_000_000),
+    (5, "pelunasan hutang", ["Hutang", "Hutang Karyawan", "Hutang Pajak"], ["Kas", "Bank"], 200_000, 8_000_000),
+    (2, "depresiasi", ["Biaya Depresiasi Kendaraan", "Biaya Depresiasi Bangunan", "Biaya Amortisasi Pajak"], ["Hutang Pajak"], 100_000, 3_000_000),
+    (1, "pembelian aset", ["Biaya Pembelian Perlengkapan", "Biaya Pembelian Kendaraan", "Biaya Pembelian Bangunan", "Biaya Pembelian Tanah"], ["Bank"], 5_000_000, 200_000_000),
+    (1, "penjualan aset", ["Bank"], ["Pendapatan dari Penjualan Perlengkapan", "Pendapatan dari Penjualan Tanah"], 1_000_000, 50_000_000),
+    (1, "pendanaan", ["Bank"], ["Pendapatan Saham"], 10_000_000, 100_000_000),
+    (1, "pembayaran dividen", ["Biaya Dividen"], ["Bank"], 5_000_000, 50_000_000),
+]
+
+
+def buat_ledger_sintetis(jumlah_baris, tahun=5, seed=0):
+    rng = random.Random(seed)
+    bobot = [p[0] for p in POLA_TRANSAKSI]
+    tgl_awal = date.today() - timedelta(days=365 * tahun)
+    rentang_hari = 365 * tahun
+
+    jurnal_umum = []
+    baris = 0
+    while baris < jumlah_baris:
+        _, deskripsi, akun_debit, akun_kredit, minimum, maksimum = rng.choices(POLA_TRANSAKSI, bobot)[0]
+        nominal = rng.randrange(minimum * 100, maksimum * 100)
+        tanggal = (tgl_awal + timedelta(days=rng.randrange(rentang_hari))).strftime("%Y-%m-%d")
+
+        # Sebagian transaksi dibayar dengan dua sumber kas (jurnal tiga baris).
+        if len(akun_kredit) > 1 and rng.random() < 0.15:
+            bagian = int(nominal * rng.uniform(0.2, 0.8))
+            kredit = [(a, n) for a, n in zip(rng.sample(akun_kredit, 2), (bagian, nominal - bagian))]
+        else:
+            kredit = [(rng.choice(akun_kredit), nominal)]
+
+        entri = [{"akun": rng.choice(akun_debit), "debit": nominal, "kredit": 0}]
+        entri += [{"akun": a, "debit": 0, "kredit": n} for a, n in kredit]
+        jurnal_umum.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "tanggal": tanggal,
+            "deskripsi": deskripsi,
+            "entri": entri
+        })
+        baris += len(entri)
+
+    return {"jurnal_umum": jurnal_umum, "versi": 1, "format_nominal": app.FORMAT_NOMINAL}
+
+
+# Operasi yang hanya ada pada backend JSON (struktur turunan di memori).
+HANYA_JSON = {"save_data", "matriks_entri", "saldo_harian"}
+
+
+def ukur(fungsi, ulang=1):
+    # Waktu diukur tanpa tracemalloc (yang memperlambat), lalu puncak memori
+    # diukur pada satu eksekusi terpisah. Median lebih tahan terhadap
+    # gangguan sesaat daripada waktu terbaik atau rata-rata.
+    waktu = []
+    for _ in range(ulang):
+        gc.collect()
+        mulai = time.perf_counter()
+        fungsi()
+        waktu.append(time.perf_counter() - mulai)
+
+    gc.collect()
+    tracemalloc.start()
+    fungsi()
+    _, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(waktu), puncak
+
+
+def jalankan(jumlah_baris, ulang, direktori):
+    app.DATA_FILE = os.path.join(direktori, f"ledger_{jumlah_baris}.json")
+    app.LOG_FILE = os.path.join(direktori, f"ledger_{jumlah_baris}.log")
+    app.SNAPSHOT_BINER_FILE = os.path.join(direktori, f"ledger_{jumlah_baris}.bin")
+    app.SQLITE_FILE = os.path.join(direktori, f"ledger_{jumlah_baris}.sqlite")
+    # Prahitung latar belakang akan berebut CPU dengan operasi yang diukur.
+    app.PRAHITUNG_AKTIF = False
+    app.kosongkan_cache()
+
+    ledger = buat_ledger_sintetis(jumlah_baris)
+    if app.STORAGE_BACKEND == "sqlite":
+        app.load_data().impor(ledger)
+    else:
+        app.save_data(ledger)
+    # Laporan diukur atas data hasil load_data, sehingga format snapshot
+    # (list dict atau kolom biner) ikut terukur.
+    data = app.load_data()
+    tgl_awal, tgl_akhir = app.rentang_tanggal_jurnal(data)
+    tgl_tengah = tgl_awal + (tgl_akhir - tgl_awal) / 2
+    tahun_terakhir = tgl_akhir - timedelta(days=365)
+
+    def dingin(fungsi):
+        # Versi "dingin": struktur turunan (matriks, prefix sum, indeks)
+        # dibangun ulang seperti pada rerun pertama setelah data berubah.
+        def jalan():
+            app.kosongkan_cache()
+            fungsi()
+        return jalan
+
+    operasi = [
+        ("load_data", dingin(app.load_data)),
+        ("save_data", lambda: app.save_data(data)),
+        ("matriks_entri", dingin(lambda: app.matriks_entri(data))),
+        ("saldo_harian", dingin(lambda: app.saldo_harian(data))),
+        ("buku_besar", dingin(lambda: app.hitung_buku_besar(data, "Kas", tgl_awal, tgl_akhir))),
+        ("neraca_saldo", dingin(lambda: app.hitung_neraca_saldo(data, tgl_awal, tgl_akhir))),
+        ("laba_rugi", dingin(lambda: app.hitung_laba_rugi(data, tahun_terakhir, tgl_akhir))),
+        ("arus_kas", dingin(lambda: app.hitung_arus_kas(data, tgl_tengah, tgl_akhir))),
+        ("buku_besar_hangat", lambda: app.hitung_buku_besar(data, "Kas", tgl_awal, tgl_akhir)),
+        ("neraca_saldo_hangat", lambda: app.hitung_neraca_saldo(data, tgl_awal, tgl_akhir)),
+        ("laba_rugi_hangat", lambda: app.hitung_laba_rugi(data, tahun_terakhir, tgl_akhir)),
+        ("arus_kas_hangat", lambda: app.hitung_arus_kas(data, tgl_tengah, tgl_akhir)),
+        ("cari_jurnal", dingin(lambda: app.halaman_jurnal(data, None, None, "penjualan kas", 0, 25))),
+        ("cari_jurnal_hangat", lambda: app.halaman_jurnal(data, None, None, "penjualan kas", 0, 25)),
+        ("ekspor_buku_besar_csv", lambda: app.ekspor_buku_besar(
+            app.hitung_buku_besar(data, "Kas", tgl_awal, tgl_akhir), "Kas", "csv").getvalue()),
+        ("tren_bulanan", dingin(lambda: app.hitung_tren(data, "M", tgl_awal, tgl_akhir))),
+        ("tren_bulanan_hangat", lambda: app.hitung_tren(data, "M", tgl_awal, tgl_akhir)),
+        ("tren_mingguan_hangat", lambda: app.hitung_tren(data, "W", tgl_awal, tgl_akhir)),
+    ]
+
+    hasil = []
+    for nama, fungsi in operasi:
+        if app.STORAGE_BACKEND == "sqlite" and nama in HANYA_JSON:
+            continue
+        detik, puncak = ukur(fungsi, ulang)
+        hasil.append({
+            "operasi": nama,
+            "baris_entri": jumlah_baris,
+            "jurnal": len(ledger["jurnal_umum"]),
+            "detik": round(detik, 6),
+            "memori_puncak_mb": round(puncak / 2**20, 3)
+        })
+        print(f"{jumlah_baris:>10,} baris  {nama:<22} {detik * 1000:>12.2f} ms  {puncak / 2**20:>10.2f} MB", flush=True)
+    return hasil
+
+
+def _kunci_acuan(r):
+    return (r["operasi"], r["baris_entri"], r.get("backend", "json"), r.get("snapshot", "json"))
+
+
+def bandingkan(hasil, path_acuan, toleransi, lantai):
+    acuan = {}
+    with open(path_acuan, "r") as f:
+        for baris in f:
+            r = json.loads(baris)
+            acuan[_kunci_acuan(r)] = r["detik"]
+
+    regresi = []
+    for r in hasil:
+        lama = acuan.get(_kunci_acuan(r))
+        # Operasi yang lebih cepat dari lantai (bawaan 10 ms) terlalu bising
+        # untuk dibandingkan: selisih beberapa ms bisa muncul pada kode yang sama.
+        if lama and max(lama, r["detik"]) >= lantai and r["detik"] > lama * toleransi:
+            regresi.append(f"{r['operasi']} ({r['baris_entri']:,} baris): {lama:.4f}s -> {r['detik']:.4f}s")
+    return regresi
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark komputasi laporan keuangan peternakan tanpa Streamlit.")
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1_000, 100_000, 1_000_000],
+                        help="jumlah baris entri ledger sintetis")
+    parser.add_argument("--ulang", type=int, default=5, help="pengulangan per operasi; median waktunya yang dicatat")
+    parser.add_argument("--output", default="benchmark_peternakan.jsonl", help="berkas hasil (JSON lines)")
+    parser.add_argument("--acuan", help="hasil benchmark sebelumnya untuk deteksi regresi")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default=app.STORAGE_BACKEND,
+                        help="backend penyimpanan yang diukur")
+    parser.add_argument("--snapshot", choices=["json", "biner"], default=app.FORMAT_SNAPSHOT,
+                        help="format snapshot yang diukur (backend json)")
+    parser.add_argument("--toleransi", type=float, default=1.5,
+                        help="rasio perlambatan terhadap acuan yang dianggap regresi")
+    parser.add_argument("--lantai", type=float, default=0.010,
+                        help="detik; operasi yang lebih cepat dari ini tidak dibandingkan dengan acuan")
+    args = parser.parse_args()
+    app.STORAGE_BACKEND = args.backend
+    app.FORMAT_SNAPSHOT = args.snapshot
+
+    info = {
+        "waktu": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "mesin": platform.machine(),
+        "backend": args.backend,
+        "snapshot": args.snapshot,
+        "ulang": args.ulang
+    }
+
+    direktori = tempfile.mkdtemp(prefix="bench_peternakan_")
+    try:
+        hasil = []
+        for ukuran in args.ukuran:
+            hasil += [dict(r, **info) for r in jalankan(ukuran, args.ulang, direktori)]
+    finally:
+        shutil.rmtree(direktori, ignore_errors=True)
+
+    # Acuan dibaca sebelum menulis hasil, karena keduanya boleh berkas yang sama.
+    regresi = bandingkan(hasil, args.acuan, args.toleransi, args.lantai) if args.acuan else []
+
+    with open(args.output, "a") as f:
+        for r in hasil:
+            f.write(json.dumps(r) + "\n")
+    print(f"Hasil ditulis ke {args.output}")
+
+    if regresi:
+        print("Regresi kinerja terdeteksi:")
+        for r in regresi:
+            print("  " + r)
+        sys.exit(1)
+    if args.acuan:
+        print("Tidak ada regresi terhadap acuan.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+import app_peternakan as app
+
+
+LAPORAN = {
+    "buku_besar": app.tabel_buku_besar,
+    "neraca_saldo": app.tabel_neraca_saldo,
+    "laba_rugi": app.tabel_laba_rugi,
+    "arus_kas": app.tabel_arus_kas,
+}
+
+
+def akhir_bulan(tgl):
+    return (tgl.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+def daftar_periode(args, data):
+    # -> [(label, tgl_mulai, tgl_akhir)]
+    if args.periode == "kustom":
+        return [(f"{args.dari}_{args.sampai}", args.dari, args.sampai)]
+
+    tahun = args.tahun
+    if not tahun:
+        tgl_pertama, tgl_terakhir = app.rentang_tanggal_jurnal(data)
+        if tgl_pertama is None:
+            return []
+        tahun = range(tgl_pertama.year, tgl_terakhir.year + 1)
+
+    periode = []
+    for t in tahun:
+        if args.periode == "tahunan":
+            periode.append((str(t), date(t, 1, 1), date(t, 12, 31)))
+        else:
+            for bulan in range(1, 13):
+                awal = date(t, bulan, 1)
+                periode.append((f"{t}-{bulan:02d}", awal, akhir_bulan(awal)))
+    return periode
+
+
+def susun_laporan(data, jenis, tgl_mulai, tgl_akhir, daftar_akun):
+    if jenis == "buku_besar":
+        return pd.concat([app.tabel_buku_besar(data, akun, tgl_mulai, tgl_akhir) for akun in daftar_akun],
+                         ignore_index=True)
+    return LAPORAN[jenis](data, tgl_mulai, tgl_akhir)
+
+
+def tulis(df, path, format_berkas):
+    if format_berkas == "csv":
+        df.to_csv(path, index=False)
+    elif format_berkas == "parquet":
+        df.to_parquet(path, index=False)
+
+
+def tanggal(teks):
+    return datetime.strptime(teks, "%Y-%m-%d").date()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ekspor laporan keuangan peternakan tanpa Streamlit.")
+    parser.add_argument("--laporan", nargs="+", choices=list(LAPORAN),
+                        help="laporan yang diekspor (bawaan: semua; konsolidasi tanpa buku besar)")
+    parser.add_argument("--periode", choices=["bulanan", "tahunan", "kustom"], default="bulanan")
+    parser.add_argument("--tahun", type=int, nargs="+",
+                        help="tahun yang diekspor (bawaan: semua tahun yang memiliki jurnal)")
+    parser.add_argument("--dari", type=tanggal, help="tanggal mulai (YYYY-MM-DD) untuk --periode kustom")
+    parser.add_argument("--sampai", type=tanggal, help="tanggal akhir (YYYY-MM-DD) untuk --periode kustom")
+    parser.add_argument("--akun", nargs="+", help="akun untuk buku besar (bawaan: semua akun yang terpakai)")
+    parser.add_argument("--format", choices=["csv", "xlsx", "parquet"], default="csv")
+    parser.add_argument("--output", default="laporan", help="direktori hasil ekspor")
+    parser.add_argument("--direktori", default=".", help="direktori tempat berkas ledger berada")
+    parser.add_argument("--peternakan", default=app.PETERNAKAN_BAWAAN,
+                        help=f"kode peternakan, atau '{app.KONSOLIDASI}' untuk gabungan semua peternakan")
+    args = parser.parse_args()
+    if args.periode == "kustom" and (args.dari is None or args.sampai is None or args.sampai < args.dari):
+        parser.error("--periode kustom membutuhkan --dari dan --sampai (sampai >= dari)")
+
+    output = os.path.abspath(args.output)
+    os.makedirs(output, exist_ok=True)
+    # Berkas ledger (JSON/biner/SQLite) dibuka relatif terhadap direktori kerja, seperti aplikasi.
+    os.chdir(args.direktori)
+    app.PETERNAKAN, app.PENGGUNA = app.muat_konfigurasi()
+    if args.peternakan != app.KONSOLIDASI and args.peternakan not in app.PETERNAKAN:
+        parser.error(f"peternakan tidak dikenal: {args.peternakan} (tersedia: {', '.join(app.PETERNAKAN)})")
+    if args.laporan is None:
+        args.laporan = [j for j in LAPORAN if args.peternakan != app.KONSOLIDASI or j != "buku_besar"]
+    elif args.peternakan == app.KONSOLIDASI and "buku_besar" in args.laporan:
+        parser.error("buku besar tidak tersedia untuk konsolidasi")
+
+    # Ekspor hanya membaca ledger. load_data tidak menulis berkas JSON/biner;
+    # ledger SQLite yang belum ada tidak dibuat (dan tidak diisi dari ledger
+    # JSON) di sini.
+    if app.STORAGE_BACKEND == "sqlite":
+        for kode in list(app.PETERNAKAN) if args.peternakan == app.KONSOLIDASI else [args.peternakan]:
+            with app.pakai_peternakan(kode):
+                if not os.path.exists(app._path(app.SQLITE_FILE)):
+                    sys.exit(f"Ledger SQLite peternakan {kode} belum ada; jalankan aplikasi sekali untuk memigrasikannya.")
+
+    # Satu ledger dimuat sekali; struktur turunan dan hasil laporan di-cache
+    # per versi, sehingga banyak periode/akun tidak memuat ulang data.
+    if args.peternakan == app.KONSOLIDASI:
+        data = app.LedgerGabungan(list(app.PETERNAKAN))
+    else:
+        with app.pakai_peternakan(args.peternakan):
+            data = app.load_data()
+    periode = daftar_periode(args, data)
+    daftar_akun = args.akun or app.akun_terpakai(data)
+    if not periode:
+        sys.exit("Belum ada jurnal; tidak ada periode untuk diekspor.")
+    if "buku_besar" in args.laporan and not daftar_akun:
+        sys.exit("Belum ada akun terpakai untuk buku besar.")
+
+    try:
+        for jenis in args.laporan:
+            if args.format == "xlsx":
+                path = os.path.join(output, f"{jenis}.xlsx")
+                with pd.ExcelWriter(path, engine="openpyxl") as penulis:
+                    for label, tgl_mulai, tgl_akhir in periode:
+                        df = susun_laporan(data, jenis, tgl_mulai, tgl_akhir, daftar_akun)
+                        df.to_excel(penulis, sheet_name=label[:31], index=False)
+                print(f"{jenis}: {len(periode)} periode -> {path}", flush=True)
+                continue
+            for label, tgl_mulai, tgl_akhir in periode:
+                path = os.path.join(output, f"{jenis}_{label}.{args.format}")
+                tulis(susun_laporan(data, jenis, tgl_mulai, tgl_akhir, daftar_akun), path, args.format)
+            print(f"{jenis}: {len(periode)} periode -> {output}", flush=True)
+    except ImportError as e:
+        # openpyxl (xlsx) opsional; pyarrow wajib untuk app_peternakan (lihat requirements.txt).
+        sys.exit(f"Format {args.format} membutuhkan paket tambahan: {e}")
+
+
+if __name__ == "__main__":
+    main()
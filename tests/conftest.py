@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app_peternakan
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Setiap uji memakai berkas ledger sendiri di direktori sementara.
+    monkeypatch.setattr(app_peternakan, "DATA_FILE", str(tmp_path / "ledger.json"))
+    monkeypatch.setattr(app_peternakan, "LOG_FILE", str(tmp_path / "ledger.log"))
+    monkeypatch.setattr(app_peternakan, "SNAPSHOT_BINER_FILE", str(tmp_path / "ledger.bin"))
+    monkeypatch.setattr(app_peternakan, "SQLITE_FILE", str(tmp_path / "ledger.sqlite"))
+    monkeypatch.setattr(app_peternakan, "STORAGE_BACKEND", "json")
+    monkeypatch.setattr(app_peternakan, "FORMAT_SNAPSHOT", "json")
+    monkeypatch.setattr(app_peternakan, "PRAHITUNG_AKTIF", False)
+    app_peternakan.kosongkan_cache()
+    app_peternakan._status_log()["jumlah"] = 0
+    yield app_peternakan
+    app_peternakan.kosongkan_cache()
@@ -0,0 +1,38 @@
+import io
+from datetime import date
+
+import pandas as pd
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from test_penyimpanan import buat_jurnal
+
+
+@pytest.fixture
+def mutasi(app):
+    data = app.load_data()
+    for hari in range(1, 8):
+        app.simpan_jurnal_baru(data, buat_jurnal(f"2024-05-{hari:02d}", f"susu, hari {hari}", sen=hari * 1_234))
+    return app.hitung_buku_besar(data, "Kas", date(2024, 5, 1), date(2024, 5, 31))
+
+
+def unduhan(hasil):
+    # Jalur yang sama dengan st.download_button untuk data dari callable.
+    return convert_data_to_bytes_and_infer_mime(hasil, unsupported_error=TypeError(type(hasil)))[0]
+
+
+@pytest.mark.parametrize("format_berkas", ["csv", "xlsx"])
+def test_ekspor_buku_besar_dapat_diunduh(app, mutasi, format_berkas):
+    # Potongan kecil agar batas antar-potongan ikut teruji.
+    isi = unduhan(app.ekspor_buku_besar(mutasi, "Kas", format_berkas, ukuran_chunk=3))
+    if format_berkas == "csv":
+        hasil = pd.read_csv(io.BytesIO(isi), dtype={"Tanggal": str})
+    else:
+        hasil = pd.read_excel(io.BytesIO(isi), dtype={"Tanggal": str})
+    harapan = app._format_buku_besar(mutasi, "Kas")
+    pd.testing.assert_frame_equal(hasil, harapan, check_dtype=False)
+
+
+def test_ekspor_buku_besar_kosong(app, mutasi):
+    isi = unduhan(app.ekspor_buku_besar(mutasi.iloc[:0], "Kas", "csv"))
+    assert isi.decode("utf-8").strip() == "Akun,Tanggal,Deskripsi,Debit (Rp),Kredit (Rp),Saldo (Rp)"
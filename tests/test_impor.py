@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+
+def baris_csv(*nominal):
+    # Satu jurnal per nominal: Kas di debit, Penjualan Susu di kredit.
+    baris = ["no_jurnal,tanggal,deskripsi,akun,debit,kredit"]
+    for i, n in enumerate(nominal):
+        baris.append(f'J{i},2024-01-0{i + 1},susu {i},Kas,"{n}",')
+        baris.append(f'J{i},2024-01-0{i + 1},susu {i},Penjualan Susu,,"{n}"')
+    return io.BytesIO("\n".join(baris).encode("utf-8"))
+
+
+def impor_csv(app, *nominal):
+    return app.validasi_impor(app.baca_chunk_impor(baris_csv(*nominal), "impor.csv", ukuran_chunk=3))
+
+
+@pytest.mark.parametrize("teks,sen", [
+    ("1500", 1500_00),
+    ("1500.5", 1500_50),
+    ("1500000.50", 1500000_50),
+    ("0.07", 7),
+    ("1.50", 1_50),
+])
+def test_nominal_format_polos(app, teks, sen):
+    daftar, kesalahan = impor_csv(app, teks)
+    assert kesalahan == []
+    assert daftar[0]["entri"][0]["debit"] == sen
+
+
+@pytest.mark.parametrize("teks,sen", [
+    ("1.500", 1500_00),
+    ("1.000,50", 1000_50),
+    ("1.500.000", 1500000_00),
+    ("12.345.678,9", 12345678_90),
+    ("1500,25", 1500_25),
+])
+def test_nominal_format_indonesia(app, teks, sen):
+    daftar, kesalahan = impor_csv(app, teks)
+    assert kesalahan == []
+    assert daftar[0]["entri"][0]["debit"] == sen
+
+
+@pytest.mark.parametrize("teks", ["1,500", "1,500.00", "1.500.00", "1.5000", "1.000,505", "Rp 1500", "1 500", "satu"])
+def test_nominal_ambigu_ditolak(app, teks):
+    daftar, kesalahan = impor_csv(app, teks)
+    assert daftar == []
+    assert any("bukan angka yang dikenali" in k["Kesalahan"] for k in kesalahan)
+
+
+def test_nominal_negatif_dan_terlalu_besar(app):
+    daftar, kesalahan = impor_csv(app, "-1.500", "2.000.000.000.000")
+    assert daftar == []
+    pesan = " ".join(k["Kesalahan"] for k in kesalahan)
+    assert "tidak boleh negatif" in pesan
+    assert "melebihi" in pesan
+
+
+def test_nominal_sel_angka_xlsx(app):
+    openpyxl = pytest.importorskip("openpyxl")
+    buku = openpyxl.Workbook()
+    lembar = buku.active
+    lembar.append(["no_jurnal", "tanggal", "deskripsi", "akun", "debit", "kredit"])
+    lembar.append(["J1", "2024-01-01", "susu", "Kas", 1500.5, None])
+    lembar.append(["J1", "2024-01-01", "susu", "Penjualan Susu", None, 1500.5])
+    lembar.append(["J2", "2024-01-02", "susu", "Kas", 0.1 + 0.2, None])
+    lembar.append(["J2", "2024-01-02", "susu", "Penjualan Susu", None, "0,30"])
+    berkas = io.BytesIO()
+    buku.save(berkas)
+    berkas.seek(0)
+
+    daftar, kesalahan = app.validasi_impor(app.baca_chunk_impor(berkas, "impor.xlsx"))
+    assert kesalahan == []
+    assert [j["entri"][0]["debit"] for j in daftar] == [1500_50, 30]
@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+import uuid
+
+import pytest
+
+from test_penyimpanan import buat_jurnal
+
+SKRIP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "laporan_peternakan.py")
+
+
+def isi_berkas(direktori):
+    hasil = {}
+    for nama in sorted(os.listdir(direktori)):
+        with open(os.path.join(direktori, nama), "rb") as f:
+            hasil[nama] = f.read()
+    return hasil
+
+
+def ekspor(direktori, output, **env):
+    lingkungan = dict(os.environ, PETERNAKAN_PRAHITUNG="0", **env)
+    lingkungan.pop("PETERNAKAN_SNAPSHOT", None)
+    subprocess.run(
+        [sys.executable, SKRIP, "--direktori", str(direktori), "--output", str(output), "--periode", "tahunan"],
+        env=lingkungan, check=True, capture_output=True
+    )
+
+
+@pytest.mark.parametrize("format_snapshot", ["json", "biner"])
+def test_ekspor_tidak_mengubah_ledger(app, monkeypatch, tmp_path, format_snapshot):
+    direktori = tmp_path / "ledger"
+    direktori.mkdir()
+    monkeypatch.setattr(app, "DATA_FILE", str(direktori / "keuangan_peternakan_streamlit.json"))
+    monkeypatch.setattr(app, "LOG_FILE", str(direktori / "keuangan_peternakan_streamlit.log"))
+    monkeypatch.setattr(app, "SNAPSHOT_BINER_FILE", str(direktori / "keuangan_peternakan_streamlit.bin"))
+    monkeypatch.setattr(app, "FORMAT_SNAPSHOT", format_snapshot)
+    data = app.load_data()
+    app.simpan_jurnal_massal(data, [buat_jurnal("2023-06-01", "saldo awal")])
+    app.simpan_jurnal_baru(data, buat_jurnal("2024-01-02", "susu"))
+    sebelum = isi_berkas(direktori)
+
+    # Proses ekspor berjalan dengan PETERNAKAN_SNAPSHOT bawaan (json).
+    ekspor(direktori, tmp_path / "hasil")
+    assert isi_berkas(direktori) == sebelum
+    assert "neraca_saldo_2024.csv" in os.listdir(tmp_path / "hasil")
+
+
+def test_ekspor_ledger_nominal_lama_tidak_ditulis_ulang(tmp_path):
+    direktori = tmp_path / "ledger"
+    direktori.mkdir()
+    lama = {"jurnal_umum": [
+        {"id": str(uuid.uuid4()), "tanggal": "2024-03-01", "deskripsi": "lama",
+         "entri": [{"akun": "Kas", "debit": 12.5, "kredit": 0}, {"akun": "Penjualan Susu", "debit": 0, "kredit": 12.5}]}
+    ]}
+    with open(direktori / "keuangan_peternakan_streamlit.json", "w") as f:
+        json.dump(lama, f)
+    sebelum = isi_berkas(direktori)
+
+    ekspor(direktori, tmp_path / "hasil")
+    assert isi_berkas(direktori) == sebelum
+
+
+def test_ekspor_sqlite_tidak_membuat_ledger(tmp_path):
+    direktori = tmp_path / "ledger"
+    direktori.mkdir()
+    with pytest.raises(subprocess.CalledProcessError):
+        ekspor(direktori, tmp_path / "hasil", PETERNAKAN_STORAGE="sqlite")
+    assert os.listdir(direktori) == []
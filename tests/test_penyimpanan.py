@@ -0,0 +1,263 @@
+import json
+import os
+import uuid
+from datetime import date
+
+import pytest
+
+
+def buat_jurnal(tanggal, deskripsi, akun_debit="Kas", akun_kredit="Penjualan Susu", sen=100_00):
+    return {
+        "id": str(uuid.uuid4()),
+        "tanggal": tanggal,
+        "deskripsi": deskripsi,
+        "entri": [
+            {"akun": akun_debit, "debit": sen, "kredit": 0},
+            {"akun": akun_kredit, "debit": 0, "kredit": sen},
+        ],
+    }
+
+
+def muat_ulang(app):
+    # Seperti proses baru: tanpa cache, baca snapshot dan putar ulang log.
+    app.kosongkan_cache()
+    return app.load_data()
+
+
+def isi_ledger(app, data):
+    # Tambah, ubah, dan hapus sehingga log berisi ketiga jenis catatan.
+    daftar = [buat_jurnal(f"2024-01-{hari:02d}", f"susu hari {hari}", sen=hari * 1_000) for hari in range(1, 11)]
+    for jurnal in daftar:
+        app.simpan_jurnal_baru(data, jurnal)
+    app.perbarui_jurnal(data, dict(daftar[2], deskripsi="susu diubah"), daftar[2])
+    app.hapus_jurnal(data, daftar[5]["id"])
+    return daftar
+
+
+def test_log_dengan_baris_terakhir_terpotong(app):
+    data = app.load_data()
+    isi_ledger(app, data)
+    harapan = list(data["jurnal_umum"])
+
+    # Crash di tengah append: baris terakhir tanpa newline.
+    with open(app.LOG_FILE, "a") as f:
+        f.write(json.dumps({"op": "tambah", "versi": 99, "jurnal": buat_jurnal("2024-02-01", "rusak")})[:40])
+
+    data = muat_ulang(app)
+    assert list(data["jurnal_umum"]) == harapan
+    assert data["versi"] == 12
+
+    # Penulis berikutnya membuang sisa baris itu sebelum menambah catatan.
+    baru = buat_jurnal("2024-02-02", "setelah crash")
+    app.simpan_jurnal_baru(data, baru)
+    with open(app.LOG_FILE, "rb") as f:
+        isi = f.read()
+    assert isi.endswith(b"\n")
+    assert all(json.loads(baris) for baris in isi.splitlines())
+
+    data = muat_ulang(app)
+    assert list(data["jurnal_umum"]) == harapan + [baru]
+
+
+def test_kompaksi_setara_dengan_putar_ulang_log(app, monkeypatch):
+    data = app.load_data()
+    isi_ledger(app, data)
+    assert os.path.exists(app.LOG_FILE)
+    dari_log = muat_ulang(app)
+
+    app.save_data(dari_log)
+    assert not os.path.exists(app.LOG_FILE)
+    dari_snapshot = muat_ulang(app)
+    assert list(dari_snapshot["jurnal_umum"]) == list(dari_log["jurnal_umum"])
+    assert dari_snapshot["versi"] == dari_log["versi"]
+
+    # Kompaksi otomatis di tengah rangkaian penulisan menghasilkan ledger yang sama.
+    monkeypatch.setattr(app, "DATA_FILE", app.DATA_FILE + ".2")
+    monkeypatch.setattr(app, "LOG_FILE", app.LOG_FILE + ".2")
+    monkeypatch.setattr(app, "BATAS_KOMPAKSI_LOG", 3)
+    app.kosongkan_cache()
+    app._status_log()["jumlah"] = 0
+    data = app.load_data()
+    for jurnal in dari_log["jurnal_umum"]:
+        app.simpan_jurnal_baru(data, jurnal)
+    data = muat_ulang(app)
+    assert list(data["jurnal_umum"]) == list(dari_log["jurnal_umum"])
+
+
+def test_save_data_basi_menimbulkan_konflik(app):
+    a = app.load_data()
+    b = app.load_data()
+    app.simpan_jurnal_baru(a, buat_jurnal("2024-01-01", "sesi a"))
+
+    with pytest.raises(app.KonflikVersi):
+        app.save_data(b)
+    assert [j["deskripsi"] for j in muat_ulang(app)["jurnal_umum"]] == ["sesi a"]
+
+
+def test_ubah_jurnal_yang_sudah_diubah_sesi_lain(app):
+    a = app.load_data()
+    jurnal = buat_jurnal("2024-01-01", "asli")
+    app.simpan_jurnal_baru(a, jurnal)
+    b = muat_ulang(app)
+
+    app.perbarui_jurnal(a, dict(jurnal, deskripsi="dari a"), jurnal)
+    with pytest.raises(app.KonflikVersi) as info:
+        app.perbarui_jurnal(b, dict(jurnal, deskripsi="dari b"), jurnal)
+    assert info.value.args[0]["deskripsi"] == "dari a"
+
+
+def test_json_lama_float_diubah_ke_sen_eksak(app):
+    # Format lama: nominal rupiah float, tanpa penanda format_nominal.
+    nominal = [0.1, 0.2, 1234.56, 19.99, 0.07]
+    lama = {"jurnal_umum": [
+        {"id": str(uuid.uuid4()), "tanggal": "2024-03-01", "deskripsi": f"lama {i}",
+         "entri": [{"akun": "Kas", "debit": n, "kredit": 0}, {"akun": "Penjualan Susu", "debit": 0, "kredit": n}]}
+        for i, n in enumerate(nominal)
+    ]}
+    with open(app.DATA_FILE, "w") as f:
+        json.dump(lama, f)
+
+    data = muat_ulang(app)
+    debit = [j["entri"][0]["debit"] for j in data["jurnal_umum"]]
+    assert debit == [10, 20, 123456, 1999, 7]
+    assert all(type(d) is int for d in debit)
+
+    mutasi = app.mutasi_per_akun(data)
+    assert mutasi["Kas"]["debit"] == 10 + 20 + 123456 + 1999 + 7
+    assert mutasi["Kas"]["debit"] == mutasi["Penjualan Susu"]["kredit"]
+
+    # Membaca tidak menulis berkas; penulis pertama mengompaksinya dalam sen
+    # sebelum menambah catatan log, sehingga log tidak bercampur float dan sen.
+    with open(app.DATA_FILE) as f:
+        assert json.load(f) == lama
+    app.simpan_jurnal_baru(data, buat_jurnal("2024-03-02", "baru", sen=1_00))
+    with open(app.DATA_FILE) as f:
+        disk = json.load(f)
+    assert disk["format_nominal"] == app.FORMAT_NOMINAL
+    assert [j["entri"][0]["debit"] for j in disk["jurnal_umum"]] == debit
+    assert [j["entri"][0]["debit"] for j in muat_ulang(app)["jurnal_umum"]] == debit + [1_00]
+
+
+def test_sqlite_agregat_dan_pencarian_konsisten(app, monkeypatch):
+    monkeypatch.setattr(app, "STORAGE_BACKEND", "sqlite")
+    data = app.load_data()
+    daftar = [
+        buat_jurnal("2024-01-01", "penjualan susu pagi", sen=50_00),
+        buat_jurnal("2024-01-01", "beli pakan konsentrat", "Biaya Pakan", "Kas", sen=20_00),
+        buat_jurnal("2024-01-02", "penjualan susu sore", sen=30_00),
+        buat_jurnal("2024-01-03", "obat cacing", "Biaya Obat", "Kas", sen=5_00),
+    ]
+    for jurnal in daftar:
+        app.simpan_jurnal_baru(data, jurnal)
+
+    # Ubah tanggal, akun, nominal, dan deskripsi sekaligus; hapus satu jurnal.
+    diubah = dict(daftar[1], tanggal="2024-01-05", deskripsi="beli hijauan",
+                  entri=[{"akun": "Biaya Operasional", "debit": 12_00, "kredit": 0},
+                         {"akun": "Bank", "debit": 0, "kredit": 12_00}])
+    app.perbarui_jurnal(data, diubah, daftar[1])
+    app.hapus_jurnal(data, daftar[3]["id"])
+
+    agregat = data._query("SELECT akun, tanggal, debit, kredit, jumlah FROM saldo_harian ORDER BY akun, tanggal")
+    dari_entri = data._query("""
+        SELECT akun, tanggal, SUM(debit), SUM(kredit), COUNT(*) FROM entri
+        GROUP BY akun, tanggal ORDER BY akun, tanggal
+    """)
+    assert agregat == dari_entri
+    assert app.mutasi_per_akun(data) == {
+        "Kas": {"debit": 80_00, "kredit": 0},
+        "Penjualan Susu": {"debit": 0, "kredit": 80_00},
+        "Biaya Operasional": {"debit": 12_00, "kredit": 0},
+        "Bank": {"debit": 0, "kredit": 12_00},
+    }
+
+    def cari(teks):
+        return sorted(j["deskripsi"] for j in app.halaman_jurnal(data, None, None, teks)[1])
+
+    assert cari("hijau") == ["beli hijauan"]
+    assert cari("pakan") == []
+    assert cari("obat") == []
+    assert cari("operasional") == ["beli hijauan"]
+    assert cari("susu") == ["penjualan susu pagi", "penjualan susu sore"]
+    assert data._query("SELECT COUNT(*) FROM jurnal_cari")[0][0] == data.jumlah_jurnal() == 3
+
+
+def test_sqlite_tutup_periode_menyimpan_saldo_kumulatif(app, monkeypatch):
+    monkeypatch.setattr(app, "STORAGE_BACKEND", "sqlite")
+    data = app.load_data()
+    for bulan in range(1, 7):
+        app.simpan_jurnal_baru(data, buat_jurnal(f"2024-{bulan:02d}-15", f"susu {bulan}", sen=bulan * 10_00))
+        app.simpan_jurnal_baru(data, buat_jurnal(f"2024-{bulan:02d}-20", f"pakan {bulan}", "Biaya Pakan", "Kas", sen=bulan * 3_00))
+
+    app.tutup_periode(data, date(2024, 2, 29))
+    app.tutup_periode(data, date(2024, 4, 30))
+    tutup = app.daftar_tutup_buku(data)
+    assert [t["sampai"] for t in tutup] == ["2024-02-29", "2024-04-30"]
+    for t in tutup:
+        sampai = date.fromisoformat(t["sampai"])
+        assert t["saldo"] == app.mutasi_per_akun(data, None, sampai)
+    assert tutup[1]["saldo"]["Kas"] == {"debit": 100_00, "kredit": 30_00}
+
+
+def test_sqlite_ubah_jurnal_mempertahankan_urutan_harian(app, monkeypatch):
+    daftar = [buat_jurnal("2024-01-01", f"susu {i}", sen=(i + 1) * 10_00) for i in range(3)]
+    diubah = dict(daftar[0], deskripsi="susu pagi diubah",
+                  entri=[dict(e, debit=e["debit"] * 2, kredit=e["kredit"] * 2) for e in daftar[0]["entri"]])
+
+    buku_besar = {}
+    for backend in ("json", "sqlite"):
+        monkeypatch.setattr(app, "STORAGE_BACKEND", backend)
+        data = app.load_data()
+        for jurnal in daftar:
+            app.simpan_jurnal_baru(data, jurnal)
+        app.perbarui_jurnal(data, diubah, daftar[0])
+        mutasi = app.hitung_buku_besar(data, "Kas", date(2024, 1, 1), date(2024, 1, 31))
+        buku_besar[backend] = (mutasi["deskripsi"].tolist(), mutasi["saldo"].tolist())
+        terbaru = app.halaman_jurnal(data, None, None)[1]
+        assert [j["deskripsi"] for j in terbaru] == ["susu 2", "susu 1", "susu pagi diubah"]
+
+    assert buku_besar["sqlite"] == buku_besar["json"]
+    assert buku_besar["json"] == (["susu pagi diubah", "susu 1", "susu 2"], [20_00, 40_00, 70_00])
+
+
+@pytest.mark.parametrize("format_snapshot", [None, "json", "biner"])
+def test_pindah_ke_sqlite_membawa_seluruh_ledger(app, monkeypatch, format_snapshot):
+    data = app.load_data()
+    if format_snapshot is not None:
+        monkeypatch.setattr(app, "FORMAT_SNAPSHOT", format_snapshot)
+        app.simpan_jurnal_massal(data, [buat_jurnal("2023-12-31", "saldo awal")])
+    # Tiga jurnal berikutnya hanya ada di log (belum dikompaksi).
+    for hari in range(1, 4):
+        app.simpan_jurnal_baru(data, buat_jurnal(f"2024-01-{hari:02d}", f"susu {hari}"))
+    harapan = app.mutasi_per_akun(data)
+
+    monkeypatch.setattr(app, "STORAGE_BACKEND", "sqlite")
+    buku = muat_ulang(app)
+    assert buku.jumlah_jurnal() == len(data["jurnal_umum"])
+    assert app.mutasi_per_akun(buku) == harapan
+
+
+@pytest.mark.parametrize("format_berkas,format_proses", [("json", "biner"), ("biner", "json")])
+def test_membaca_tidak_mengubah_format_snapshot(app, monkeypatch, format_berkas, format_proses):
+    monkeypatch.setattr(app, "FORMAT_SNAPSHOT", format_berkas)
+    data = app.load_data()
+    app.simpan_jurnal_massal(data, [buat_jurnal("2024-01-01", "susu")])
+    path = app.DATA_FILE if format_berkas == "json" else app.SNAPSHOT_BINER_FILE
+    with open(path, "rb") as f:
+        isi = f.read()
+
+    def berkas_ledger():
+        return sorted(n for n in os.listdir(os.path.dirname(path)) if not n.endswith(".lock"))
+
+    # Proses lain dengan PETERNAKAN_SNAPSHOT berbeda hanya membaca.
+    monkeypatch.setattr(app, "FORMAT_SNAPSHOT", format_proses)
+    data = muat_ulang(app)
+    assert [j["deskripsi"] for j in data["jurnal_umum"]] == ["susu"]
+    assert berkas_ledger() == [os.path.basename(path)]
+    with open(path, "rb") as f:
+        assert f.read() == isi
+
+    # Format baru dipakai saat kompaksi.
+    app.save_data(data)
+    path_baru = app.DATA_FILE if format_proses == "json" else app.SNAPSHOT_BINER_FILE
+    assert berkas_ledger() == [os.path.basename(path_baru)]
+    assert [j["deskripsi"] for j in muat_ulang(app)["jurnal_umum"]] == ["susu"]
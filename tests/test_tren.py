@@ -0,0 +1,20 @@
+from datetime import date
+
+from test_penyimpanan import buat_jurnal
+
+
+def test_tren_mingguan_tahun_ke_tahun_tanpa_minggu_tepi(app):
+    data = app.load_data()
+    # 1 Januari 2023 (Minggu) termasuk 2022-W52; 31 Desember 2024 termasuk 2025-W01.
+    for tanggal in ("2023-01-01", "2023-01-02", "2024-01-01", "2024-12-31"):
+        app.simpan_jurnal_baru(data, buat_jurnal(tanggal, f"susu {tanggal}", sen=10_00))
+
+    tren = app.hitung_laporan(data, "tren", date(2023, 1, 1), date(2024, 12, 31), opsi="W")
+    assert tren["Periode"].iloc[0] == "2022-W52"
+    assert tren["Periode"].iloc[-1] == "2025-W01"
+    assert tren["Penjualan Susu"].sum() == 40_00
+
+    per_tahun = app.tren_per_tahun(tren, "Penjualan Susu", 2023, 2024)
+    assert list(per_tahun.columns) == [2023, 2024]
+    assert per_tahun.loc[1].tolist() == [10_00, 10_00]
+    assert per_tahun.to_numpy().sum() == 20_00